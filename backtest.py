@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Backtest runner for the opening range breakout strategy.
+
+Examples:
+    python backtest.py synthetic --days 2520
+    python backtest.py parity --days 250
+    python backtest.py import --store data/bars --symbol ES es_1min.csv
+    python backtest.py run --store data/bars --symbol ES --start 2015-01-01
+    python backtest.py replay --store data/bars --symbol ES --start 2024-01-01
+    python backtest.py sweep --days 2520 --grid volume_multiplier=1.0,1.5,2.0 \
+        --grid opening_range_minutes=5,15,30 --results sweep.jsonl
+    python backtest.py shards --symbols ES,NQ,YM,RTY --shards 4 --days 250
+    python backtest.py book --orders 5000 --updates 500000
+    python backtest.py alloc --days 20 --budget 256
+"""
+import argparse
+import logging
+import sys
+import time
+from datetime import date
+import numpy as np
+import yaml
+
+from src.utils.config import Config
+from src.utils.logger import Logger
+from src.backtest.vectorized import BacktestParams, VectorizedBacktester, filters_from_config
+from src.backtest.allocations import profile_allocations
+from src.backtest.parity import check_parity
+from src.backtest.sweep import ParameterSweep
+from src.backtest.synthetic import generate_sessions
+from src.backtest.replay import ReplayRunner, iter_columns, iter_store, iter_merged
+from src.bot.trading_bot import TradingBot
+from src.bot.supervisor import ShardSupervisor
+from src.data.bar_store import BarStore
+from src.data.broker_interface import Order, OrderSide, OrderType, OrderStatus
+from src.data.instruments import get_instrument
+from src.data.paper_broker import PaperBroker
+from src.risk.position_sizing import SIZING_METHODS
+
+
+def print_statistics(stats: dict):
+    """Print backtest statistics."""
+    for key, value in stats.items():
+        if isinstance(value, float):
+            print(f"  {key}: {value:.2f}")
+        else:
+            print(f"  {key}: {value}")
+
+
+def load_bars(args) -> dict:
+    """Load bar columns from the bar store, or generate synthetic sessions."""
+    if args.store:
+        store = BarStore(args.store)
+        records = store.load_range(args.symbol, args.start, args.end)
+        return BarStore.columns(records)
+    return generate_sessions(args.days, seed=args.seed, session_start=args.session_start,
+                             session_end=args.session_end)
+
+
+def run_store(args, config: Config) -> int:
+    """Backtest bars read from the memory-mapped bar store."""
+    bars = load_bars(args)
+    backtester = VectorizedBacktester(BacktestParams.from_config(config))
+    filters = filters_from_config(config)
+
+    start = time.perf_counter()
+    result = backtester.run(bars['ts'], bars['open'], bars['high'], bars['low'],
+                            bars['close'], bars['volume'], **filters)
+    elapsed = time.perf_counter() - start
+
+    print(f"Backtested {result.sessions} sessions ({result.bars} bars) in {elapsed:.3f}s")
+    print_statistics(result.get_statistics())
+    return 0
+
+
+def run_replay(args, config: Config) -> int:
+    """Replay bars through the event-driven TradingBot as fast as possible."""
+    bot = TradingBot(config)
+
+    if args.store:
+        bars = iter_store(BarStore(args.store), args.symbol, bot.timezone, args.start, args.end,
+                          calendar=bot.session_calendar)
+    else:
+        bars = iter_columns(load_bars(args), bot.timezone)
+
+    runner = ReplayRunner(bot, log_level='INFO' if args.verbose else 'WARNING',
+                          progress_every=args.progress_every)
+    summary = runner.run(bars)
+    bot.stop()
+
+    print(f"Replayed {summary['bars']} bars in {summary['seconds']:.2f}s "
+          f"({summary['bars_per_second']:.0f} bars/s)")
+    print_statistics(summary['statistics'])
+    if bot.latency is not None:
+        print(bot.latency.format_table())
+    return 0
+
+
+def run_import(args, config: Config) -> int:
+    """Import CSV bars into the bar store."""
+    store = BarStore(args.store, timezone=config.timezone)
+    for path in args.files:
+        store.import_csv(args.symbol, path, timestamp_column=args.timestamp_column)
+
+    sessions = store.sessions(args.symbol)
+    print(f"{args.symbol}: {len(sessions)} sessions stored "
+          f"({sessions[0]} to {sessions[-1]})" if len(sessions) else f"{args.symbol}: empty")
+    return 0
+
+
+def run_synthetic(args, config: Config) -> int:
+    """Backtest a synthetic history and report throughput."""
+    bars = generate_sessions(args.days, seed=args.seed)
+    backtester = VectorizedBacktester(BacktestParams.from_config(config))
+    filters = filters_from_config(config)
+
+    start = time.perf_counter()
+    result = backtester.run(bars['ts'], bars['open'], bars['high'], bars['low'],
+                            bars['close'], bars['volume'], **filters)
+    elapsed = time.perf_counter() - start
+
+    print(f"Backtested {args.days} sessions ({len(bars['ts'])} bars) in {elapsed:.3f}s")
+    print_statistics(result.get_statistics())
+    return 0
+
+
+def run_parity(args, config: Config) -> int:
+    """Compare the vectorized backtester with the event-driven bot."""
+    if args.sizing:
+        config.config['risk_management']['position_sizing_method'] = args.sizing
+    if config.trailing_stop:
+        print("Note: trailing stops are not modelled by the vectorized backtester")
+    bars = load_bars(args)
+    result, mismatches = check_parity(config, bars)
+
+    print(f"Parity check over {result.sessions} sessions: {len(result)} trades")
+    for mismatch in mismatches[:20]:
+        print(f"  MISMATCH {mismatch}")
+
+    if mismatches:
+        print(f"FAILED: {len(mismatches)} mismatches")
+        return 1
+
+    print("OK: vectorized and event-driven results match")
+    return 0
+
+
+def run_shards(args, config: Config) -> int:
+    """Run several symbols through process-sharded TradingBots."""
+    symbols = args.symbols.split(',') if args.symbols else config.symbols
+    config.config['trading']['symbols'] = symbols
+
+    if args.store:
+        store = BarStore(args.store)
+        feeds = {s: BarStore.columns(store.load_range(s, args.start, args.end)) for s in symbols}
+    else:
+        # Stand-in feeds: independent synthetic sessions per symbol
+        feeds = {s: generate_sessions(args.days, seed=args.seed + i,
+                                      session_start=args.session_start,
+                                      session_end=args.session_end,
+                                      tick_size=get_instrument(s).tick_size)
+                 for i, s in enumerate(symbols)}
+
+    supervisor = ShardSupervisor(config, shards=args.shards, batch_size=args.batch_size)
+    summary = supervisor.run(iter_merged(feeds))
+
+    for shard, group in summary['shards'].items():
+        print(f"Shard {shard}: {', '.join(group)}")
+    print(f"Routed {summary['bars']} bars in {summary['seconds']:.2f}s "
+          f"({summary['bars_per_second']:.0f} bars/s)")
+    print_statistics(summary['statistics'])
+    return 0
+
+
+def run_book(args, config: Config) -> int:
+    """Stress the paper broker's order matching with random-walk prices."""
+    rng = np.random.default_rng(args.seed)
+    symbols = args.symbols.split(',') if args.symbols else config.symbols
+    specs = [get_instrument(s) for s in symbols]
+
+    Logger.get_logger().setLevel(logging.ERROR)
+    broker = PaperBroker()
+    broker.connect()
+    prices = [5000.0] * len(specs)
+    for spec, price in zip(specs, prices):
+        broker.update_market_price(spec.symbol, price)
+
+    # Resting orders 5 to 100 ticks away on the side they wait for
+    order_types = (OrderType.LIMIT, OrderType.STOP, OrderType.STOP_LIMIT)
+    orders = []
+    for _ in range(args.orders):
+        k = int(rng.integers(len(specs)))
+        spec = specs[k]
+        side = OrderSide.BUY if rng.random() < 0.5 else OrderSide.SELL
+        order_type = order_types[int(rng.integers(3))]
+        below = (side == OrderSide.BUY) == (order_type == OrderType.LIMIT)
+        offset = int(rng.integers(5, 100)) * spec.tick_size
+        level = prices[k] - offset if below else prices[k] + offset
+        if order_type == OrderType.LIMIT:
+            order = Order(spec.symbol, side, 1, order_type, price=level)
+        elif order_type == OrderType.STOP:
+            order = Order(spec.symbol, side, 1, order_type, stop_price=level)
+        else:
+            limit = level + (2 if side == OrderSide.BUY else -2) * spec.tick_size
+            order = Order(spec.symbol, side, 1, order_type, price=limit, stop_price=level)
+        broker.submit_order(order)
+        orders.append(order)
+    for order in orders[::4]:
+        broker.cancel_order(order.order_id)
+
+    which = rng.integers(len(specs), size=args.updates)
+    steps = rng.integers(-1, 2, size=args.updates)
+    moves = [(specs[k].symbol, k, step * specs[k].tick_size)
+             for k, step in zip(which.tolist(), steps.tolist())]
+
+    update = broker.update_market_price
+    start = time.perf_counter()
+    for symbol, k, step in moves:
+        prices[k] += step
+        update(symbol, prices[k])
+    elapsed = time.perf_counter() - start
+
+    filled = sum(order.status == OrderStatus.FILLED for order in orders)
+    resting = sum(len(book) for book in broker.books.values())
+    print(f"{args.updates} price updates across {len(specs)} symbols in {elapsed:.2f}s "
+          f"({args.updates / elapsed:.0f} updates/s)")
+    print(f"  orders: {len(orders)}, filled: {filled}, still resting: {resting}")
+    return 0
+
+
+def run_alloc(args, config: Config) -> int:
+    """Check the per-bar allocations of TradingBot.on_bar against a budget."""
+    bot = TradingBot(config)
+    bot.start()
+    profile = profile_allocations(bot, iter_columns(load_bars(args), bot.timezone),
+                                  warmup=args.warmup)
+    bot.stop()
+
+    print(f"Profiled {profile['bars']} bars ({profile['steady_bars']} steady-state)")
+    print_statistics(profile)
+    if profile['p99_bytes'] > args.budget:
+        print(f"FAILED: p99 allocation {profile['p99_bytes']} bytes per bar "
+              f"exceeds the {args.budget} byte budget")
+        return 1
+
+    print(f"OK: per-bar allocations within the {args.budget} byte budget")
+    return 0
+
+
+def parse_grid(specs: list) -> dict:
+    """Parse 'name=v1,v2,...' arguments into a parameter grid."""
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        if not values:
+            raise ValueError(f"Invalid grid spec (expected name=v1,v2): {spec}")
+        grid[name.strip()] = [yaml.safe_load(v) for v in values.split(',')]
+    return grid
+
+
+def run_sweep(args, config: Config) -> int:
+    """Sweep a parameter grid across a process pool."""
+    bars = load_bars(args)
+    sweep = ParameterSweep(
+        BacktestParams.from_config(config),
+        parse_grid(args.grid),
+        results_path=args.results,
+        processes=args.processes,
+        config=config
+    )
+
+    start = time.perf_counter()
+    table = sweep.run(bars)
+    elapsed = time.perf_counter() - start
+
+    print(f"Swept {len(sweep.configs)} configs in {elapsed:.2f}s")
+    print(table.head(args.top).to_string())
+    return 0
+
+
+def main() -> int:
+    """Main function to run backtests."""
+    parser = argparse.ArgumentParser(description="Opening range breakout backtester")
+    parser.add_argument('--config', default='config.yaml', help='Config file')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    synthetic = subparsers.add_parser('synthetic', help='Backtest a synthetic history')
+    synthetic.add_argument('--days', type=int, default=2520, help='Number of sessions')
+    synthetic.add_argument('--seed', type=int, default=0, help='Random seed')
+    synthetic.set_defaults(func=run_synthetic)
+
+    data = argparse.ArgumentParser(add_help=False)
+    data.add_argument('--store', help='Bar store directory (default: synthetic data)')
+    data.add_argument('--symbol', default='ES', help='Symbol to read from the store')
+    data.add_argument('--start', type=date.fromisoformat, help='First session (YYYY-MM-DD)')
+    data.add_argument('--end', type=date.fromisoformat, help='Last session (YYYY-MM-DD)')
+    data.add_argument('--seed', type=int, default=0, help='Random seed for synthetic data')
+    data.add_argument('--session-start', default='09:00',
+                      help='First bar of each synthetic session (HH:MM)')
+    data.add_argument('--session-end', default='11:00',
+                      help='End of each synthetic session (HH:MM)')
+
+    run = subparsers.add_parser('run', parents=[data], help='Backtest bars from the bar store')
+    run.set_defaults(func=run_store, days=2520)
+
+    replay = subparsers.add_parser('replay', parents=[data],
+                                   help='Replay bars through TradingBot (regression harness)')
+    replay.add_argument('--days', type=int, default=252, help='Number of synthetic sessions')
+    replay.add_argument('--progress-every', type=int, default=0,
+                        help='Log progress every N bars (0 disables)')
+    replay.add_argument('--verbose', action='store_true', help='Keep INFO-level bot logging')
+    replay.set_defaults(func=run_replay)
+
+    importer = subparsers.add_parser('import', help='Import CSV bars into the bar store')
+    importer.add_argument('--store', required=True, help='Bar store directory')
+    importer.add_argument('--symbol', default='ES', help='Symbol to store the bars under')
+    importer.add_argument('--timestamp-column', default='timestamp', help='Timestamp column name')
+    importer.add_argument('files', nargs='+', help='CSV files (timestamp,open,high,low,close,volume)')
+    importer.set_defaults(func=run_import)
+
+    parity = subparsers.add_parser('parity', parents=[data],
+                                   help='Check parity with the event-driven bot')
+    parity.add_argument('--days', type=int, default=250, help='Number of synthetic sessions')
+    parity.add_argument('--sizing', choices=SIZING_METHODS,
+                        help='Position sizing method (default: from the config)')
+    parity.set_defaults(func=run_parity)
+
+    sweep = subparsers.add_parser('sweep', parents=[data], help='Sweep a parameter grid in parallel')
+    sweep.add_argument('--days', type=int, default=2520, help='Number of synthetic sessions')
+    sweep.add_argument('--grid', action='append', required=True,
+                       help='Parameter values, e.g. volume_multiplier=1.0,1.5,2.0')
+    sweep.add_argument('--results', help='JSON-lines results file (enables resume)')
+    sweep.add_argument('--processes', type=int, help='Worker processes (default: all cores)')
+    sweep.add_argument('--top', type=int, default=20, help='Rows of the ranked table to print')
+    sweep.set_defaults(func=run_sweep)
+
+    shards = subparsers.add_parser('shards', parents=[data],
+                                   help='Run symbols across process-sharded bots')
+    shards.add_argument('--days', type=int, default=250, help='Number of synthetic sessions')
+    shards.add_argument('--symbols', help='Comma-separated symbols (default: config symbols)')
+    shards.add_argument('--shards', type=int, help='Worker processes (default: one per symbol)')
+    shards.add_argument('--batch-size', type=int, default=256, help='Bars sent per IPC message')
+    shards.set_defaults(func=run_shards)
+
+    book = subparsers.add_parser('book', help='Stress the paper broker order matching')
+    book.add_argument('--orders', type=int, default=5000, help='Resting orders to submit')
+    book.add_argument('--updates', type=int, default=500000, help='Price updates to apply')
+    book.add_argument('--symbols', help='Comma-separated symbols (default: config symbols)')
+    book.add_argument('--seed', type=int, default=0, help='Random seed')
+    book.set_defaults(func=run_book)
+
+    alloc = subparsers.add_parser('alloc', parents=[data],
+                                  help='Check per-bar allocations of the bot against a budget')
+    alloc.add_argument('--days', type=int, default=20, help='Number of synthetic sessions')
+    alloc.add_argument('--warmup', type=int, default=1000, help='Bars processed before measuring')
+    alloc.add_argument('--budget', type=int, default=256,
+                       help='Maximum p99 bytes allocated per steady-state bar')
+    alloc.set_defaults(func=run_alloc)
+
+    args = parser.parse_args()
+    config = Config(args.config)
+    Logger.from_config(config)
+
+    return args.func(args, config)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,47 +1,76 @@
 #!/usr/bin/env python3
 """Main entry point for the ES Futures Trading Bot."""
+import argparse
+import asyncio
 import sys
-import signal
-from datetime import datetime, timedelta
-import pytz
+from datetime import date, timedelta
 
 from src.utils.config import Config
 from src.utils.logger import Logger
 from src.bot.trading_bot import TradingBot
-from src.data.market_data import Bar
+from src.bot.runtime import BotRuntime, store_feed
+from src.data.bar_store import BarStore
 
 
-def signal_handler(sig, frame):
-    """Handle Ctrl+C gracefully."""
-    print("\n\nShutting down gracefully...")
-    if 'bot' in globals():
-        bot.stop()
-    sys.exit(0)
+async def run(args: argparse.Namespace):
+    """Build the bot and its feeds, then run until stopped."""
+    config = Config(args.config)
+    logger = Logger.from_config(config)
 
+    bot = TradingBot(config)
 
-def main():
-    """Main function to run the trading bot."""
-    # Set up signal handler for graceful shutdown
-    signal.signal(signal.SIGINT, signal_handler)
+    feeds = []
+    if args.store:
+        store = BarStore(args.store, config.timezone)
+        start = date.fromisoformat(args.start) if args.start else None
+        for symbol in bot.pipelines:
+            if not store.has_symbol(symbol):
+                logger.warning(f"No stored bars for {symbol} in {args.store}")
+                continue
+            if start is not None:
+                # Sizing inputs from the sessions before the replay
+                bot.sizing_cache.load_store(store, symbol, config.timezone,
+                                            end=start - timedelta(days=1))
+            feeds.append(store_feed(
+                store, symbol, bot.timezone,
+                start=start,
+                end=date.fromisoformat(args.end) if args.end else None,
+                interval=args.interval,
+                calendar=bot.session_calendar
+            ))
 
-    try:
-        # Load configuration
-        config = Config("config.yaml")
-        logger = Logger.get_logger(log_file=config.log_file, level=config.log_level)
-
-        # Create and start the bot
-        bot = globals()['bot'] = TradingBot(config)
-        bot.start()
+    runtime = BotRuntime(
+        bot, feeds,
+        queue_size=config.queue_size,
+        overflow_policy=config.overflow_policy,
+        heartbeat_seconds=config.heartbeat_seconds,
+        config_path=args.config,
+        reload_seconds=config.config_reload_seconds
+    )
 
+    if not feeds:
         logger.info("\nBot is now running in simulation mode.")
         logger.info("In a live environment, this would connect to your broker's data feed.")
         logger.info("For testing, run the simulator: python simulator.py")
-        logger.info("\nPress Ctrl+C to stop the bot.\n")
+        logger.info("or replay stored bars: python main.py --store data/store")
+    logger.info("\nPress Ctrl+C to stop the bot.\n")
+
+    await runtime.run()
 
-        # Keep the bot running
-        while bot.is_running:
-            import time
-            time.sleep(1)
+
+def main():
+    """Main function to run the trading bot."""
+    parser = argparse.ArgumentParser(description="ES futures opening range breakout bot")
+    parser.add_argument('--config', default="config.yaml", help="Configuration file")
+    parser.add_argument('--store', help="Replay bars from this bar store as the feed")
+    parser.add_argument('--start', help="First session to replay (YYYY-MM-DD)")
+    parser.add_argument('--end', help="Last session to replay (YYYY-MM-DD)")
+    parser.add_argument('--interval', type=float, default=0.0,
+                        help="Seconds between replayed bars")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run(args))
 
     except FileNotFoundError as e:
         print(f"Error: {e}")
@@ -21,9 +21,11 @@ from src.data.market_data import Bar
 class MarketSimulator:
     """Simulates market data for testing the trading bot."""
 
-    def __init__(self, bot: TradingBot, start_price: float = 5000.0):
+    def __init__(self, bot: TradingBot, start_price: float = 5000.0,
+                 pause_seconds: float = 2.0):
         self.bot = bot
         self.start_price = start_price
+        self.pause_seconds = pause_seconds  # Pause between phases (0 for headless runs)
         self.current_price = start_price
         self.timezone = pytz.timezone('America/New_York')
         self.logger = Logger.get_logger()
@@ -146,6 +148,11 @@ class MarketSimulator:
                     self.logger.info(f"  >>> TARGET REACHED <<<")
                     break
 
+    def _pause(self):
+        """Pause between simulation phases."""
+        if self.pause_seconds > 0:
+            time.sleep(self.pause_seconds)
+
     def run_full_day_simulation(self):
         """Run a full day simulation."""
         self.logger.info("\n" + "="*80)
@@ -161,14 +168,14 @@ class MarketSimulator:
         self.generate_opening_range(current_time, or_minutes=5)
         current_time += timedelta(minutes=5)
 
-        time.sleep(2)  # Pause for readability
+        self._pause()  # Pause for readability
 
         # 2. Generate breakout (random direction)
         breakout_type = random.choice(["bullish", "bearish"])
         self.generate_breakout_scenario(current_time, breakout_type)
         current_time += timedelta(minutes=10)
 
-        time.sleep(2)
+        self._pause()
 
         # 3. Get target from position
         position_info = self.bot.order_manager.get_position_info()
@@ -176,7 +183,7 @@ class MarketSimulator:
             target_price = position_info['target_price']
             self.generate_profit_target_move(current_time, target_price)
 
-        time.sleep(2)
+        self._pause()
 
         # 4. Print final statistics
         self.logger.info("\n" + "="*80)
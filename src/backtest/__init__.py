@@ -0,0 +1,15 @@
+"""Backtesting modules."""
+from .vectorized import (
+    VectorizedBacktester, BacktestParams, BacktestResult, SessionLayout, EXIT_REASONS,
+    filters_from_config
+)
+from .sweep import ParameterSweep, SharedBars, parameter_grid, run_fingerprint
+from .replay import ReplayRunner, iter_columns, iter_store, iter_merged
+from .allocations import profile_allocations
+
+__all__ = [
+    'VectorizedBacktester', 'BacktestParams', 'BacktestResult', 'SessionLayout',
+    'EXIT_REASONS', 'filters_from_config', 'ParameterSweep', 'SharedBars',
+    'parameter_grid', 'run_fingerprint',
+    'ReplayRunner', 'iter_columns', 'iter_store', 'iter_merged', 'profile_allocations'
+]
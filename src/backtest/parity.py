@@ -0,0 +1,79 @@
+"""Parity checks between the vectorized backtester and the event-driven bot."""
+import logging
+from typing import Dict, List, Tuple
+import numpy as np
+
+from ..bot.trading_bot import TradingBot
+from ..utils.config import Config
+from ..utils.logger import Logger
+from .replay import iter_columns
+from .vectorized import BacktestParams, BacktestResult, VectorizedBacktester, filters_from_config
+
+
+def run_event_driven(config: Config, bars: Dict[str, np.ndarray]) -> List[Dict]:
+    """
+    Push a bar history through TradingBot.on_bar and return its trade history.
+
+    Args:
+        config: Bot configuration
+        bars: Dictionary of bar columns (ts, open, high, low, close, volume)
+
+    Returns:
+        PaperBroker trade history
+    """
+    bot = TradingBot(config)
+    logger = Logger.get_logger()
+    previous_level = logger.level
+    logger.setLevel(logging.ERROR)
+
+    try:
+        bot.start()
+        for bar in iter_columns(bars, bot.timezone):
+            bot.on_bar(bar)
+        return bot.broker.get_trade_history()
+    finally:
+        logger.setLevel(previous_level)
+
+
+def run_vectorized(config: Config, bars: Dict[str, np.ndarray]) -> BacktestResult:
+    """Run the vectorized backtester with the same settings as the bot."""
+    backtester = VectorizedBacktester(BacktestParams.from_config(config))
+    return backtester.run(bars['ts'], bars['open'], bars['high'], bars['low'],
+                          bars['close'], bars['volume'], **filters_from_config(config))
+
+
+def compare_trades(result: BacktestResult, trade_history: List[Dict],
+                   tolerance: float = 1e-6) -> List[str]:
+    """
+    Compare vectorized trades against the bot's trade history.
+
+    Returns:
+        List of mismatch descriptions (empty when the runs agree)
+    """
+    mismatches = []
+    if len(result) != len(trade_history):
+        mismatches.append(
+            f"Trade count differs: vectorized={len(result)}, event-driven={len(trade_history)}"
+        )
+
+    for i, trade in enumerate(trade_history[:len(result)]):
+        side = 'buy' if result.direction[i] > 0 else 'sell'
+        expected = (side, float(result.entry_price[i]), float(result.exit_price[i]),
+                    int(result.quantity[i]), float(result.pnl[i]))
+        actual = (trade['side'], trade['entry_price'], trade['exit_price'],
+                  trade['quantity'], trade['pnl'])
+        if (expected[0] != actual[0] or expected[3] != actual[3]
+                or any(abs(a - b) > tolerance for a, b in
+                       ((expected[1], actual[1]), (expected[2], actual[2]),
+                        (expected[4], actual[4])))):
+            mismatches.append(f"Trade {i} on {result.trade_date[i]}: "
+                              f"vectorized={expected}, event-driven={actual}")
+
+    return mismatches
+
+
+def check_parity(config: Config, bars: Dict[str, np.ndarray]) -> Tuple[BacktestResult, List[str]]:
+    """Run both engines on the same bars and report any differences."""
+    result = run_vectorized(config, bars)
+    history = run_event_driven(config, bars)
+    return result, compare_trades(result, history)
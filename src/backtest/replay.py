@@ -0,0 +1,149 @@
+"""Headless replay of historical bars through the event-driven TradingBot."""
+import logging
+import time
+from datetime import date
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+import numpy as np
+
+from ..bot.trading_bot import TradingBot
+from ..data.bar_store import BarStore
+from ..data.market_data import Bar
+from ..data.session_calendar import SessionCalendar
+from ..utils.logger import Logger
+
+
+def iter_columns(bars: Dict[str, np.ndarray], timezone, chunk_size: int = 65536,
+                 symbol: Optional[str] = None) -> Iterator[Bar]:
+    """
+    Yield Bar objects from bar columns.
+
+    Columns are converted to Python scalars a chunk at a time, which is far
+    cheaper than indexing NumPy arrays element by element. Bars are tagged
+    with ``symbol`` if given (untagged bars go to the bot's primary symbol).
+    """
+    ts = bars['ts']
+    for start in range(0, len(ts), chunk_size):
+        stop = start + chunk_size
+        rows = zip(ts[start:stop].tolist(), bars['open'][start:stop].tolist(),
+                   bars['high'][start:stop].tolist(), bars['low'][start:stop].tolist(),
+                   bars['close'][start:stop].tolist(), bars['volume'][start:stop].tolist())
+        for epoch_ns, open_price, high, low, close, volume in rows:
+            yield Bar(epoch_ns, open_price, high, low, close, volume, symbol, timezone)
+
+
+def iter_store(store: BarStore, symbol: str, timezone, start: Optional[date] = None,
+               end: Optional[date] = None, tag: bool = False,
+               calendar: Optional[SessionCalendar] = None) -> Iterator[Bar]:
+    """
+    Yield Bar objects session by session from a BarStore (tagged with the symbol if ``tag``).
+
+    Dates that are not sessions of ``calendar`` (weekends, holidays) are
+    skipped without loading their bars.
+    """
+    bar_symbol = symbol.upper() if tag else None
+    for session in store.sessions(symbol):
+        session = session.item()
+        if (start and session < start) or (end and session > end):
+            continue
+        if calendar is not None and not calendar.is_session(session):
+            continue
+        yield from iter_columns(BarStore.columns(store.load_day(symbol, session)), timezone,
+                                symbol=bar_symbol)
+
+
+def iter_merged(bars_by_symbol: Dict[str, Dict[str, np.ndarray]],
+                chunk_size: int = 65536) -> Iterator[Tuple]:
+    """
+    Merge several symbols' bar columns into one time-ordered stream.
+
+    Yields:
+        Tuples of (symbol, epoch ns, open, high, low, close, volume), the
+        form ShardSupervisor.route() takes
+    """
+    symbols = list(bars_by_symbol)
+    ts = np.concatenate([bars_by_symbol[s]['ts'] for s in symbols])
+    owner = np.concatenate([np.full(len(bars_by_symbol[s]['ts']), i, dtype=np.int32)
+                            for i, s in enumerate(symbols)])
+    order = np.argsort(ts, kind='stable')
+    columns = {name: np.concatenate([bars_by_symbol[s][name] for s in symbols])[order]
+               for name in ('open', 'high', 'low', 'close', 'volume')}
+    ts = ts[order]
+    owner = owner[order]
+
+    for start in range(0, len(ts), chunk_size):
+        stop = start + chunk_size
+        rows = zip(owner[start:stop].tolist(), ts[start:stop].tolist(),
+                   columns['open'][start:stop].tolist(), columns['high'][start:stop].tolist(),
+                   columns['low'][start:stop].tolist(), columns['close'][start:stop].tolist(),
+                   columns['volume'][start:stop].tolist())
+        for index, epoch_ns, open_price, high, low, close, volume in rows:
+            yield symbols[index], epoch_ns, open_price, high, low, close, volume
+
+
+class ReplayRunner:
+    """Drive TradingBot.on_bar from a bar generator as fast as possible."""
+
+    def __init__(self, bot: TradingBot, log_level: str = "WARNING",
+                 progress_every: int = 0):
+        """
+        Args:
+            bot: Trading bot to replay through (started by run() if needed)
+            log_level: Logger level during the replay; per-bar INFO/DEBUG
+                output is suppressed at the default WARNING
+            progress_every: Log a progress line every N bars (0 disables)
+        """
+        self.bot = bot
+        self.log_level = log_level
+        self.progress_every = progress_every
+        self.logger = Logger.get_logger()
+
+    def run(self, bars: Iterable[Bar]) -> Dict:
+        """
+        Replay bars through the bot.
+
+        Returns:
+            Summary with bar count, elapsed seconds, bars/second and the
+            broker's trade statistics
+        """
+        if not self.bot.is_running:
+            self.bot.start()
+
+        previous_level = self.logger.level
+        self.logger.setLevel(getattr(logging, self.log_level.upper()))
+
+        on_bar = self.bot.on_bar
+        progress_every = self.progress_every
+        count = 0
+        start = time.perf_counter()
+
+        try:
+            if progress_every:
+                for bar in bars:
+                    on_bar(bar)
+                    count += 1
+                    if count % progress_every == 0:
+                        elapsed = time.perf_counter() - start
+                        self.logger.warning(
+                            f"Replay progress: {count} bars, {bar.timestamp.date()}, "
+                            f"{count / elapsed:.0f} bars/s"
+                        )
+            else:
+                for bar in bars:
+                    on_bar(bar)
+                    count += 1
+        finally:
+            elapsed = time.perf_counter() - start
+            self.logger.setLevel(previous_level)
+
+        summary = {
+            'bars': count,
+            'seconds': elapsed,
+            'bars_per_second': count / elapsed if elapsed > 0 else 0.0,
+            'statistics': self.bot.broker.get_statistics(),
+        }
+
+        self.logger.info(
+            f"Replay complete: {count} bars in {elapsed:.2f}s "
+            f"({summary['bars_per_second']:.0f} bars/s)"
+        )
+        return summary
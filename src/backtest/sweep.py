@@ -0,0 +1,283 @@
+"""Parallel parameter sweeps over shared-memory bar data."""
+import hashlib
+import itertools
+import json
+import multiprocessing
+import time
+from datetime import date
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+
+from ..utils.config import Config
+from ..utils.logger import Logger
+from .vectorized import BacktestParams, SessionLayout, VectorizedBacktester, filters_from_config
+
+BAR_COLUMNS = ('ts', 'open', 'high', 'low', 'close', 'volume')
+
+
+def parameter_grid(grid: Dict[str, Iterable[Any]]) -> List[Dict[str, Any]]:
+    """Expand {name: [values]} into the list of all parameter combinations."""
+    names = sorted(grid)
+    return [dict(zip(names, values))
+            for values in itertools.product(*(list(grid[name]) for name in names))]
+
+
+def config_key(overrides: Dict[str, Any]) -> str:
+    """Stable identifier of a parameter combination (used for resuming)."""
+    return json.dumps(overrides, sort_keys=True)
+
+
+def run_fingerprint(base_params: BacktestParams, bars: Dict[str, np.ndarray],
+                    config: Optional[Config] = None,
+                    excluded_dates: Optional[Iterable[date]] = None) -> str:
+    """
+    Identifier of everything a sweep's results depend on besides the overrides.
+
+    Hashes the base parameters, the bar data identity (count, first and last
+    timestamp), the excluded dates and, when filters are applied, the
+    configuration they are built from. Recorded results are only reused under the same fingerprint.
+    """
+    ts = bars['ts']
+    identity = {
+        'params': base_params.to_dict(),
+        'bars': [len(ts), int(ts[0]), int(ts[-1])] if len(ts) else [0],
+        'excluded': sorted(excluded_dates) if excluded_dates else [],
+        'config': config.config if config is not None else None,
+    }
+    text = json.dumps(identity, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+class SharedBars:
+    """
+    Bar columns placed once in a single shared memory block.
+
+    The parent creates the block and hands ``spec`` to workers, which map
+    the same memory with attach() instead of receiving a pickled copy.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, spec: Dict, owner: bool):
+        self.shm = shm
+        self.spec = spec
+        self.owner = owner
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.ndarray((spec['length'],), dtype=np.dtype(dtype),
+                             buffer=shm.buf, offset=offset)
+            for name, dtype, offset in spec['columns']
+        }
+
+    @classmethod
+    def create(cls, bars: Dict[str, np.ndarray]) -> 'SharedBars':
+        """Copy bar columns into a new shared memory block."""
+        length = len(bars['ts'])
+        layout = []
+        offset = 0
+        for name in BAR_COLUMNS:
+            dtype = np.asarray(bars[name]).dtype
+            layout.append((name, dtype.str, offset))
+            offset += length * dtype.itemsize
+
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        spec = {'name': shm.name, 'length': length, 'columns': layout}
+        shared = cls(shm, spec, owner=True)
+        for name in BAR_COLUMNS:
+            shared.columns[name][:] = bars[name]
+        return shared
+
+    @classmethod
+    def attach(cls, spec: Dict) -> 'SharedBars':
+        """Map an existing shared memory block described by ``spec``."""
+        return cls(shared_memory.SharedMemory(name=spec['name']), spec, owner=False)
+
+    def close(self):
+        """Release this process's mapping (and the block itself if owner)."""
+        self.columns = {}
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+# Per-worker state, set once by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(spec: Dict, base_params: Dict, excluded_dates: Optional[List[date]],
+                 config: Optional[Config]):
+    """Attach to the shared bars and prepare the layout and filters once per worker."""
+    shared = SharedBars.attach(spec)
+    base = BacktestParams(**base_params)
+    _worker['shared'] = shared
+    _worker['base'] = base
+    _worker['excluded'] = excluded_dates
+    _worker['filters'] = filters_from_config(config) if config is not None else {}
+    _worker['layouts'] = {
+        base.timezone: SessionLayout(shared.columns['ts'], base.timezone)
+    }
+
+
+def _run_config(overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Backtest one parameter combination inside a worker."""
+    params = _worker['base'].replace(**overrides)
+    bars = _worker['shared'].columns
+
+    layout = _worker['layouts'].get(params.timezone)
+    if layout is None:
+        layout = _worker['layouts'][params.timezone] = SessionLayout(bars['ts'], params.timezone)
+
+    result = VectorizedBacktester(params).run(
+        bars['ts'], bars['open'], bars['high'], bars['low'], bars['close'],
+        bars['volume'], excluded_dates=_worker['excluded'], layout=layout,
+        **_worker['filters']
+    )
+    stats = result.get_statistics()
+
+    return {
+        'key': config_key(overrides),
+        'params': overrides,
+        'total_pnl': stats['total_pnl'],
+        'total_trades': stats['total_trades'],
+        'win_rate': stats['win_rate'],
+        'max_drawdown': result.max_drawdown(),
+        'average_win': stats['average_win'],
+        'average_loss': stats['average_loss'],
+    }
+
+
+class ParameterSweep:
+    """Fan backtests for a parameter grid out across a process pool."""
+
+    def __init__(self, base_params: BacktestParams, grid: Dict[str, Iterable[Any]],
+                 results_path: Optional[str] = None, processes: Optional[int] = None,
+                 progress_interval: float = 2.0, config: Optional[Config] = None):
+        """
+        Args:
+            base_params: Parameters shared by every run
+            grid: Parameter name -> values to sweep
+            results_path: JSON-lines file results are appended to; finished
+                combinations found there for the same base parameters, data
+                and config are skipped, so a sweep can resume
+            processes: Worker count (defaults to all cores)
+            progress_interval: Seconds between progress log lines
+            config: Bot configuration whose news and volatility filters
+                every run applies (none without it)
+        """
+        self.base_params = base_params
+        self.configs = parameter_grid(grid)
+        self.results_path = Path(results_path) if results_path else None
+        self.processes = processes or multiprocessing.cpu_count()
+        self.progress_interval = progress_interval
+        self.config = config
+        self.logger = Logger.get_logger()
+
+        known = set(base_params.to_dict())
+        unknown = set(grid) - known
+        if unknown:
+            raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+
+    def _load_completed(self, fingerprint: str) -> Dict[str, Dict]:
+        """Read results already recorded in the results file by the same run."""
+        completed = {}
+        if not self.results_path or not self.results_path.exists():
+            return completed
+
+        stale = 0
+        with open(self.results_path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Partially written line from an interrupted run
+                if record.get('run') != fingerprint:
+                    stale += 1  # Other base parameters, data or config
+                    continue
+                completed[record['key']] = record
+
+        if stale:
+            self.logger.info(f"Sweep: ignoring {stale} results of other runs in {self.results_path}")
+        return completed
+
+    def run(self, bars: Dict[str, np.ndarray],
+            excluded_dates: Optional[Iterable[date]] = None) -> pd.DataFrame:
+        """
+        Run all pending combinations and return the ranked results table.
+
+        Args:
+            bars: Dictionary of bar columns (ts, open, high, low, close, volume)
+            excluded_dates: Session dates on which trading is not allowed
+
+        Returns:
+            DataFrame sorted by total P&L (best first)
+        """
+        fingerprint = run_fingerprint(self.base_params, bars, self.config, excluded_dates)
+        completed = self._load_completed(fingerprint)
+        pending = [c for c in self.configs if config_key(c) not in completed]
+        total = len(self.configs)
+
+        self.logger.info(
+            f"Sweep: {total} configs, {len(completed)} already done, "
+            f"{len(pending)} to run on {self.processes} processes"
+        )
+
+        results = [completed[config_key(c)] for c in self.configs
+                   if config_key(c) in completed]
+
+        if pending:
+            results.extend(self._run_pending(bars, pending, excluded_dates, fingerprint,
+                                             len(completed), total))
+
+        return self.rank(results)
+
+    def _run_pending(self, bars: Dict[str, np.ndarray], pending: List[Dict],
+                     excluded_dates: Optional[Iterable[date]], fingerprint: str,
+                     done: int, total: int) -> List[Dict]:
+        """Execute pending combinations in the pool, streaming results to disk."""
+        shared = SharedBars.create(bars)
+        excluded = sorted(excluded_dates) if excluded_dates else None
+        results = []
+
+        out = open(self.results_path, 'a') if self.results_path else None
+        try:
+            chunksize = max(1, len(pending) // (self.processes * 8))
+            with multiprocessing.Pool(
+                self.processes, initializer=_init_worker,
+                initargs=(shared.spec, self.base_params.to_dict(), excluded, self.config)
+            ) as pool:
+                start = time.perf_counter()
+                last_report = start
+
+                for record in pool.imap_unordered(_run_config, pending, chunksize=chunksize):
+                    record['run'] = fingerprint
+                    results.append(record)
+                    if out:
+                        out.write(json.dumps(record) + '\n')
+                        out.flush()
+
+                    now = time.perf_counter()
+                    if now - last_report >= self.progress_interval or len(results) == len(pending):
+                        last_report = now
+                        rate = len(results) / (now - start)
+                        self.logger.info(
+                            f"Sweep progress: {done + len(results)}/{total} configs "
+                            f"({(done + len(results)) / total * 100:.1f}%), "
+                            f"{rate:.1f} configs/s"
+                        )
+        finally:
+            if out:
+                out.close()
+            shared.close()
+
+        return results
+
+    @staticmethod
+    def rank(results: List[Dict]) -> pd.DataFrame:
+        """Flatten results into a table ranked by total P&L."""
+        if not results:
+            return pd.DataFrame()
+
+        rows = [dict(r['params'], **{k: v for k, v in r.items() if k not in ('key', 'params', 'run')})
+                for r in results]
+        table = pd.DataFrame(rows).sort_values('total_pnl', ascending=False)
+        return table.reset_index(drop=True)
@@ -0,0 +1,61 @@
+"""Synthetic minute-bar sessions for benchmarks and parity checks."""
+from datetime import date
+from typing import Dict
+import numpy as np
+import pandas as pd
+
+
+def generate_sessions(days: int, start: date = date(2015, 1, 2), seed: int = 0,
+                      start_price: float = 2000.0, session_start: str = "09:00",
+                      session_end: str = "11:00", tick_size: float = 0.25,
+                      timezone: str = "America/New_York") -> Dict[str, np.ndarray]:
+    """
+    Generate a random-walk minute-bar history over consecutive weekdays.
+
+    Args:
+        days: Number of trading sessions
+        start: First calendar date (weekends are skipped)
+        seed: Random seed
+        start_price: Price at the first bar
+        session_start: Local time of the first bar each session
+        session_end: Local time after the last bar each session
+        tick_size: Prices are rounded to this increment
+        timezone: Timezone of the session times
+
+    Returns:
+        Dictionary of bar columns: ts (epoch ns), open, high, low, close, volume
+    """
+    rng = np.random.default_rng(seed)
+
+    dates = pd.bdate_range(start, periods=days)
+    first = pd.Timedelta(session_start + ':00')
+    bars_per_day = int((pd.Timedelta(session_end + ':00') - first) / pd.Timedelta(minutes=1))
+    offsets = first + pd.to_timedelta(np.arange(bars_per_day), unit='min')
+
+    wall = (dates.values[:, None] + offsets.values[None, :]).ravel()
+    ts = (pd.DatetimeIndex(wall).tz_localize(timezone).tz_convert('UTC')
+          .as_unit('ns').asi8)
+
+    n = len(ts)
+    steps = np.rint(rng.normal(0.0, 6.0, n)).astype(np.int64)
+    close_ticks = np.round(start_price / tick_size).astype(np.int64) + np.cumsum(steps)
+    open_ticks = np.empty(n, dtype=np.int64)
+    open_ticks[0] = close_ticks[0] - steps[0]
+    open_ticks[1:] = close_ticks[:-1]
+
+    wick = rng.choice([0, 1, 2, 4], size=(2, n))
+    high_ticks = np.maximum(open_ticks, close_ticks) + wick[0]
+    low_ticks = np.minimum(open_ticks, close_ticks) - wick[1]
+
+    volume = rng.integers(300, 1500, n)
+    spikes = rng.random(n) < 0.1
+    volume[spikes] = rng.integers(2000, 4000, spikes.sum())
+
+    return {
+        'ts': ts,
+        'open': open_ticks * tick_size,
+        'high': high_ticks * tick_size,
+        'low': low_ticks * tick_size,
+        'close': close_ticks * tick_size,
+        'volume': volume.astype(np.int64),
+    }
@@ -0,0 +1,508 @@
+"""Vectorized backtest engine for the opening range breakout strategy."""
+from datetime import date
+from typing import Any, Dict, Iterable, Optional
+import numpy as np
+import pandas as pd
+
+from ..data.instruments import get_instrument
+from ..data.session_calendar import SessionCalendar
+from ..risk.position_sizing import SessionSizingCache, TradeStats, size_position
+from ..utils.config import Config
+from ..utils.news_filter import NewsFilter
+from ..utils.volatility_filter import VolatilityFilter
+from ..utils.time_utils import NS_PER_DAY
+
+# Exit reason codes stored in BacktestResult.exit_reason
+EXIT_REASONS = ('stop_loss', 'target', 'time_limit', 'session_end')
+STOP_LOSS, TARGET, TIME_LIMIT, SESSION_END = range(len(EXIT_REASONS))
+
+
+class BacktestParams:
+    """Strategy and account parameters for a backtest run."""
+
+    def __init__(self, opening_range_minutes: int = 5,
+                 trading_window_start: str = "09:30",
+                 trading_window_end: str = "10:30",
+                 market_open: str = "09:30",
+                 market_close: str = "16:00",
+                 early_close: str = "13:00",
+                 holidays: bool = True,
+                 extra_holidays: Iterable[date] = (),
+                 timezone: str = "America/New_York",
+                 volume_confirmation: bool = True,
+                 volume_multiplier: float = 1.5,
+                 volume_lookback: int = 20,
+                 min_breakout_points: float = 0.25,
+                 risk_reward_ratio: float = 2.0,
+                 max_position_size: int = 1,
+                 max_daily_loss: float = 500.0,
+                 max_daily_trades: int = 3,
+                 risk_percent: float = 0.02,
+                 point_value: float = 50.0,
+                 initial_balance: float = 100000.0,
+                 intrabar_path: str = "worst_case",
+                 position_sizing_method: str = "fixed",
+                 kelly_fraction: float = 0.5,
+                 kelly_min_trades: int = 20,
+                 trade_lookback: int = 50,
+                 volatility_lookback: int = 14,
+                 volatility_atr_multiple: float = 1.0):
+        self.opening_range_minutes = opening_range_minutes
+        self.trading_window_start = trading_window_start
+        self.trading_window_end = trading_window_end
+        self.market_open = market_open
+        self.market_close = market_close
+        self.early_close = early_close
+        self.holidays = holidays
+        self.extra_holidays = tuple(extra_holidays)
+        self.timezone = timezone
+        self.volume_confirmation = volume_confirmation
+        self.volume_multiplier = volume_multiplier
+        self.volume_lookback = volume_lookback
+        self.min_breakout_points = min_breakout_points
+        self.risk_reward_ratio = risk_reward_ratio
+        self.max_position_size = max_position_size
+        self.max_daily_loss = max_daily_loss
+        self.max_daily_trades = max_daily_trades
+        self.risk_percent = risk_percent
+        self.point_value = point_value
+        self.initial_balance = initial_balance
+        self.intrabar_path = intrabar_path
+        self.position_sizing_method = position_sizing_method
+        self.kelly_fraction = kelly_fraction
+        self.kelly_min_trades = kelly_min_trades
+        self.trade_lookback = trade_lookback
+        self.volatility_lookback = volatility_lookback
+        self.volatility_atr_multiple = volatility_atr_multiple
+
+    @classmethod
+    def from_config(cls, config: Config, **overrides) -> 'BacktestParams':
+        """Build parameters from the bot configuration, with optional overrides."""
+        params = cls(
+            opening_range_minutes=config.opening_range_minutes,
+            trading_window_start=config.trading_window_start,
+            trading_window_end=config.trading_window_end,
+            market_open=config.market_open,
+            market_close=config.market_close,
+            early_close=config.early_close,
+            holidays=config.observe_holidays,
+            extra_holidays=config.extra_holidays,
+            timezone=config.timezone,
+            volume_confirmation=config.volume_confirmation,
+            volume_multiplier=config.volume_multiplier,
+            min_breakout_points=config.min_breakout_points,
+            risk_reward_ratio=config.risk_reward_ratio,
+            initial_balance=config.initial_balance,
+            max_position_size=config.max_position_size,
+            max_daily_loss=config.max_daily_loss,
+            max_daily_trades=config.max_daily_trades,
+            point_value=get_instrument(config.symbol).point_value,
+            intrabar_path=config.intrabar_path,
+            position_sizing_method=config.position_sizing_method,
+            kelly_fraction=config.kelly_fraction,
+            kelly_min_trades=config.kelly_min_trades,
+            trade_lookback=config.trade_lookback,
+            volatility_lookback=config.volatility_lookback,
+            volatility_atr_multiple=config.volatility_atr_multiple,
+        )
+        return params.replace(**overrides)
+
+    def session_calendar(self) -> SessionCalendar:
+        """The exchange calendar these parameters describe."""
+        return SessionCalendar(self.timezone, self.market_open, self.market_close,
+                               self.opening_range_minutes, self.trading_window_start,
+                               self.trading_window_end, self.early_close, self.holidays,
+                               self.extra_holidays)
+
+    def replace(self, **overrides) -> 'BacktestParams':
+        """Get a copy with some parameters changed."""
+        values = self.to_dict()
+        for key in overrides:
+            if key not in values:
+                raise ValueError(f"Unknown backtest parameter: {key}")
+        values.update(overrides)
+        return BacktestParams(**values)
+
+    def to_dict(self) -> Dict:
+        """Get parameters as a dictionary."""
+        return dict(vars(self))
+
+    def __repr__(self):
+        return f"BacktestParams({self.to_dict()})"
+
+
+def filters_from_config(config: Config) -> Dict[str, Any]:
+    """
+    News and volatility filters of the bot configuration.
+
+    Every backtest entry point passes these to VectorizedBacktester.run
+    (``run(..., **filters)``), so backtests skip the same days as the bot.
+    """
+    return {
+        'news_filter': NewsFilter.from_config(config),
+        'volatility_filter': VolatilityFilter.from_config(config),
+    }
+
+
+class BacktestResult:
+    """Per-trade arrays produced by a backtest run."""
+
+    def __init__(self, params: BacktestParams, trade_date: np.ndarray,
+                 entry_index: np.ndarray, exit_index: np.ndarray,
+                 direction: np.ndarray, entry_price: np.ndarray,
+                 exit_price: np.ndarray, stop_price: np.ndarray,
+                 target_price: np.ndarray, quantity: np.ndarray,
+                 pnl: np.ndarray, exit_reason: np.ndarray,
+                 sessions: int, bars: int):
+        self.params = params
+        self.trade_date = trade_date  # datetime64[D], local session date
+        self.entry_index = entry_index  # Bar index of the breakout (entry) bar
+        self.exit_index = exit_index
+        self.direction = direction  # +1 long, -1 short
+        self.entry_price = entry_price
+        self.exit_price = exit_price
+        self.stop_price = stop_price
+        self.target_price = target_price
+        self.quantity = quantity
+        self.pnl = pnl
+        self.exit_reason = exit_reason  # Codes into EXIT_REASONS
+        self.sessions = sessions
+        self.bars = bars
+
+    def __len__(self) -> int:
+        return len(self.pnl)
+
+    def equity_curve(self) -> np.ndarray:
+        """Account balance after each trade."""
+        return self.params.initial_balance + np.cumsum(self.pnl)
+
+    def max_drawdown(self) -> float:
+        """Largest peak-to-trough decline of the equity curve, in dollars."""
+        if not len(self.pnl):
+            return 0.0
+        equity = np.concatenate(([self.params.initial_balance], self.equity_curve()))
+        return float((np.maximum.accumulate(equity) - equity).max())
+
+    def get_statistics(self) -> Dict:
+        """Get trading statistics (same keys as PaperBroker.get_statistics)."""
+        if not len(self.pnl):
+            return {
+                'total_trades': 0,
+                'winning_trades': 0,
+                'losing_trades': 0,
+                'win_rate': 0.0,
+                'total_pnl': 0.0,
+                'average_win': 0.0,
+                'average_loss': 0.0
+            }
+
+        wins = self.pnl[self.pnl > 0]
+        losses = self.pnl[self.pnl <= 0]
+
+        return {
+            'total_trades': len(self.pnl),
+            'winning_trades': len(wins),
+            'losing_trades': len(losses),
+            'win_rate': len(wins) / len(self.pnl) * 100,
+            'total_pnl': float(self.pnl.sum()),
+            'average_win': float(wins.mean()) if len(wins) else 0,
+            'average_loss': float(losses.mean()) if len(losses) else 0,
+            'current_balance': self.params.initial_balance + float(self.pnl.sum()),
+            'max_drawdown': self.max_drawdown(),
+            'sessions': self.sessions
+        }
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Get the trade list as a DataFrame."""
+        return pd.DataFrame({
+            'date': self.trade_date,
+            'side': np.where(self.direction > 0, 'buy', 'sell'),
+            'entry_index': self.entry_index,
+            'exit_index': self.exit_index,
+            'entry_price': self.entry_price,
+            'exit_price': self.exit_price,
+            'stop_price': self.stop_price,
+            'target_price': self.target_price,
+            'quantity': self.quantity,
+            'pnl': self.pnl,
+            'exit_reason': np.asarray(EXIT_REASONS)[self.exit_reason],
+        })
+
+
+class SessionLayout:
+    """Session grouping of a bar history: local day and time of day per bar."""
+
+    def __init__(self, ts: np.ndarray, timezone: str):
+        ts = np.asarray(ts, dtype=np.int64)
+        self.timezone = timezone
+        self.n = len(ts)
+
+        wall = (pd.DatetimeIndex(ts, tz='UTC').tz_convert(timezone)
+                .tz_localize(None).as_unit('ns').asi8)
+        self.day = wall // NS_PER_DAY  # Local date as days since epoch
+        self.tod = wall - self.day * NS_PER_DAY  # Local time of day in ns
+
+        new_day = np.empty(self.n, dtype=bool)
+        if self.n:
+            new_day[0] = True
+            np.not_equal(self.day[1:], self.day[:-1], out=new_day[1:])
+        self.starts = np.flatnonzero(new_day)
+        self.day_id = np.cumsum(new_day) - 1
+        self.n_days = len(self.starts)
+        self.index = np.arange(self.n)
+
+
+class VectorizedBacktester:
+    """
+    Batch backtester that evaluates every session at once with NumPy.
+
+    Mirrors the TradingBot state machine bar for bar: the opening range is
+    anchored at the market open and includes the bar stamped at OR end, the
+    breakout must clear the range by min_breakout_points on the close with
+    the volume above volume_multiplier times the trailing average (current
+    bar included), and exits follow PaperBroker's resting stop and target:
+    the first later bar whose range reaches either level exits there (at
+    the open if the bar gaps through it), otherwise the position closes at
+    the trading window end. When one bar reaches both levels,
+    ``intrabar_path`` decides which came first ('ohlc': high first, 'olhc':
+    low first, 'worst_case': the stop). Each session takes at most one
+    trade, as in the event-driven bot.
+
+    A position still open at the last bar of a session (data that stops
+    before the window end) is closed there with reason 'session_end'.
+    """
+
+    def __init__(self, params: BacktestParams):
+        self.params = params
+
+    def run(self, ts: np.ndarray, open_: np.ndarray, high: np.ndarray,
+            low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+            excluded_dates: Optional[Iterable[date]] = None,
+            layout: Optional['SessionLayout'] = None,
+            volatility_filter: Optional[VolatilityFilter] = None,
+            news_filter: Optional[NewsFilter] = None) -> BacktestResult:
+        """
+        Run the backtest over a contiguous, time-ordered bar history.
+
+        Args:
+            ts: Bar timestamps as int64 epoch nanoseconds (UTC)
+            open_, high, low, close, volume: Bar columns
+            excluded_dates: Session dates on which trading is not allowed
+                (e.g. news days)
+            layout: Precomputed SessionLayout of ``ts``, to share the
+                timezone conversion across many runs on the same bars
+            volatility_filter: Skips sessions whose first bar falls outside
+                the filter's band
+            news_filter: Skips news sessions and blocks entries inside
+                release blackout windows
+
+        Returns:
+            BacktestResult with one entry per trade
+        """
+        p = self.params
+        n = len(ts)
+        if n == 0:
+            return self._empty_result(0, 0)
+
+        open_ = np.asarray(open_, dtype=np.float64)
+        high = np.asarray(high, dtype=np.float64)
+        low = np.asarray(low, dtype=np.float64)
+        close = np.asarray(close, dtype=np.float64)
+        volume = np.asarray(volume, dtype=np.int64)
+
+        if layout is None or layout.timezone != p.timezone or layout.n != n:
+            layout = SessionLayout(ts, p.timezone)
+        day, starts, day_id = layout.day, layout.starts, layout.day_id
+        n_days = layout.n_days
+        idx = layout.index
+
+        def first_per_day(mask: np.ndarray) -> np.ndarray:
+            """Index of the first True bar of each session, or n if none."""
+            return np.minimum.reduceat(np.where(mask, idx, n), starts)
+
+        # Per-session boundaries (holidays, half days, DST) broadcast to the bars
+        ts = np.asarray(ts, dtype=np.int64)
+        calendar = p.session_calendar()
+        session_dates = day[starts].astype('datetime64[D]')
+        bounds = calendar.boundaries(session_dates)
+        window_start = bounds['window_start'][day_id]
+        window_end = bounds['window_end'][day_id]
+        market_open = bounds['open'][day_id]
+        or_end = bounds['or_end'][day_id]
+
+        # Sessions on which the bot would trade at all
+        active_day = calendar.session_mask(session_dates)
+        if excluded_dates:
+            excluded = np.array(sorted(excluded_dates), dtype='datetime64[D]')
+            active_day &= ~np.isin(session_dates, excluded)
+        if news_filter is not None:
+            active_day &= ~news_filter.session_mask(session_dates)
+        if volatility_filter is not None:
+            active_day &= volatility_filter.allowed_mask(ts[starts])
+        if p.max_daily_loss <= 0 or p.max_daily_trades <= 0:
+            active_day[:] = False
+
+        # WAITING_FOR_MARKET_OPEN -> CALCULATING_OPENING_RANGE
+        open_idx = first_per_day(ts >= window_start)
+
+        # CALCULATING_OPENING_RANGE -> WAITING_FOR_BREAKOUT on the first later bar at/after OR end
+        calc_idx = first_per_day((idx > open_idx[day_id]) & (ts >= or_end))
+
+        in_or = (ts >= market_open) & (ts <= or_end)
+        or_high = np.maximum.reduceat(np.where(in_or, high, -np.inf), starts)
+        or_low = np.minimum.reduceat(np.where(in_or, low, np.inf), starts)
+        has_range = np.isfinite(or_high) & (calc_idx < n)
+
+        # Trailing average volume including the current bar
+        lookback = p.volume_lookback
+        cum_volume = np.cumsum(volume)
+        window_volume = cum_volume.copy()
+        window_volume[lookback:] -= cum_volume[:-lookback]
+        avg_volume = window_volume / np.minimum(idx + 1, lookback)
+
+        if p.volume_confirmation:
+            volume_ok = (avg_volume == 0) | (volume >= avg_volume * p.volume_multiplier)
+        else:
+            volume_ok = np.ones(n, dtype=bool)
+
+        bar_or_high = or_high[day_id]
+        bar_or_low = or_low[day_id]
+        bullish = close > bar_or_high + p.min_breakout_points
+        bearish = close < bar_or_low - p.min_breakout_points
+
+        tradable = (active_day & has_range)[day_id]
+        signal = (tradable & (idx > calc_idx[day_id]) & (ts < window_end)
+                  & (bullish | bearish) & volume_ok)
+        if news_filter is not None:
+            signal &= ~news_filter.blackout_mask(ts)
+        entry_idx = first_per_day(signal)
+
+        traded = entry_idx < n
+        trade_days = np.flatnonzero(traded)
+        entry = entry_idx[traded]
+        direction = np.where(bullish[entry], 1, -1)
+        entry_price = close[entry]
+
+        stop_price = np.where(direction > 0, or_low[traded], or_high[traded])
+        risk = (entry_price - stop_price) * direction
+        target_price = entry_price + direction * (risk * p.risk_reward_ratio)
+
+        # IN_POSITION: first later bar whose range reaches stop/target, or window end
+        bar_entry = np.full(n_days, n)
+        bar_entry[trade_days] = entry
+        bar_stop = np.zeros(n_days)
+        bar_stop[trade_days] = stop_price
+        bar_target = np.zeros(n_days)
+        bar_target[trade_days] = target_price
+        bar_dir = np.zeros(n_days, dtype=np.int64)
+        bar_dir[trade_days] = direction
+
+        d = bar_dir[day_id]
+        long_ = d > 0
+        stop_level = bar_stop[day_id]
+        target_level = bar_target[day_id]
+        stop_hit = np.where(long_, low <= stop_level, high >= stop_level)
+        target_hit = np.where(long_, high >= target_level, low <= target_level)
+        time_hit = ts >= window_end
+        exit_idx_all = first_per_day(
+            (idx > bar_entry[day_id]) & (stop_hit | target_hit | time_hit)
+        )
+        exit_idx = exit_idx_all[traded]
+
+        session_last = np.append(starts[1:], n) - 1
+        open_at_end = exit_idx >= n
+        exit_idx = np.where(open_at_end, session_last[traded], exit_idx)
+
+        long_trade = direction > 0
+        exit_open = open_[exit_idx]
+        stop_gap = np.where(long_trade, exit_open <= stop_price, exit_open >= stop_price)
+        target_gap = np.where(long_trade, exit_open >= target_price, exit_open <= target_price)
+        both = stop_hit[exit_idx] & target_hit[exit_idx]
+        if p.intrabar_path == 'ohlc':
+            stop_first = ~long_trade  # High first: a short's stop, a long's target
+        elif p.intrabar_path == 'olhc':
+            stop_first = long_trade
+        else:
+            stop_first = np.ones(len(entry), dtype=bool)
+
+        exit_reason = np.select(
+            [open_at_end, stop_gap, target_gap, both & stop_first, both,
+             stop_hit[exit_idx], target_hit[exit_idx]],
+            [SESSION_END, STOP_LOSS, TARGET, STOP_LOSS, TARGET, STOP_LOSS, TARGET],
+            default=TIME_LIMIT
+        )
+        exit_price = np.select(
+            [open_at_end, stop_gap | target_gap, exit_reason == STOP_LOSS,
+             exit_reason == TARGET],
+            [close[exit_idx], exit_open, stop_price, target_price],
+            default=close[exit_idx]
+        )
+
+        trade_date = day[starts][traded].astype('datetime64[D]')
+        session_atr = None
+        if p.position_sizing_method == 'volatility_based' and p.max_position_size > 1:
+            cache = SessionSizingCache(volatility_lookback=p.volatility_lookback)
+            cache.load_sessions('', ts, high, low, close, p.timezone)
+            session_atr = [cache.atr[''].get(d) for d in trade_date.tolist()]
+        quantity = self._position_sizes(entry_price, stop_price, exit_price, direction,
+                                        session_atr)
+        pnl = (exit_price - entry_price) * direction * quantity * p.point_value
+
+        return BacktestResult(
+            params=p,
+            trade_date=trade_date,
+            entry_index=entry,
+            exit_index=exit_idx,
+            direction=direction,
+            entry_price=entry_price,
+            exit_price=exit_price,
+            stop_price=stop_price,
+            target_price=target_price,
+            quantity=quantity,
+            pnl=pnl,
+            exit_reason=exit_reason,
+            sessions=int(active_day.sum()),
+            bars=n
+        )
+
+    def _position_sizes(self, entry_price: np.ndarray, stop_price: np.ndarray,
+                        exit_price: np.ndarray, direction: np.ndarray,
+                        session_atr: Optional[list] = None) -> np.ndarray:
+        """Contracts per trade, following RiskManager.calculate_position_size."""
+        p = self.params
+        n_trades = len(entry_price)
+        if p.max_position_size <= 1:
+            return np.ones(n_trades, dtype=np.int64)
+
+        # Size depends on the running balance, so walk the trades in order
+        risk_points = (entry_price - stop_price) * direction
+        quantity = np.ones(n_trades, dtype=np.int64)
+        balance = p.initial_balance
+        trade_stats = TradeStats(p.trade_lookback)
+        for i in range(n_trades):
+            if risk_points[i] > 0:
+                quantity[i] = size_position(
+                    p.position_sizing_method, balance, float(risk_points[i]), p.point_value,
+                    p.risk_percent, p.max_position_size,
+                    atr=session_atr[i] if session_atr is not None else None,
+                    trade_stats=trade_stats, kelly_fraction=p.kelly_fraction,
+                    kelly_min_trades=p.kelly_min_trades,
+                    atr_multiple=p.volatility_atr_multiple
+                )
+            pnl = ((exit_price[i] - entry_price[i]) * direction[i]
+                   * quantity[i] * p.point_value)
+            balance += pnl
+            trade_stats.add(float(pnl))
+        return quantity
+
+    def _empty_result(self, sessions: int, bars: int) -> BacktestResult:
+        """Result with no trades."""
+        empty_f = np.zeros(0)
+        empty_i = np.zeros(0, dtype=np.int64)
+        return BacktestResult(
+            params=self.params, trade_date=np.zeros(0, dtype='datetime64[D]'),
+            entry_index=empty_i, exit_index=empty_i, direction=empty_i,
+            entry_price=empty_f, exit_price=empty_f, stop_price=empty_f,
+            target_price=empty_f, quantity=empty_i, pnl=empty_f,
+            exit_reason=empty_i, sessions=sessions, bars=bars
+        )
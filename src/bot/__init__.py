@@ -1,4 +1,7 @@
 """Trading bot modules."""
-from .trading_bot import TradingBot, TradingBotState
+from .trading_bot import TradingBot, TradingBotState, SymbolPipeline
+from .runtime import BotRuntime, BarQueue, replay_feed, store_feed
+from .supervisor import ShardSupervisor, partition_symbols
 
-__all__ = ['TradingBot', 'TradingBotState']
+__all__ = ['TradingBot', 'TradingBotState', 'SymbolPipeline', 'BotRuntime', 'BarQueue', 'replay_feed', 'store_feed',
+           'ShardSupervisor', 'partition_symbols']
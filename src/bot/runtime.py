@@ -0,0 +1,326 @@
+"""asyncio runtime feeding market data into the trading bot."""
+import asyncio
+import signal
+import time
+from collections import deque
+from datetime import date
+from typing import AsyncIterable, Iterable, List, Optional
+
+from .trading_bot import TradingBot
+from ..data.async_broker import AsyncBroker
+from ..data.bar_store import BarStore
+from ..data.market_data import Bar
+from ..data.session_calendar import SessionCalendar
+from ..utils.config import ConfigWatcher
+from ..utils.logger import Logger
+
+OVERFLOW_POLICIES = ('block', 'drop_oldest', 'coalesce')
+
+
+def coalesce_bars(older: Bar, newer: Bar) -> Bar:
+    """
+    Merge two bars into one.
+
+    A bar with the same timestamp is a revision and replaces the older one;
+    otherwise the result spans both bars (first open, last close).
+    """
+    if newer.ts == older.ts:
+        return newer
+    return Bar(older.ts, older.open, max(older.high, newer.high),
+               min(older.low, newer.low), newer.close, older.volume + newer.volume,
+               older.symbol, older.tz)
+
+
+class BarQueue:
+    """
+    Bounded FIFO of bars between feed consumers and the bot.
+
+    When the queue is full the overflow policy applies: ``'block'`` makes
+    put() wait for space (backpressure on the feed), ``'drop_oldest'``
+    discards the oldest queued bar and ``'coalesce'`` merges the new bar
+    into the newest queued bar of the same symbol (dropping the oldest bar
+    if there is none). With ``'coalesce'`` a bar that repeats the timestamp
+    of that bar always replaces it.
+    """
+
+    def __init__(self, maxsize: int = 1024, policy: str = 'block'):
+        if maxsize <= 0:
+            raise ValueError(f"Queue size must be positive: {maxsize}")
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self.coalesced = 0
+        self.high_water = 0
+
+        self._items: deque = deque()
+        self._closed = False
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def full(self) -> bool:
+        return len(self._items) >= self.maxsize
+
+    def close(self):
+        """Stop accepting bars; get() returns None once the queue is drained."""
+        self._closed = True
+        self._not_empty.set()
+        self._not_full.set()
+
+    def put_nowait(self, bar: Bar):
+        """
+        Queue a bar without waiting (usable from synchronous callbacks).
+
+        Raises:
+            asyncio.QueueFull: If the queue is full under the 'block' policy
+        """
+        if self._closed:
+            return
+        items = self._items
+
+        if self.policy == 'coalesce' and items:
+            last = self._last_index(bar.symbol)
+            if last is not None and (items[last].ts == bar.ts
+                                     or len(items) >= self.maxsize):
+                items[last] = coalesce_bars(items[last], bar)
+                self.coalesced += 1
+                return
+
+        if len(items) >= self.maxsize:
+            if self.policy == 'block':
+                raise asyncio.QueueFull
+            items.popleft()
+            self.dropped += 1
+
+        items.append(bar)
+        if len(items) > self.high_water:
+            self.high_water = len(items)
+        self._not_empty.set()
+
+    def _last_index(self, symbol: Optional[str]) -> Optional[int]:
+        """Position of the newest queued bar for a symbol."""
+        items = self._items
+        for i in range(len(items) - 1, -1, -1):
+            if items[i].symbol == symbol:
+                return i
+        return None
+
+    async def put(self, bar: Bar):
+        """Queue a bar, waiting for space under the 'block' policy."""
+        if self.policy == 'block':
+            while len(self._items) >= self.maxsize and not self._closed:
+                self._not_full.clear()
+                await self._not_full.wait()
+        self.put_nowait(bar)
+
+    async def get(self) -> Optional[Bar]:
+        """Take the oldest bar, waiting if empty. Returns None once closed and drained."""
+        items = self._items
+        while not items:
+            if self._closed:
+                return None
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
+        bar = items.popleft()
+        self._not_full.set()
+        return bar
+
+
+async def replay_feed(bars: Iterable[Bar], interval: float = 0.0) -> AsyncIterable[Bar]:
+    """
+    Serve bars as an async feed.
+
+    Args:
+        bars: Bars to serve (e.g. from iter_columns or iter_store)
+        interval: Seconds between bars (0 yields to the loop between bars
+            without pausing)
+    """
+    for bar in bars:
+        yield bar
+        await asyncio.sleep(interval)
+
+
+def store_feed(store: BarStore, symbol: str, timezone, start: Optional[date] = None,
+               end: Optional[date] = None, interval: float = 0.0,
+               calendar: Optional[SessionCalendar] = None) -> AsyncIterable[Bar]:
+    """Serve one symbol's stored bars (tagged with the symbol) as an async feed."""
+    from ..backtest.replay import iter_store
+    return replay_feed(iter_store(store, symbol, timezone, start, end, tag=True,
+                                  calendar=calendar), interval)
+
+
+class BotRuntime:
+    """
+    Event-driven runtime for a TradingBot.
+
+    Each feed (an async iterable of Bar objects) is consumed by its own
+    task and pushes bars into a BarQueue; a single consumer task hands
+    them to bot.on_bar as soon as they arrive. Bot start and stop, the
+    heartbeat's balance query and config file checks run in worker threads;
+    order placement, amendments and cancels are made by on_bar itself and
+    call the synchronous broker on the loop thread. SIGINT/SIGTERM cancel the tasks and stop the bot,
+    closing any open position. With a config path and reload interval, edits
+    of the config file are picked up and handed to the bot, which applies
+    them between bars.
+    """
+
+    def __init__(self, bot: TradingBot, feeds: Optional[List[AsyncIterable[Bar]]] = None,
+                 queue_size: int = 1024, overflow_policy: str = 'block',
+                 heartbeat_seconds: float = 0.0, config_path: Optional[str] = None,
+                 reload_seconds: float = 0.0):
+        """
+        Args:
+            bot: Trading bot to drive
+            feeds: Async bar feeds; with none the runtime idles until stopped
+            queue_size: Maximum bars waiting for the bot
+            overflow_policy: 'block', 'drop_oldest' or 'coalesce' (see BarQueue)
+            heartbeat_seconds: Interval of status log lines (0 disables)
+            config_path: Config file to watch for edits
+            reload_seconds: Interval between config file checks (0 disables)
+        """
+        self.bot = bot
+        self.feeds = list(feeds or [])
+        self.queue = BarQueue(queue_size, overflow_policy)
+        self.broker = AsyncBroker(bot.broker)
+        self.heartbeat_seconds = heartbeat_seconds
+        self.reload_seconds = reload_seconds
+        self.config_watcher = None
+        if config_path and reload_seconds > 0:
+            self.config_watcher = ConfigWatcher(config_path, bot.settings)
+        self.logger = Logger.get_logger()
+
+        self.bars_processed = 0
+        self.errors = 0
+        self._stop: Optional[asyncio.Event] = None
+
+    def request_stop(self):
+        """Ask the runtime to shut down (safe to call from signal handlers)."""
+        if self._stop is None:
+            return
+        if self._stop.is_set():
+            self.logger.warning("Shutdown already in progress")
+            return
+        self.logger.info("Shutdown requested")
+        self._stop.set()
+
+    def submit(self, bar: Bar):
+        """Queue a bar from synchronous code on the loop (e.g. a tick aggregator)."""
+        try:
+            self.queue.put_nowait(bar)
+        except asyncio.QueueFull:
+            self.queue.dropped += 1
+            self.logger.warning(f"Bar queue full, dropped bar at {bar.timestamp}")
+
+    def _install_signal_handlers(self, loop: asyncio.AbstractEventLoop) -> List[int]:
+        installed = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.request_stop)
+                installed.append(sig)
+            except (NotImplementedError, RuntimeError):
+                pass  # Not supported on this platform or outside the main thread
+        return installed
+
+    async def _pump(self, feed: AsyncIterable[Bar]):
+        """Move bars from one feed into the queue."""
+        put = self.queue.put
+        async for bar in feed:
+            await put(bar)
+
+    async def _consume(self):
+        """Hand queued bars to the bot as they arrive."""
+        get = self.queue.get
+        on_bar = self.bot.on_bar
+        while True:
+            bar = await get()
+            if bar is None:
+                return
+            try:
+                # TODO: route order placement through self.broker (AsyncBroker);
+                # a network broker currently blocks the loop for each round trip
+                on_bar(bar)
+            except Exception as e:
+                self.errors += 1
+                self.logger.error(f"Error processing bar at {bar.timestamp}: {e}", exc_info=True)
+            self.bars_processed += 1
+
+    async def _feeds_finished(self, producers: List[asyncio.Task]):
+        """Close the queue once every feed is exhausted."""
+        results = await asyncio.gather(*producers, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error(f"Feed failed: {result}")
+        self.queue.close()
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            balance = await self.broker.get_account_balance()
+            self.logger.info(
+                f"Heartbeat: state={self.bot.state}, bars={self.bars_processed}, "
+                f"queued={self.queue.qsize()}, dropped={self.queue.dropped}, "
+                f"coalesced={self.queue.coalesced}, balance=${balance:,.2f}"
+            )
+
+    async def _watch_config(self):
+        """Poll the config file and queue changed settings on the bot."""
+        while True:
+            await asyncio.sleep(self.reload_seconds)
+            settings = await asyncio.to_thread(self.config_watcher.poll)
+            if settings is not None:
+                self.logger.info(f"Config file changed: {self.config_watcher.config_path}")
+                self.bot.reload_config(settings)
+
+    async def run(self):
+        """
+        Run until every feed is exhausted and drained, or a stop is requested.
+        """
+        loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        signals = self._install_signal_handlers(loop)
+
+        await asyncio.to_thread(self.bot.start)
+        if not self.bot.is_running:
+            self.logger.error("Bot failed to start")
+            return
+
+        start = time.perf_counter()
+        consumer = asyncio.create_task(self._consume())
+        producers = [asyncio.create_task(self._pump(feed)) for feed in self.feeds]
+        tasks = [consumer] + producers
+        if producers:
+            tasks.append(asyncio.create_task(self._feeds_finished(producers)))
+        if self.heartbeat_seconds > 0:
+            tasks.append(asyncio.create_task(self._heartbeat()))
+        if self.config_watcher is not None:
+            tasks.append(asyncio.create_task(self._watch_config()))
+
+        stop_wait = asyncio.create_task(self._stop.wait())
+        try:
+            if producers:
+                await asyncio.wait([consumer, stop_wait], return_when=asyncio.FIRST_COMPLETED)
+            else:
+                await stop_wait
+        finally:
+            for task in tasks + [stop_wait]:
+                task.cancel()
+            await asyncio.gather(*tasks, stop_wait, return_exceptions=True)
+
+            for sig in signals:
+                loop.remove_signal_handler(sig)
+
+            await asyncio.to_thread(self.bot.stop)
+
+            elapsed = time.perf_counter() - start
+            self.logger.info(
+                f"Runtime stopped: {self.bars_processed} bars in {elapsed:.2f}s, "
+                f"{self.queue.dropped} dropped, {self.queue.coalesced} coalesced, "
+                f"{self.errors} errors"
+            )
@@ -0,0 +1,346 @@
+"""Run symbol shards of the trading bot in separate processes."""
+import copy
+import logging
+import multiprocessing
+import queue
+import time
+from multiprocessing.connection import Connection
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .trading_bot import TradingBot
+from ..data.market_data import Bar
+from ..data.paper_broker import trade_statistics
+from ..utils.config import Config
+from ..utils.logger import Logger
+
+# Bars cross the process boundary as plain tuples:
+# (symbol, epoch ns, open, high, low, close, volume)
+BarTuple = Tuple[str, int, float, float, float, float, int]
+
+
+def partition_symbols(symbols: List[str], shards: int) -> List[List[str]]:
+    """Split symbols round-robin into at most ``shards`` non-empty groups."""
+    shards = max(1, min(shards, len(symbols)))
+    return [symbols[k::shards] for k in range(shards)]
+
+
+def _shard_report(shard: int, bot: TradingBot, bars: int) -> Dict:
+    """Positions and P&L of one shard for central risk aggregation."""
+    broker = bot.broker
+    return {
+        'shard': shard,
+        'date': bot.current_date,
+        'bars': bars,
+        'daily_pnl': broker.get_daily_pnl(),
+        'initial_balance': broker.initial_balance,
+        'realized_pnl': broker.balance - broker.initial_balance,
+        'trades': broker.get_total_trades(),
+        'positions': {
+            p.symbol: {
+                'side': p.side.value,
+                'quantity': p.quantity,
+                'entry_price': p.entry_price,
+                'unrealized_pnl': p.unrealized_pnl,
+            }
+            for p in broker.get_all_positions()
+        },
+    }
+
+
+def _shard_main(shard: int, config: Config, symbols: List[str], initial_balance: float,
+                conn: Connection, reports: multiprocessing.Queue, log_level: str):
+    """
+    Worker process: run a TradingBot for a subset of symbols.
+
+    The worker's broker starts with ``initial_balance``, the shard's share
+    of the account, which position sizing is based on. Bars and commands
+    arrive on ``conn``; reports go to ``reports``, which never blocks the
+    worker (the supervisor drains it at its own pace).
+    """
+    Logger.set_process_name(f"shard-{shard}")  # One rotating log file per process
+    config = copy.deepcopy(config)
+    config.config['trading']['symbols'] = symbols
+    config.config['risk_management']['initial_balance'] = initial_balance
+
+    bot = TradingBot(config)
+    logger = Logger.get_logger()
+    logger.setLevel(getattr(logging, log_level.upper()))
+    bot.start()
+
+    timezone = bot.timezone
+    on_bar = bot.on_bar
+    bars = 0
+    last_state = None
+
+    while True:
+        message = conn.recv()
+        kind = message[0]
+
+        if kind == 'bars':
+            for symbol, ts, open_price, high, low, close, volume in message[1]:
+                on_bar(Bar(ts, open_price, high, low, close, volume, symbol, timezone))
+            bars += len(message[1])
+
+        elif kind == 'halt':
+            bot.risk_manager.halt(message[1])
+            bot.flatten(message[1])
+
+        elif kind == 'stop':
+            bot.stop()
+            report = _shard_report(shard, bot, bars)
+            report['trade_history'] = bot.broker.get_trade_history()
+            reports.put(('final', report))
+            Logger.shutdown()  # Worker processes exit without running atexit hooks
+            return
+
+        # Report only when positions or P&L changed
+        report = _shard_report(shard, bot, bars)
+        state = (report['date'], report['daily_pnl'], report['trades'], report['positions'])
+        if state != last_state:
+            last_state = state
+            reports.put(('report', report))
+
+
+class ShardSupervisor:
+    """
+    Partition symbols across worker processes and aggregate their risk.
+
+    Each worker runs its own TradingBot for its symbols, so per-symbol work
+    runs in parallel without the GIL. Bars are routed to the owning shard
+    with a dict lookup and sent in batches over a pipe as plain tuples.
+    Workers report positions and P&L back; the supervisor sums them into an
+    account-wide view and halts every shard (flattening open positions)
+    when the account's daily loss limit is reached. Reports arrive
+    asynchronously, so the global limit acts with a lag of a few bars.
+
+    The account's ``initial_balance`` is split across the shards in
+    proportion to their symbols, and each shard sizes positions against its
+    own share and P&L, so N shards together risk what one process trading
+    every symbol would. The daily loss limit is the only account-wide
+    limit; the trade limit, the one-position rule and ``max_position_size``
+    apply per symbol, as in a single process.
+    """
+
+    def __init__(self, config: Config, shards: Optional[int] = None,
+                 batch_size: int = 64, log_level: str = "WARNING"):
+        """
+        Args:
+            config: Bot configuration; ``config.symbols`` are partitioned
+            shards: Number of worker processes (defaults to one per symbol,
+                capped at the CPU count)
+            batch_size: Bars buffered per shard before sending (1 for
+                lowest latency in live trading)
+            log_level: Logger level inside the workers
+        """
+        symbols = config.symbols
+        if shards is None:
+            shards = min(len(symbols), multiprocessing.cpu_count())
+
+        self.config = config
+        self.assignments = partition_symbols(symbols, shards)
+        self.routes: Dict[str, int] = {
+            symbol: shard for shard, group in enumerate(self.assignments) for symbol in group
+        }
+        self.balances = [config.initial_balance * len(group) / len(symbols)
+                         for group in self.assignments]
+        self.primary = symbols[0]
+        self.batch_size = max(1, batch_size)
+        self.log_level = log_level
+        self.logger = Logger.get_logger()
+
+        self.is_running = False
+        self.halted = False
+        self.unrouted = 0
+        self.reports: Dict[int, Dict] = {}
+        self.finals: Dict[int, Dict] = {}
+
+        self._processes: List[multiprocessing.Process] = []
+        self._connections: List[Connection] = []
+        self._buffers: List[List[BarTuple]] = []
+        self._report_queue: Optional[multiprocessing.Queue] = None
+        self._halt_date = None
+
+    def start(self):
+        """Launch one worker process per shard."""
+        self._report_queue = multiprocessing.Queue()
+        for shard, symbols in enumerate(self.assignments):
+            recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(
+                target=_shard_main,
+                args=(shard, self.config, symbols, self.balances[shard], recv_conn,
+                      self._report_queue, self.log_level),
+                name=f"shard-{shard}",
+                daemon=True
+            )
+            process.start()
+            recv_conn.close()
+            self._processes.append(process)
+            self._connections.append(send_conn)
+            self._buffers.append([])
+
+        self.is_running = True
+        for shard, symbols in enumerate(self.assignments):
+            self.logger.info(f"Shard {shard}: {', '.join(symbols)} "
+                             f"(${self.balances[shard]:,.2f} of capital)")
+
+    def route(self, symbol: Optional[str], ts: int, open_price: float, high: float,
+              low: float, close: float, volume: int):
+        """Queue one bar (epoch ns timestamp) for the shard that owns its symbol."""
+        if symbol is None:
+            symbol = self.primary
+        shard = self.routes.get(symbol)
+        if shard is None:
+            self.unrouted += 1
+            return
+
+        buffer = self._buffers[shard]
+        buffer.append((symbol, ts, open_price, high, low, close, volume))
+        if len(buffer) >= self.batch_size:
+            self._send(shard)
+            self.poll()
+
+    def on_bar(self, bar: Bar):
+        """Route a Bar object."""
+        self.route(bar.symbol, bar.ts, bar.open, bar.high,
+                   bar.low, bar.close, bar.volume)
+
+    def flush(self):
+        """Send all buffered bars."""
+        for shard, buffer in enumerate(self._buffers):
+            if buffer:
+                self._send(shard)
+        self.poll()
+
+    def _send(self, shard: int):
+        self._connections[shard].send(('bars', self._buffers[shard]))
+        self._buffers[shard] = []
+
+    def poll(self):
+        """Apply the reports received so far and enforce account-wide limits."""
+        while True:
+            try:
+                kind, report = self._report_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'final':
+                self.finals[report['shard']] = report
+            self.reports[report['shard']] = report
+
+        if self.reports:
+            self._check_limits()
+
+    def _check_limits(self):
+        state = self.get_risk_state()
+        if self._halt_date is not None and state['date'] != self._halt_date:
+            self.halted = False  # Shards lift their halt at the daily reset
+            self._halt_date = None
+
+        if not self.halted and state['daily_pnl'] <= -self.config.max_daily_loss:
+            reason = f"Account daily loss limit reached: ${state['daily_pnl']:.2f}"
+            self.logger.warning(reason)
+            self.halted = True
+            self._halt_date = state['date']
+            for shard, conn in enumerate(self._connections):
+                if self._buffers[shard]:
+                    self._send(shard)  # Bars already routed come first
+                conn.send(('halt', reason))
+
+    def get_risk_state(self) -> Dict:
+        """
+        Account-wide positions and P&L aggregated from the latest shard reports.
+
+        Daily P&L only counts shards that have reached the latest session date.
+        """
+        reports = list(self.reports.values())
+        dates = [r['date'] for r in reports if r['date'] is not None]
+        latest = max(dates) if dates else None
+
+        positions = {}
+        for r in reports:
+            positions.update(r['positions'])
+
+        realized_pnl = sum(r['realized_pnl'] for r in reports)
+        return {
+            'date': latest,
+            'balance': sum(self.balances) + realized_pnl,
+            'daily_pnl': sum(r['daily_pnl'] for r in reports if r['date'] == latest),
+            'realized_pnl': realized_pnl,
+            'unrealized_pnl': sum(p['unrealized_pnl'] for p in positions.values()),
+            'positions': positions,
+            'bars': sum(r['bars'] for r in reports),
+            'halted': self.halted,
+        }
+
+    def stop(self, timeout: float = 30.0) -> Dict:
+        """
+        Flush, stop every shard and collect the final results.
+
+        Returns:
+            Combined trade history and statistics across all shards
+        """
+        if not self.is_running:
+            return {}
+
+        for shard, conn in enumerate(self._connections):
+            if self._buffers[shard]:
+                self._send(shard)
+            conn.send(('stop',))
+
+        deadline = time.monotonic() + timeout
+        while len(self.finals) < len(self._processes) and time.monotonic() < deadline:
+            try:
+                kind, report = self._report_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if kind == 'final':
+                self.finals[report['shard']] = report
+            self.reports[report['shard']] = report
+
+        for process in self._processes:
+            process.join(timeout=max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                self.logger.error(f"{process.name} did not stop, terminating")
+                process.terminate()
+        for conn in self._connections:
+            conn.close()
+        self.is_running = False
+
+        history = sorted(
+            (trade for report in self.finals.values() for trade in report['trade_history']),
+            key=lambda trade: trade['timestamp']
+        )
+        balance = sum(self.balances) + sum(r['realized_pnl'] for r in self.finals.values())
+
+        return {
+            'trade_history': history,
+            'statistics': trade_statistics(history, balance),
+            'shards': {shard: self.assignments[shard] for shard in range(len(self.assignments))},
+            'bars': sum(r['bars'] for r in self.finals.values()),
+            'unrouted': self.unrouted,
+        }
+
+    def run(self, bars: Iterable[BarTuple]) -> Dict:
+        """
+        Route a merged, time-ordered bar stream through the shards and stop.
+
+        Args:
+            bars: Tuples of (symbol, epoch ns, open, high, low, close, volume)
+
+        Returns:
+            Result of stop() plus elapsed seconds and bars/second
+        """
+        if not self.is_running:
+            self.start()
+
+        route = self.route
+        count = 0
+        start = time.perf_counter()
+        for bar in bars:
+            route(*bar)
+            count += 1
+        summary = self.stop()
+        elapsed = time.perf_counter() - start
+
+        summary['seconds'] = elapsed
+        summary['bars_per_second'] = count / elapsed if elapsed > 0 else 0.0
+        return summary
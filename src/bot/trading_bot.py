@@ -1,18 +1,26 @@
 """Main trading bot orchestrator."""
-from datetime import datetime, time, timedelta
-from typing import Optional
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
 import pytz
 import time as time_module
 
 from ..data.market_data import MarketDataHandler, Bar
+from ..data.rolling_stats import ATR
 from ..data.paper_broker import PaperBroker
+from ..data.instruments import InstrumentSpec, get_instrument
+from ..data.session_calendar import Session, SessionCalendar
 from ..strategy.opening_range import OpeningRange
 from ..strategy.breakout_detector import BreakoutDetector, BreakoutSignal
 from ..risk.order_manager import OrderManager
 from ..risk.risk_manager import RiskManager
-from ..utils.config import Config
+from ..risk.position_sizing import SessionSizingCache
+from ..risk.trailing_stop import TrailingStop
+from ..utils.config import Config, ConfigSnapshot, LIVE_SETTINGS
+from ..utils.latency import LatencyRecorder
 from ..utils.logger import Logger
+from ..utils.time_utils import from_epoch_ns
 from ..utils.news_filter import NewsFilter
+from ..utils.volatility_filter import VolatilityFilter
 
 
 class TradingBotState:
@@ -26,66 +34,212 @@ class TradingBotState:
     STOPPED = "stopped"
 
 
-class TradingBot:
-    """Main trading bot for ES futures opening range breakout strategy."""
-
-    def __init__(self, config: Config):
-        self.config = config
-        self.logger = Logger.get_logger(log_file=config.log_file, level=config.log_level)
+class SymbolPipeline:
+    """Market data, strategy components and state machine state for one instrument."""
 
-        # Initialize components
-        self.timezone = pytz.timezone(config.timezone)
-        self.market_data = MarketDataHandler(config.symbol, config.timezone)
-
-        # Use paper broker by default (can be extended to support real brokers)
-        self.broker = PaperBroker(initial_balance=100000.0, point_value=50.0)
+    def __init__(self, spec: InstrumentSpec, settings: ConfigSnapshot, broker: PaperBroker,
+                 calendar: SessionCalendar):
+        self.symbol = spec.symbol
+        self.spec = spec
+        self.market_data = MarketDataHandler(spec.symbol, settings.timezone)
 
         self.opening_range = OpeningRange(
             self.market_data,
-            or_minutes=config.opening_range_minutes,
-            timezone=config.timezone
+            or_minutes=settings.opening_range_minutes,
+            timezone=settings.timezone,
+            calendar=calendar
         )
 
         self.breakout_detector = BreakoutDetector(
             self.market_data,
             self.opening_range,
-            min_breakout_points=config.min_breakout_points,
-            volume_multiplier=config.volume_multiplier
+            min_breakout_points=settings.min_breakout_points,
+            volume_multiplier=settings.volume_multiplier
         )
 
+        trailing_stop = None
+        if settings.trailing_stop:
+            atr = None
+            if settings.trailing_method == 'atr':
+                period = settings.trailing_atr_period
+                atr = self.market_data.register_stat(f"atr_{period}", ATR(period))
+            trailing_stop = TrailingStop(
+                method=settings.trailing_method,
+                distance=settings.trailing_distance,
+                tick_size=spec.tick_size,
+                breakeven_r=settings.breakeven_r,
+                atr=atr
+            )
+
         self.order_manager = OrderManager(
-            self.broker,
+            broker,
             self.opening_range,
-            symbol=config.symbol,
-            point_value=50.0
+            symbol=spec.symbol,
+            point_value=spec.point_value,
+            trailing_stop=trailing_stop
         )
 
+        self.state = TradingBotState.INITIALIZING
+        self.current_date: Optional[date] = None
+        # Range of the current session so far, folded into the sizing cache when it ends
+        # (a session can outlast the market data buffer)
+        self.session_high = float('-inf')
+        self.session_low = float('inf')
+        self.session_close: Optional[float] = None
+        self.session: Optional[Session] = None  # Today's boundaries (None if closed)
+        self.day_start = 0  # Local midnight bounds of current_date (epoch ns)
+        self.day_end = 0
+
+
+class TradingBot:
+    """
+    Main trading bot for the futures opening range breakout strategy.
+
+    Every configured symbol gets its own SymbolPipeline (market data,
+    opening range, breakout detector, order manager and state machine
+    state); the broker, risk manager and news filter are shared. Bars are
+    routed to their pipeline by Bar.symbol, and bars without a symbol go
+    to the primary (first configured) symbol.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.settings = config.snapshot()  # Read on the bar path; swapped by reload_config
+        self._pending_settings: Optional[ConfigSnapshot] = None
+        settings = self.settings
+        self.logger = Logger.from_config(settings)
+
+        # Initialize components
+        self.timezone = pytz.timezone(settings.timezone)
+        Bar.set_default_timezone(settings.timezone)
+        self.instruments: List[InstrumentSpec] = [get_instrument(s) for s in settings.symbols]
+
+        # Use paper broker by default (can be extended to support real brokers)
+        self.broker = PaperBroker(initial_balance=settings.initial_balance,
+                                  path_model=settings.intrabar_path,
+                                  timezone=settings.timezone)
+
+        # Session boundaries per date (holidays, half days, DST) as epoch ns
+        self.session_calendar = SessionCalendar.from_config(settings)
+
+        self.pipelines: Dict[str, SymbolPipeline] = {
+            spec.symbol: SymbolPipeline(spec, settings, self.broker, self.session_calendar)
+            for spec in self.instruments
+        }
+        self.primary = self.pipelines[self.instruments[0].symbol]
+
+        # Sizing inputs are refreshed once per session, not per signal
+        self.sizing_cache = SessionSizingCache(
+            volatility_lookback=settings.volatility_lookback,
+            trade_lookback=settings.trade_lookback
+        )
         self.risk_manager = RiskManager(
             self.broker,
-            max_position_size=config.max_position_size,
-            max_daily_loss=config.max_daily_loss,
-            max_daily_trades=config.max_daily_trades,
-            point_value=50.0
+            max_position_size=settings.max_position_size,
+            max_daily_loss=settings.max_daily_loss,
+            max_daily_trades=settings.max_daily_trades,
+            sizing_method=settings.position_sizing_method,
+            sizing_cache=self.sizing_cache,
+            kelly_fraction=settings.kelly_fraction,
+            kelly_min_trades=settings.kelly_min_trades,
+            atr_multiple=settings.volatility_atr_multiple
         )
 
-        self.news_filter = NewsFilter(
-            enabled=config.avoid_news_days,
-            timezone=config.timezone
-        )
+        self.news_filter = NewsFilter.from_config(settings)
+        self.volatility_filter = VolatilityFilter.from_config(settings)
 
         # Bot state
-        self.state = TradingBotState.INITIALIZING
         self.is_running = False
-        self.current_date: Optional[datetime] = None
+        self.current_date: Optional[date] = None
+        self.trading_allowed = True
 
-        # Trading window times
-        self.trading_start_time = self._parse_time(config.trading_window_start)
-        self.trading_end_time = self._parse_time(config.trading_window_end)
+        # Per-stage timing of sampled bars; with tracking off no timing code runs
+        self.latency: Optional[LatencyRecorder] = None
+        if settings.latency_tracking:
+            self.latency = LatencyRecorder(settings.latency_sample_every)
+            self._instrument(self.latency)
+
+    def _instrument(self, latency: LatencyRecorder):
+        """
+        Time every stage of one bar in ``latency.sample_every``.
 
-    def _parse_time(self, time_str: str) -> time:
-        """Parse time string to time object."""
-        parts = time_str.split(':')
-        return time(hour=int(parts[0]), minute=int(parts[1]))
+        Timed wrappers of the components' methods are built once. A sampled
+        bar installs them on the instances for its duration; every other bar
+        runs the original methods and only pays a countdown, so tracking can
+        stay on in production. Whole-bar time is recorded per stage ('bar')
+        and per state the bar started in.
+        """
+        targets = [(self.broker, 'update_bar', 'broker_update'),
+                   (self.broker, 'submit_order', 'order_submit'),
+                   (self.broker, '_fill_order', 'fill'),
+                   (self.risk_manager, 'check_can_trade', 'risk_check'),
+                   (self, '_dispatch', 'dispatch')]
+        for pipeline in self.pipelines.values():
+            targets.append((pipeline.market_data, 'add_bar', 'market_data'))
+            targets.append((pipeline.breakout_detector, 'check_breakout', 'breakout_check'))
+
+        originals = []
+        timed = []
+        for owner, name, stage in targets:
+            method = getattr(owner, name)
+            setattr(owner, name, method)  # Instance attribute: swaps replace it in place
+            originals.append((owner, name, method))
+            timed.append((owner, name, latency.wrap(stage, method)))
+
+        on_bar = self.on_bar
+        record_bar = latency.stage('bar').record
+        state_histogram = latency.state
+        pipelines = self.pipelines
+        primary = self.primary
+        clock = time_module.perf_counter_ns
+        sample_every = latency.sample_every
+        countdown = 1  # Sample the first bar
+
+        def sampled_on_bar(bar: Bar):
+            nonlocal countdown
+            countdown -= 1
+            if countdown:
+                on_bar(bar)
+                return
+            countdown = sample_every
+
+            pipeline = primary if bar.symbol is None else pipelines.get(bar.symbol)
+            state = pipeline.state if pipeline is not None else None
+            for owner, name, method in timed:
+                setattr(owner, name, method)
+            start = clock()
+            try:
+                on_bar(bar)
+            finally:
+                elapsed = clock() - start
+                for owner, name, method in originals:
+                    setattr(owner, name, method)
+                record_bar(elapsed)
+                if state is not None:
+                    state_histogram(state).record(elapsed)
+
+        self.on_bar = sampled_on_bar
+
+    # Primary symbol components
+    @property
+    def market_data(self) -> MarketDataHandler:
+        return self.primary.market_data
+
+    @property
+    def opening_range(self) -> OpeningRange:
+        return self.primary.opening_range
+
+    @property
+    def breakout_detector(self) -> BreakoutDetector:
+        return self.primary.breakout_detector
+
+    @property
+    def order_manager(self) -> OrderManager:
+        return self.primary.order_manager
+
+    @property
+    def state(self) -> str:
+        return self.primary.state
 
     def start(self):
         """Start the trading bot."""
@@ -98,142 +252,288 @@ class TradingBot:
             return
 
         self.is_running = True
-        self.state = TradingBotState.WAITING_FOR_MARKET_OPEN
+        for pipeline in self.pipelines.values():
+            pipeline.state = TradingBotState.WAITING_FOR_MARKET_OPEN
 
         self.logger.info(f"Bot started - Strategy: Opening Range Breakout")
-        self.logger.info(f"Symbol: {self.config.symbol}")
-        self.logger.info(f"Opening Range: {self.config.opening_range_minutes} minutes")
-        self.logger.info(f"Trading Window: {self.config.trading_window_start} - {self.config.trading_window_end}")
-        self.logger.info(f"Risk/Reward Ratio: {self.config.risk_reward_ratio}")
-        self.logger.info(f"Max Position Size: {self.config.max_position_size} contracts")
-        self.logger.info(f"Max Daily Loss: ${self.config.max_daily_loss}")
+        self.logger.info(f"Symbol: {', '.join(self.pipelines)}")
+        self.logger.info(f"Opening Range: {self.settings.opening_range_minutes} minutes")
+        self.logger.info(f"Trading Window: {self.settings.trading_window_start} - {self.settings.trading_window_end}")
+        self.logger.info(f"Risk/Reward Ratio: {self.settings.risk_reward_ratio}")
+        self.logger.info(f"Max Position Size: {self.settings.max_position_size} contracts")
+        self.logger.info(f"Max Daily Loss: ${self.settings.max_daily_loss}")
         self.logger.info("=" * 80)
 
     def stop(self):
         """Stop the trading bot."""
         self.logger.info("Stopping trading bot...")
         self.is_running = False
-        self.state = TradingBotState.STOPPED
 
         # Close any open positions
-        if self.order_manager.has_open_position():
-            self.order_manager.close_position("bot_shutdown")
+        for pipeline in self.pipelines.values():
+            pipeline.state = TradingBotState.STOPPED
+            if pipeline.order_manager.has_open_position():
+                pipeline.order_manager.close_position("bot_shutdown")
 
         self.broker.disconnect()
+        if self.latency is not None:
+            self._report_latency()
         self.logger.info("Bot stopped")
 
+    def _report_latency(self):
+        """Log the latency histograms and write them to the configured file."""
+        self.logger.info("Latency per stage and state:\n" + self.latency.format_table())
+        if self.settings.latency_file:
+            try:
+                self.latency.dump(self.settings.latency_file)
+                self.logger.info(f"Latency histograms written to {self.settings.latency_file}")
+            except OSError as e:
+                self.logger.error(f"Failed to write latency histograms: {e}")
+
+    def flatten(self, reason: str):
+        """Close every open position and stop trading for the rest of the day."""
+        for pipeline in self.pipelines.values():
+            if pipeline.order_manager.has_open_position():
+                pipeline.order_manager.close_position(reason)
+            if pipeline.state != TradingBotState.STOPPED:
+                pipeline.state = TradingBotState.TRADING_WINDOW_CLOSED
+
+    def reload_config(self, settings: ConfigSnapshot):
+        """
+        Queue new settings, applied before the next bar is processed.
+
+        Safe to call from another thread: only a reference is stored, and
+        on_bar swaps it in between bars.
+        """
+        self._pending_settings = settings
+
+    def _apply_settings(self):
+        """Swap in the pending settings, keeping those that need a restart."""
+        settings, self._pending_settings = self._pending_settings, None
+        changes = self.settings.diff(settings)
+
+        frozen = sorted(name for name in changes if name not in LIVE_SETTINGS)
+        if frozen:
+            self.logger.warning(f"Config changes ignored until restart: {', '.join(frozen)}")
+            settings = settings.replace(**{name: getattr(self.settings, name) for name in frozen})
+
+        live = {name: change for name, change in changes.items() if name in LIVE_SETTINGS}
+        if not live:
+            return
+        self.settings = settings
+
+        for pipeline in self.pipelines.values():
+            detector = pipeline.breakout_detector
+            detector.min_breakout_points = settings.min_breakout_points
+            detector.volume_multiplier = settings.volume_multiplier
+            trailing_stop = pipeline.order_manager.trailing_stop
+            if trailing_stop is not None:
+                # Fixed and or_range trails keep their offset until the next position
+                trailing_stop.distance = settings.trailing_distance
+                trailing_stop.breakeven_r = settings.breakeven_r
+
+        risk = self.risk_manager
+        risk.max_position_size = settings.max_position_size
+        risk.max_daily_loss = settings.max_daily_loss
+        risk.max_daily_trades = settings.max_daily_trades
+        risk.sizing_method = settings.position_sizing_method
+        risk.kelly_fraction = settings.kelly_fraction
+        risk.kelly_min_trades = settings.kelly_min_trades
+        risk.atr_multiple = settings.volatility_atr_multiple
+
+        self.logger.info("Config reloaded: " + ', '.join(
+            f"{name} {old} -> {new}" for name, (old, new) in sorted(live.items())
+        ))
+
     def on_bar(self, bar: Bar):
         """
         Process a new price bar.
 
+        The bar's epoch-ns ``ts`` is the clock: the day rollover and every
+        session check compare it against the precomputed session bounds, so
+        datetimes are only built for logging.
+
         Args:
             bar: New price bar
         """
         if not self.is_running:
             return
 
-        # Add bar to market data
-        self.market_data.add_bar(
-            bar.timestamp, bar.open, bar.high, bar.low, bar.close, bar.volume
-        )
+        # A reloaded config takes effect between bars
+        if self._pending_settings is not None:
+            self._apply_settings()
 
-        # Update broker with current price
-        self.broker.update_market_price(self.config.symbol, bar.close)
+        # Route the bar to its instrument
+        if bar.symbol is None:
+            pipeline = self.primary
+        else:
+            pipeline = self.pipelines.get(bar.symbol)
+            if pipeline is None:
+                return
+
+        # Add bar to market data
+        ts = bar.ts
+        pipeline.market_data.add_bar(ts, bar.open, bar.high, bar.low, bar.close, bar.volume)
 
-        current_time = bar.timestamp
+        # Fill resting stops/targets inside the bar and mark to its close
+        self.broker.update_bar(pipeline.symbol, ts, bar.open, bar.high, bar.low, bar.close)
 
         # Check if we need to reset for a new day
-        if self.current_date != current_time.date():
-            self._handle_new_day(current_time)
+        if not pipeline.day_start <= ts < pipeline.day_end:
+            self._handle_new_day(pipeline, ts)
 
-        # State machine
-        if self.state == TradingBotState.WAITING_FOR_MARKET_OPEN:
-            self._handle_waiting_for_open(current_time)
+        if bar.high > pipeline.session_high:
+            pipeline.session_high = bar.high
+        if bar.low < pipeline.session_low:
+            pipeline.session_low = bar.low
+        pipeline.session_close = bar.close
 
-        elif self.state == TradingBotState.CALCULATING_OPENING_RANGE:
-            self._handle_calculating_or(current_time)
+        # Stream the bar into the opening range accumulator
+        pipeline.opening_range.update(bar)
 
-        elif self.state == TradingBotState.WAITING_FOR_BREAKOUT:
-            self._handle_waiting_for_breakout(current_time, bar)
+        self._dispatch(pipeline, ts, bar)
 
-        elif self.state == TradingBotState.IN_POSITION:
-            self._handle_in_position(current_time, bar)
+    def _dispatch(self, pipeline: SymbolPipeline, ts: int, bar: Bar):
+        """Run the state machine of one instrument on a bar."""
+        state = pipeline.state
+        if state == TradingBotState.WAITING_FOR_MARKET_OPEN:
+            self._handle_waiting_for_open(pipeline, ts)
 
-        elif self.state == TradingBotState.TRADING_WINDOW_CLOSED:
+        elif state == TradingBotState.CALCULATING_OPENING_RANGE:
+            self._handle_calculating_or(pipeline, ts)
+
+        elif state == TradingBotState.WAITING_FOR_BREAKOUT:
+            self._handle_waiting_for_breakout(pipeline, ts, bar)
+
+        elif state == TradingBotState.IN_POSITION:
+            self._handle_in_position(pipeline, ts, bar)
+
+        elif state == TradingBotState.TRADING_WINDOW_CLOSED:
             pass  # Wait for next day
 
-    def _handle_new_day(self, current_time: datetime):
-        """Handle new trading day."""
+    def _handle_new_day(self, pipeline: SymbolPipeline, ts: int):
+        """Handle the first bar of a new trading day for one instrument."""
+        if pipeline.current_date is not None:
+            self._fold_session(pipeline)
+
+        current_date = from_epoch_ns(ts, self.timezone).date()
+        if self.current_date != current_date:
+            self._start_trading_day(current_date, ts)
+
+        pipeline.current_date = current_date
+        pipeline.session_high = float('-inf')
+        pipeline.session_low = float('inf')
+        pipeline.session_close = None
+        pipeline.session = self.session_calendar.session(current_date)
+        pipeline.day_start, pipeline.day_end = self.session_calendar.day_bounds(current_date)
+
+        if not self.trading_allowed:
+            pipeline.state = TradingBotState.TRADING_WINDOW_CLOSED
+            return
+
+        # Reset components
+        pipeline.market_data.start_session()
+        pipeline.opening_range.reset()
+        pipeline.breakout_detector.reset()
+
+        pipeline.state = TradingBotState.WAITING_FOR_MARKET_OPEN
+
+    def _fold_session(self, pipeline: SymbolPipeline):
+        """Add the session that just ended to the sizing cache."""
+        if pipeline.session_close is None:
+            return
+        self.sizing_cache.add_session(pipeline.symbol, pipeline.current_date,
+                                      pipeline.session_high, pipeline.session_low,
+                                      pipeline.session_close)
+
+    def _start_trading_day(self, current_date: date, ts: int):
+        """Handle new trading day (account-wide, once per day) at its first bar."""
         self.logger.info("=" * 80)
-        self.logger.info(f"NEW TRADING DAY: {current_time.date()}")
+        self.logger.info(f"NEW TRADING DAY: {current_date}")
         self.logger.info("=" * 80)
 
-        self.current_date = current_time.date()
-
-        # Check news filter
-        allowed, reason = self.news_filter.is_trading_allowed(self.current_date)
-        self.news_filter.log_status(self.current_date)
+        self.current_date = current_date
 
+        # Check the exchange calendar, then the news filter
+        session = self.session_calendar.session(self.current_date)
+        if session is None:
+            allowed, reason = False, "Exchange closed (weekend or holiday)"
+        else:
+            allowed, reason = self.news_filter.is_trading_allowed(self.current_date)
+            self.news_filter.log_status(self.current_date)
+            if session.early_close:
+                self.logger.info("Early close today")
+
+        # Check volatility band as of the first bar of the day
+        if allowed:
+            allowed, reason = self.volatility_filter.is_trading_allowed(ts)
+            if self.volatility_filter.active:
+                self.logger.info(f"Volatility Filter: {reason}")
+
+        self.trading_allowed = allowed
         if not allowed:
             self.logger.warning(f"Trading suspended today: {reason}")
-            self.state = TradingBotState.TRADING_WINDOW_CLOSED
             return
 
-        # Reset components
-        self.opening_range.reset()
-        self.breakout_detector.reset()
         self.risk_manager.reset_daily_stats()
+        self.sizing_cache.sync_trades(self.broker.get_trade_history())
 
-        self.state = TradingBotState.WAITING_FOR_MARKET_OPEN
-
-    def _handle_waiting_for_open(self, current_time: datetime):
+    def _handle_waiting_for_open(self, pipeline: SymbolPipeline, ts: int):
         """Handle waiting for market open."""
-        if current_time.time() >= self.trading_start_time:
-            self.logger.info(f"Market open: {current_time.strftime('%Y-%m-%d %H:%M:%S')}")
-            self.state = TradingBotState.CALCULATING_OPENING_RANGE
+        if ts >= pipeline.session.window_start:
+            opened = from_epoch_ns(ts, self.timezone)
+            self.logger.info(
+                f"{pipeline.symbol} market open: {opened.strftime('%Y-%m-%d %H:%M:%S')}"
+            )
+            pipeline.state = TradingBotState.CALCULATING_OPENING_RANGE
 
-    def _handle_calculating_or(self, current_time: datetime):
+    def _handle_calculating_or(self, pipeline: SymbolPipeline, ts: int):
         """Handle calculating opening range."""
-        if self.opening_range.calculate(current_time):
+        opening_range = pipeline.opening_range
+        if opening_range.calculate(ts):
             self.logger.info(
-                f"Opening Range: High={self.opening_range.get_high():.2f}, "
-                f"Low={self.opening_range.get_low():.2f}, "
-                f"Range={self.opening_range.get_range():.2f} points"
+                f"{pipeline.symbol} Opening Range: High={opening_range.get_high():.2f}, "
+                f"Low={opening_range.get_low():.2f}, "
+                f"Range={opening_range.get_range():.2f} points"
             )
-            self.state = TradingBotState.WAITING_FOR_BREAKOUT
+            pipeline.state = TradingBotState.WAITING_FOR_BREAKOUT
 
-    def _handle_waiting_for_breakout(self, current_time: datetime, bar: Bar):
+    def _handle_waiting_for_breakout(self, pipeline: SymbolPipeline, ts: int, bar: Bar):
         """Handle waiting for breakout signal."""
         # Check if trading window is still open
-        if current_time.time() >= self.trading_end_time:
-            self.logger.info("Trading window closed, no breakout occurred")
-            self.state = TradingBotState.TRADING_WINDOW_CLOSED
+        if ts >= pipeline.session.window_end:
+            self.logger.info(f"{pipeline.symbol} trading window closed, no breakout occurred")
+            pipeline.state = TradingBotState.TRADING_WINDOW_CLOSED
             return
 
         # Check risk management
-        can_trade, reason = self.risk_manager.check_can_trade()
+        can_trade, reason = self.risk_manager.check_can_trade(pipeline.symbol)
         if not can_trade:
-            self.logger.warning(f"Cannot trade: {reason}")
-            self.state = TradingBotState.TRADING_WINDOW_CLOSED
+            self.logger.warning(f"{pipeline.symbol} cannot trade: {reason}")
+            pipeline.state = TradingBotState.TRADING_WINDOW_CLOSED
+            return
+
+        # No new entries inside a release's blackout window
+        if self.news_filter.in_blackout(ts):
             return
 
         # Check for breakout
-        signal = self.breakout_detector.check_breakout(
+        signal = pipeline.breakout_detector.check_breakout(
             bar,
-            require_volume_confirmation=self.config.volume_confirmation
+            require_volume_confirmation=self.settings.volume_confirmation
         )
 
         if signal:
-            self._handle_breakout_signal(signal)
+            self._handle_breakout_signal(pipeline, signal)
 
-    def _handle_breakout_signal(self, signal: BreakoutSignal):
+    def _handle_breakout_signal(self, pipeline: SymbolPipeline, signal: BreakoutSignal):
         """Handle breakout signal."""
         self.logger.info("=" * 80)
-        self.logger.info(f"BREAKOUT DETECTED: {signal}")
+        self.logger.info(f"{pipeline.symbol} BREAKOUT DETECTED: {signal}")
         self.logger.info("=" * 80)
 
         # Check risk management
-        can_trade, reason = self.risk_manager.check_can_trade()
+        can_trade, reason = self.risk_manager.check_can_trade(pipeline.symbol)
         if not can_trade:
             self.logger.warning(f"Breakout detected but cannot trade: {reason}")
             return
@@ -242,83 +542,118 @@ class TradingBot:
         account_balance = self.broker.get_account_balance()
 
         # Estimate risk (will be updated after order creation)
+        opening_range = pipeline.opening_range
         if signal.direction.value == "bullish":
-            risk_points = signal.price - self.opening_range.get_low()
+            risk_points = signal.price - opening_range.get_low()
         else:
-            risk_points = self.opening_range.get_high() - signal.price
+            risk_points = opening_range.get_high() - signal.price
 
         position_size = self.risk_manager.calculate_position_size(
-            account_balance, risk_points, risk_percent=0.02
+            account_balance, risk_points, risk_percent=0.02,
+            point_value=pipeline.spec.point_value,
+            symbol=pipeline.symbol,
+            session_date=pipeline.current_date
         )
 
         # Create orders
-        success = self.order_manager.create_breakout_orders(
+        success = pipeline.order_manager.create_breakout_orders(
             signal,
             quantity=position_size,
-            risk_reward_ratio=self.config.risk_reward_ratio
+            risk_reward_ratio=self.settings.risk_reward_ratio
         )
 
         if success:
             self.logger.info("Orders created successfully")
-            self.logger.info(self.order_manager.get_position_info())
-            self.state = TradingBotState.IN_POSITION
+            self.logger.info(pipeline.order_manager.get_position_info())
+            pipeline.state = TradingBotState.IN_POSITION
         else:
             self.logger.error("Failed to create orders")
 
-    def _handle_in_position(self, current_time: datetime, bar: Bar):
+    def _handle_in_position(self, pipeline: SymbolPipeline, ts: int, bar: Bar):
         """Handle active position management."""
         current_price = bar.close
+        order_manager = pipeline.order_manager
 
         # Check exit conditions
-        exit_reason = self.order_manager.check_exit_conditions(current_price)
+        exit_reason = order_manager.check_exit_conditions(current_price)
 
         if exit_reason:
             self.logger.info("=" * 80)
-            self.logger.info(f"EXIT SIGNAL: {exit_reason}")
+            self.logger.info(f"{pipeline.symbol} EXIT SIGNAL: {exit_reason}")
             self.logger.info("=" * 80)
 
-            self.order_manager.close_position(exit_reason)
+            order_manager.close_position(exit_reason)
 
             # Get final statistics
             stats = self.broker.get_statistics()
             self.logger.info(f"Trade Statistics: {stats}")
             self.logger.info(f"Daily P&L: ${self.broker.get_daily_pnl():.2f}")
 
-            self.state = TradingBotState.TRADING_WINDOW_CLOSED
+            pipeline.state = TradingBotState.TRADING_WINDOW_CLOSED
             return
 
         # Check if trading window closed
-        if current_time.time() >= self.trading_end_time:
-            self.logger.info("Trading window closed, closing position")
-            self.order_manager.close_position("time_limit")
+        if ts >= pipeline.session.window_end:
+            self.logger.info(f"{pipeline.symbol} trading window closed, closing position")
+            order_manager.close_position("time_limit")
 
             stats = self.broker.get_statistics()
             self.logger.info(f"Trade Statistics: {stats}")
 
-            self.state = TradingBotState.TRADING_WINDOW_CLOSED
+            pipeline.state = TradingBotState.TRADING_WINDOW_CLOSED
+            return
+
+        # Trail the stop behind this bar's range (takes effect from the next bar)
+        order_manager.update_trailing_stop(bar.high, bar.low)
+
+    def _get_symbol_status(self, pipeline: SymbolPipeline) -> dict:
+        """Get the state of one instrument's pipeline."""
+        opening_range = pipeline.opening_range
+        order_manager = pipeline.order_manager
+        status = {
+            'state': pipeline.state,
+            'opening_range_calculated': opening_range.is_calculated,
+            'has_position': order_manager.has_open_position(),
+        }
+
+        if opening_range.is_calculated:
+            status['opening_range'] = {
+                'high': opening_range.get_high(),
+                'low': opening_range.get_low(),
+                'range': opening_range.get_range()
+            }
+        else:
+            partial = opening_range.get_partial_range()
+            if partial:
+                status['opening_range_partial'] = {
+                    'high': partial[0],
+                    'low': partial[1],
+                    'volume': partial[2]
+                }
+
+        if order_manager.has_open_position():
+            status['position'] = order_manager.get_position_info()
+
+        return status
 
     def get_status(self) -> dict:
-        """Get current bot status."""
+        """Get current bot status (top-level fields describe the primary symbol)."""
         status = {
-            'state': self.state,
             'is_running': self.is_running,
             'current_date': self.current_date,
-            'opening_range_calculated': self.opening_range.is_calculated,
-            'has_position': self.order_manager.has_open_position(),
         }
+        status.update(self._get_symbol_status(self.primary))
 
-        if self.opening_range.is_calculated:
-            status['opening_range'] = {
-                'high': self.opening_range.get_high(),
-                'low': self.opening_range.get_low(),
-                'range': self.opening_range.get_range()
+        if len(self.pipelines) > 1:
+            status['symbols'] = {
+                symbol: self._get_symbol_status(pipeline)
+                for symbol, pipeline in self.pipelines.items()
             }
 
-        if self.order_manager.has_open_position():
-            status['position'] = self.order_manager.get_position_info()
-
         status['risk_status'] = self.risk_manager.get_risk_status()
         status['account_balance'] = self.broker.get_account_balance()
         status['daily_pnl'] = self.broker.get_daily_pnl()
+        if self.latency is not None:
+            status['latency'] = self.latency.summary()
 
         return status
@@ -1,11 +1,26 @@
 """Data handling modules."""
 from .market_data import MarketDataHandler, Bar
+from .bar_buffer import BarBuffer
+from .bar_store import BarStore, BAR_DTYPE
+from .tick_aggregator import (
+    BarAggregator, TimeBarAggregator, TickBarAggregator, VolumeBarAggregator
+)
+from .rolling_stats import (
+    RollingStats, RollingStat, RollingSum, RollingMean, RollingMax,
+    RollingMin, EWMA, ATR, VWAP
+)
+from .async_broker import AsyncBroker
+from .instruments import InstrumentSpec, INSTRUMENTS, get_instrument
 from .broker_interface import (
-    BrokerInterface, Order, Position, OrderSide,
+    BrokerInterface, Order, BracketOrder, Position, OrderSide,
     OrderType, OrderStatus
 )
 
 __all__ = [
-    'MarketDataHandler', 'Bar', 'BrokerInterface', 'Order',
-    'Position', 'OrderSide', 'OrderType', 'OrderStatus'
+    'MarketDataHandler', 'Bar', 'BarBuffer', 'BarStore', 'BAR_DTYPE', 'BrokerInterface', 'Order',
+    'BracketOrder', 'AsyncBroker', 'InstrumentSpec', 'INSTRUMENTS', 'get_instrument',
+    'Position', 'OrderSide', 'OrderType', 'OrderStatus',
+    'RollingStats', 'RollingStat', 'RollingSum', 'RollingMean', 'RollingMax',
+    'RollingMin', 'EWMA', 'ATR', 'VWAP',
+    'BarAggregator', 'TimeBarAggregator', 'TickBarAggregator', 'VolumeBarAggregator'
 ]
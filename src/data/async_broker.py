@@ -0,0 +1,60 @@
+"""Awaitable adapter for synchronous broker implementations."""
+import asyncio
+from typing import List, Optional
+
+from .broker_interface import BracketOrder, BrokerInterface, Order, OrderStatus, Position
+
+
+class AsyncBroker:
+    """
+    Run BrokerInterface calls in worker threads so they can be awaited.
+
+    Broker APIs block on network round trips; awaiting them through this
+    adapter keeps the event loop free to process market data meanwhile.
+    """
+
+    def __init__(self, broker: BrokerInterface):
+        self.broker = broker
+
+    async def connect(self) -> bool:
+        return await asyncio.to_thread(self.broker.connect)
+
+    async def disconnect(self):
+        await asyncio.to_thread(self.broker.disconnect)
+
+    async def submit_order(self, order: Order) -> bool:
+        return await asyncio.to_thread(self.broker.submit_order, order)
+
+    async def submit_bracket(self, bracket: BracketOrder) -> bool:
+        return await asyncio.to_thread(self.broker.submit_bracket, bracket)
+
+    async def submit_oco(self, orders: List[Order]) -> bool:
+        return await asyncio.to_thread(self.broker.submit_oco, orders)
+
+    async def modify_order(self, order_id: str, price: Optional[float] = None,
+                           stop_price: Optional[float] = None) -> bool:
+        return await asyncio.to_thread(self.broker.modify_order, order_id, price, stop_price)
+
+    async def cancel_order(self, order_id: str) -> bool:
+        return await asyncio.to_thread(self.broker.cancel_order, order_id)
+
+    async def get_order_status(self, order_id: str) -> OrderStatus:
+        return await asyncio.to_thread(self.broker.get_order_status, order_id)
+
+    async def get_position(self, symbol: str) -> Optional[Position]:
+        return await asyncio.to_thread(self.broker.get_position, symbol)
+
+    async def get_all_positions(self) -> List[Position]:
+        return await asyncio.to_thread(self.broker.get_all_positions)
+
+    async def has_positions(self) -> bool:
+        return await asyncio.to_thread(self.broker.has_positions)
+
+    async def get_account_balance(self) -> float:
+        return await asyncio.to_thread(self.broker.get_account_balance)
+
+    async def subscribe_market_data(self, symbol: str):
+        await asyncio.to_thread(self.broker.subscribe_market_data, symbol)
+
+    async def unsubscribe_market_data(self, symbol: str):
+        await asyncio.to_thread(self.broker.unsubscribe_market_data, symbol)
@@ -0,0 +1,317 @@
+"""Columnar ring buffer for OHLCV bars."""
+from typing import Tuple
+import numpy as np
+
+
+class _MinMaxTree:
+    """
+    Segment tree over the physical slots of a ring buffer.
+
+    Kept in plain lists because the hot operations are scalar point
+    updates, where list indexing is several times cheaper than NumPy.
+    """
+
+    def __init__(self, capacity: int):
+        size = 1
+        while size < capacity:
+            size *= 2
+        self.size = size
+        self.max = [float('-inf')] * (2 * size)
+        self.min = [float('inf')] * (2 * size)
+
+    def update(self, slot: int, high: float, low: float):
+        """Set the high/low of a slot. O(log n)."""
+        tmax = self.max
+        tmin = self.min
+        p = slot + self.size
+        tmax[p] = high
+        tmin[p] = low
+        p >>= 1
+        while p:
+            left = 2 * p
+            a, b = tmax[left], tmax[left + 1]
+            tmax[p] = a if a > b else b
+            a, b = tmin[left], tmin[left + 1]
+            tmin[p] = a if a < b else b
+            p >>= 1
+
+    def query(self, lo: int, hi: int) -> Tuple[float, float]:
+        """Max high and min low over slots [lo, hi). O(log n)."""
+        tmax = self.max
+        tmin = self.min
+        high = float('-inf')
+        low = float('inf')
+        lo += self.size
+        hi += self.size
+        while lo < hi:
+            if lo & 1:
+                if tmax[lo] > high:
+                    high = tmax[lo]
+                if tmin[lo] < low:
+                    low = tmin[lo]
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                if tmax[hi] > high:
+                    high = tmax[hi]
+                if tmin[hi] < low:
+                    low = tmin[hi]
+            lo >>= 1
+            hi >>= 1
+        return high, low
+
+    def build(self, highs: np.ndarray, lows: np.ndarray):
+        """Rebuild the whole tree from slot values in O(n)."""
+        tmax = np.full(2 * self.size, -np.inf)
+        tmin = np.full(2 * self.size, np.inf)
+        tmax[self.size:self.size + len(highs)] = highs
+        tmin[self.size:self.size + len(lows)] = lows
+
+        width = self.size
+        while width > 1:
+            half = width // 2
+            tmax[half:width] = np.maximum(tmax[width:2 * width:2], tmax[width + 1:2 * width:2])
+            tmin[half:width] = np.minimum(tmin[width:2 * width:2], tmin[width + 1:2 * width:2])
+            width = half
+
+        self.max = tmax.tolist()
+        self.min = tmin.tolist()
+
+    def clear(self):
+        """Reset every slot to the empty value."""
+        n = len(self.max)
+        self.max[:] = [float('-inf')] * n
+        self.min[:] = [float('inf')] * n
+
+
+class BarBuffer:
+    """
+    Fixed-capacity columnar storage for bars.
+
+    Each column is a preallocated NumPy array of twice the capacity. Every
+    bar is written to slot ``i`` and its mirror ``i + capacity``, so the
+    retained bars are always one contiguous slice and any window of them can
+    be returned as a zero-copy view. Appends are O(1) and never allocate.
+
+    Range queries are indexed: timestamps are located by binary search, a
+    segment tree answers window high/low in O(log n) and a cumulative volume
+    column answers window volume in O(1).
+
+    ``is_monotonic`` is False while any retained bar is older than the bar
+    before it. Such descents are counted per slot, so the flag recovers once
+    every out-of-order bar has been evicted.
+    """
+
+    COLUMNS = ('ts', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, capacity: int = 1000):
+        if capacity <= 0:
+            raise ValueError(f"Capacity must be positive: {capacity}")
+
+        self.capacity = capacity
+        size = 2 * capacity
+
+        self.ts = np.zeros(size, dtype=np.int64)  # epoch nanoseconds
+        self.open = np.zeros(size, dtype=np.float64)
+        self.high = np.zeros(size, dtype=np.float64)
+        self.low = np.zeros(size, dtype=np.float64)
+        self.close = np.zeros(size, dtype=np.float64)
+        self.volume = np.zeros(size, dtype=np.int64)
+        self.cum_volume = np.zeros(size, dtype=np.int64)  # Running total incl. this bar
+
+        self._tree = _MinMaxTree(capacity)
+        self._total_volume = 0
+        self._last_ts = None
+        self._descent = [False] * capacity  # Slot's bar is older than its predecessor
+        self._descents = 0  # Descents among the retained bars
+        self.is_monotonic = True  # False while a retained bar is out of time order
+
+        self._head = 0  # Next slot to write, in [0, capacity)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, ts: int, open_price: float, high: float, low: float,
+               close: float, volume: int):
+        """Append one bar, evicting the oldest when full."""
+        i = self._head
+        j = i + self.capacity
+
+        self.ts[i] = self.ts[j] = ts
+        self.open[i] = self.open[j] = open_price
+        self.high[i] = self.high[j] = high
+        self.low[i] = self.low[j] = low
+        self.close[i] = self.close[j] = close
+        self.volume[i] = self.volume[j] = volume
+
+        self._total_volume += volume
+        self.cum_volume[i] = self.cum_volume[j] = self._total_volume
+        self._tree.update(i, high, low)
+
+        descent = self._descent
+        if self._count == self.capacity:
+            # The evicted bar was the predecessor of the next slot's bar
+            successor = i + 1 if i + 1 < self.capacity else 0
+            if descent[successor]:
+                descent[successor] = False
+                self._descents -= 1
+        if descent[i]:
+            descent[i] = False
+            self._descents -= 1
+        if self._last_ts is not None and ts < self._last_ts and self.capacity > 1:
+            descent[i] = True
+            self._descents += 1
+        self.is_monotonic = not self._descents
+        self._last_ts = ts
+
+        self._head = i + 1 if i + 1 < self.capacity else 0
+        if self._count < self.capacity:
+            self._count += 1
+
+    def extend(self, ts: np.ndarray, open_: np.ndarray, high: np.ndarray,
+               low: np.ndarray, close: np.ndarray, volume: np.ndarray):
+        """
+        Append many bars at once (vectorized).
+
+        Only the last ``capacity`` bars can be retained, so earlier ones are
+        skipped without being written.
+        """
+        k = len(ts)
+        if k == 0:
+            return
+        if k > self.capacity:
+            skip = k - self.capacity
+            ts, open_, high, low = ts[skip:], open_[skip:], high[skip:], low[skip:]
+            close, volume = close[skip:], volume[skip:]
+            k = self.capacity
+
+        ts = np.asarray(ts, dtype=np.int64)
+        self._last_ts = int(ts[-1])
+
+        slots = (self._head + np.arange(k)) % self.capacity
+        mirror = slots + self.capacity
+        for name, values in (('ts', ts), ('open', open_), ('high', high), ('low', low),
+                             ('close', close), ('volume', volume)):
+            column = getattr(self, name)
+            column[slots] = values
+            column[mirror] = values
+
+        cum = self._total_volume + np.cumsum(np.asarray(volume, dtype=np.int64))
+        self.cum_volume[slots] = cum
+        self.cum_volume[mirror] = cum
+        self._total_volume = int(cum[-1])
+
+        self._head = int((self._head + k) % self.capacity)
+        self._count = min(self._count + k, self.capacity)
+
+        # Slots beyond count have never been written (the ring has not wrapped)
+        valid = self.capacity if self._count == self.capacity else self._count
+        self._tree.build(self.high[:valid], self.low[:valid])
+        self._count_descents()
+
+    def _count_descents(self):
+        """Recompute the descent flags of every retained bar. O(n)."""
+        base = self._base()
+        descents = np.zeros(self.capacity, dtype=bool)
+        later = np.flatnonzero(np.diff(self.ts[base:base + self._count]) < 0) + 1
+        descents[(base + later) % self.capacity] = True
+        self._descent = descents.tolist()
+        self._descents = len(later)
+        self.is_monotonic = not self._descents
+
+    def _base(self) -> int:
+        """Physical index of the oldest retained bar."""
+        return self._head + self.capacity - self._count
+
+    def view(self, column: str, start: int = 0, stop: int = None) -> np.ndarray:
+        """
+        Get a zero-copy view of a column.
+
+        Args:
+            column: One of COLUMNS
+            start: First logical index (0 = oldest retained bar)
+            stop: End logical index (exclusive), defaults to all bars
+
+        Returns:
+            Read-only view into the buffer
+        """
+        if stop is None or stop > self._count:
+            stop = self._count
+        base = self._base()
+        view = getattr(self, column)[base + start:base + stop]
+        view.flags.writeable = False
+        return view
+
+    def tail(self, column: str, n: int) -> np.ndarray:
+        """Get a zero-copy view of the last ``n`` values of a column."""
+        n = min(n, self._count)
+        return self.view(column, self._count - n, self._count)
+
+    def row(self, index: int) -> Tuple[int, float, float, float, float, int]:
+        """Get a single bar as a tuple of Python scalars (negative index allowed)."""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(f"Bar index out of range: {index}")
+
+        k = self._base() + index
+        return (int(self.ts[k]), float(self.open[k]), float(self.high[k]),
+                float(self.low[k]), float(self.close[k]), int(self.volume[k]))
+
+    def search(self, ts: int, side: str = 'left') -> int:
+        """
+        Binary-search a timestamp among the retained bars.
+
+        Args:
+            ts: Epoch nanoseconds
+            side: 'left' for the first bar >= ts, 'right' for the first bar > ts
+
+        Returns:
+            Logical insertion index
+        """
+        return int(np.searchsorted(self.view('ts'), ts, side=side))
+
+    def _slots(self, start: int, stop: int):
+        """Split logical [start, stop) into physical slot ranges [lo, hi)."""
+        first = (self._head - self._count + start) % self.capacity
+        last = first + (stop - start)
+        if last <= self.capacity:
+            return ((first, last),)
+        return ((first, self.capacity), (0, last - self.capacity))
+
+    def range_high_low(self, start: int, stop: int) -> Tuple[float, float]:
+        """Highest high and lowest low over logical [start, stop), or (-inf, inf) if empty."""
+        high = float('-inf')
+        low = float('inf')
+        if start >= stop:
+            return high, low
+
+        for lo, hi in self._slots(start, stop):
+            h, l = self._tree.query(lo, hi)
+            if h > high:
+                high = h
+            if l < low:
+                low = l
+        return high, low
+
+    def range_volume(self, start: int, stop: int) -> int:
+        """Total volume over logical [start, stop). O(1)."""
+        if start >= stop:
+            return 0
+
+        base = self._base()
+        first = base + start
+        last = base + stop - 1
+        return int(self.cum_volume[last] - self.cum_volume[first] + self.volume[first])
+
+    def clear(self):
+        """Drop all bars (arrays are kept for reuse)."""
+        self._head = 0
+        self._count = 0
+        self._tree.clear()
+        self._total_volume = 0
+        self._last_ts = None
+        self._descent[:] = [False] * self.capacity
+        self._descents = 0
+        self.is_monotonic = True
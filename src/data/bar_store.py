@@ -0,0 +1,253 @@
+"""Memory-mapped on-disk store of historical bars."""
+import os
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import numpy as np
+import pandas as pd
+
+from ..utils.logger import Logger
+
+# Fixed-width bar record (48 bytes), timestamps in epoch nanoseconds (UTC)
+BAR_DTYPE = np.dtype([
+    ('ts', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<i8'),
+])
+
+# One record per trading session: local date, byte offset and bar count
+INDEX_DTYPE = np.dtype([
+    ('date', '<M8[D]'),
+    ('offset', '<i8'),
+    ('count', '<i8'),
+])
+
+
+class BarStore:
+    """
+    Historical bars stored as fixed-width binary records.
+
+    Each symbol has a data file (``<SYMBOL>.bars``) of time-ordered
+    BAR_DTYPE records and an index file (``<SYMBOL>.idx``) mapping every
+    session date to the byte offset of its first bar. Reads go through
+    numpy.memmap, so loading a day or a date range returns a view of the
+    file without parsing or copying it. Any bar stream can be stored,
+    including bars aggregated from ticks.
+
+    The index is the commit point of a write: records are appended to the
+    data file first and the index is then replaced atomically, so records
+    left past the indexed end by an interrupted write are never read and
+    are dropped by the next write.
+    """
+
+    def __init__(self, root: Union[str, Path], timezone: str = "America/New_York"):
+        self.root = Path(root)
+        self.timezone = timezone
+        self.logger = Logger.get_logger()
+        self._cache: Dict[str, tuple] = {}  # symbol -> (memmap, index)
+
+    def _data_path(self, symbol: str) -> Path:
+        return self.root / f"{symbol.upper()}.bars"
+
+    def _index_path(self, symbol: str) -> Path:
+        return self.root / f"{symbol.upper()}.idx"
+
+    def _open(self, symbol: str) -> tuple:
+        """Memory-map a symbol's data file and load its index."""
+        if symbol not in self._cache:
+            data_path = self._data_path(symbol)
+            index_path = self._index_path(symbol)
+            if not data_path.exists() or not index_path.exists():
+                raise FileNotFoundError(f"No stored bars for {symbol} in {self.root}")
+
+            index = np.fromfile(index_path, dtype=INDEX_DTYPE)
+            indexed = self._indexed_records(index)
+            stored = data_path.stat().st_size // BAR_DTYPE.itemsize
+            if stored < indexed:
+                raise ValueError(
+                    f"{data_path} holds {stored} bars but its index expects {indexed}"
+                )
+            if indexed:
+                data = np.memmap(data_path, dtype=BAR_DTYPE, mode='r', shape=(indexed,))
+            else:
+                data = np.zeros(0, dtype=BAR_DTYPE)
+            self._cache[symbol] = (data, index)
+
+        return self._cache[symbol]
+
+    @staticmethod
+    def _indexed_records(index: np.ndarray) -> int:
+        """Number of data records an index covers."""
+        if not len(index):
+            return 0
+        return int(index['offset'][-1] // BAR_DTYPE.itemsize + index['count'][-1])
+
+    def has_symbol(self, symbol: str) -> bool:
+        """Check whether bars are stored for a symbol."""
+        return self._data_path(symbol).exists() and self._index_path(symbol).exists()
+
+    def sessions(self, symbol: str) -> np.ndarray:
+        """Get the stored session dates (datetime64[D])."""
+        return self._open(symbol)[1]['date']
+
+    def load_day(self, symbol: str, session_date: date) -> np.ndarray:
+        """
+        Load one session's bars.
+
+        Returns:
+            Zero-copy structured view (BAR_DTYPE) of the session, empty if not stored
+        """
+        return self.load_range(symbol, session_date, session_date)
+
+    def load_range(self, symbol: str, start: Optional[date] = None,
+                   end: Optional[date] = None) -> np.ndarray:
+        """
+        Load all bars for sessions in [start, end].
+
+        Returns:
+            Zero-copy structured view (BAR_DTYPE) of the contiguous record range
+        """
+        data, index = self._open(symbol)
+        dates = index['date']
+
+        first = 0 if start is None else int(np.searchsorted(dates, np.datetime64(start, 'D'), 'left'))
+        last = len(dates) if end is None else int(np.searchsorted(dates, np.datetime64(end, 'D'), 'right'))
+        if first >= last:
+            return data[0:0]
+
+        begin = index['offset'][first] // BAR_DTYPE.itemsize
+        stop = (index['offset'][last - 1] // BAR_DTYPE.itemsize) + index['count'][last - 1]
+        return data[begin:stop]
+
+    @staticmethod
+    def columns(records: np.ndarray) -> Dict[str, np.ndarray]:
+        """Split structured records into per-field (zero-copy, strided) column views."""
+        return {name: records[name] for name in BAR_DTYPE.names}
+
+    def write(self, symbol: str, bars: Dict[str, np.ndarray]):
+        """
+        Append bars to a symbol's store.
+
+        Args:
+            symbol: Instrument symbol
+            bars: Dictionary of bar columns (ts, open, high, low, close, volume),
+                time-ordered and later than anything already stored
+        """
+        ts = np.asarray(bars['ts'], dtype=np.int64)
+        if not len(ts):
+            return
+        if np.any(np.diff(ts) < 0):
+            raise ValueError("Bars must be in time order")
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        data_path = self._data_path(symbol)
+        index_path = self._index_path(symbol)
+
+        index = np.fromfile(index_path, dtype=INDEX_DTYPE) if index_path.exists() else \
+            np.zeros(0, dtype=INDEX_DTYPE)
+        existing = self._indexed_records(index)
+        size = data_path.stat().st_size if data_path.exists() else 0
+        if size < existing * BAR_DTYPE.itemsize:
+            raise ValueError(f"{data_path} is shorter than its index ({existing} bars)")
+        if size > existing * BAR_DTYPE.itemsize:
+            # Left over from an interrupted write: never indexed, so never read
+            self.logger.warning(f"Dropping {size - existing * BAR_DTYPE.itemsize} "
+                                f"unindexed bytes from {data_path}")
+            self._cache.pop(symbol, None)
+            os.truncate(data_path, existing * BAR_DTYPE.itemsize)
+
+        if existing:
+            last_ts = np.memmap(data_path, dtype=BAR_DTYPE, mode='r', shape=(existing,))[-1]['ts']
+            if ts[0] < last_ts:
+                raise ValueError(f"Bars for {symbol} overlap the stored history")
+
+        records = np.empty(len(ts), dtype=BAR_DTYPE)
+        records['ts'] = ts
+        for name in ('open', 'high', 'low', 'close', 'volume'):
+            records[name] = bars[name]
+
+        # Session index for the new records
+        session_dates = (pd.DatetimeIndex(ts, tz='UTC').tz_convert(self.timezone)
+                         .tz_localize(None).values.astype('datetime64[D]'))
+        new_session = np.empty(len(ts), dtype=bool)
+        new_session[0] = True
+        np.not_equal(session_dates[1:], session_dates[:-1], out=new_session[1:])
+        starts = np.flatnonzero(new_session)
+
+        added = np.zeros(len(starts), dtype=INDEX_DTYPE)
+        added['date'] = session_dates[starts]
+        added['offset'] = (existing + starts) * BAR_DTYPE.itemsize
+        added['count'] = np.diff(np.append(starts, len(ts)))
+
+        if len(index) and index['date'][-1] == added['date'][0]:
+            # Continue the last stored session
+            index['count'][-1] += added['count'][0]
+            added = added[1:]
+
+        with open(data_path, 'ab') as f:
+            records.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+
+        temp_path = index_path.with_suffix('.idx.tmp')
+        with open(temp_path, 'wb') as f:
+            np.concatenate((index, added)).tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, index_path)
+
+        self._cache.pop(symbol, None)
+
+    def import_csv(self, symbol: str, path: Union[str, Path],
+                   timestamp_column: str = 'timestamp', chunksize: int = 1_000_000) -> int:
+        """
+        Import bars from a CSV file with timestamp, open, high, low, close, volume columns.
+
+        Naive timestamps are interpreted in the store's timezone and must be
+        in time order. A wall time repeated when DST ends is daylight time on
+        its first pass and standard time once the clock has gone back; a wall
+        time skipped when DST starts is an error.
+
+        Returns:
+            Number of bars imported
+        """
+        total = 0
+        latest = None  # Latest naive timestamp seen (across chunks)
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            chunk.columns = [c.strip().lower() for c in chunk.columns]
+            stamps = pd.to_datetime(chunk[timestamp_column.lower()])
+            if stamps.dt.tz is None:
+                # A time at or before one already seen is the second pass of a fall-back
+                local = stamps.to_numpy(dtype='datetime64[ns]')
+                seen = np.maximum.accumulate(local)
+                if latest is not None:
+                    seen = np.maximum(seen, latest)
+                previous = np.concatenate(
+                    ([np.datetime64('NaT', 'ns') if latest is None else latest], seen[:-1])
+                )
+                repeated = local <= previous
+                latest = seen[-1]
+                stamps = stamps.dt.tz_localize(self.timezone, ambiguous=~repeated,
+                                               nonexistent='raise')
+            ts = stamps.dt.tz_convert('UTC').dt.as_unit('ns').astype('int64').to_numpy()
+
+            order = np.argsort(ts, kind='stable')
+            self.write(symbol, {
+                'ts': ts[order],
+                'open': chunk['open'].to_numpy(dtype=np.float64)[order],
+                'high': chunk['high'].to_numpy(dtype=np.float64)[order],
+                'low': chunk['low'].to_numpy(dtype=np.float64)[order],
+                'close': chunk['close'].to_numpy(dtype=np.float64)[order],
+                'volume': chunk['volume'].to_numpy(dtype=np.int64)[order],
+            })
+            total += len(ts)
+
+        self.logger.info(f"Imported {total} bars for {symbol} from {path}")
+        return total
+
+    def list_symbols(self) -> List[str]:
+        """Get the symbols with stored bars."""
+        return sorted(p.stem for p in self.root.glob('*.bars'))
@@ -32,9 +32,13 @@ class OrderStatus(Enum):
 class Order:
     """Represents a trading order."""
 
+    __slots__ = ('order_id', 'symbol', 'side', 'quantity', 'order_type', 'price',
+                 'stop_price', 'reduce_only', 'status', 'filled_quantity', 'filled_price',
+                 'filled_time', 'timestamp')
+
     def __init__(self, symbol: str, side: OrderSide, quantity: int,
                  order_type: OrderType, price: Optional[float] = None,
-                 stop_price: Optional[float] = None):
+                 stop_price: Optional[float] = None, reduce_only: bool = False):
         self.order_id: Optional[str] = None
         self.symbol = symbol
         self.side = side
@@ -42,9 +46,11 @@ class Order:
         self.order_type = order_type
         self.price = price
         self.stop_price = stop_price
+        self.reduce_only = reduce_only  # May only reduce an existing position
         self.status = OrderStatus.PENDING
         self.filled_quantity = 0
         self.filled_price: Optional[float] = None
+        self.filled_time: Optional[datetime] = None
         self.timestamp = datetime.now()
 
     def __repr__(self):
@@ -56,17 +62,23 @@ class Order:
 class Position:
     """Represents a trading position."""
 
+    __slots__ = ('symbol', 'quantity', 'entry_price', 'side', 'point_value', 'entry_time',
+                 'unrealized_pnl')
+
     def __init__(self, symbol: str, quantity: int, entry_price: float,
-                 side: OrderSide):
+                 side: OrderSide, point_value: float = 1.0):
         self.symbol = symbol
         self.quantity = quantity
         self.entry_price = entry_price
         self.side = side
+        self.point_value = point_value  # Dollars per point per contract
         self.entry_time = datetime.now()
         self.unrealized_pnl = 0.0
 
-    def update_pnl(self, current_price: float, point_value: float = 50.0):
+    def update_pnl(self, current_price: float, point_value: Optional[float] = None):
         """Update unrealized P&L based on current price."""
+        if point_value is None:
+            point_value = self.point_value
         if self.side == OrderSide.BUY:
             self.unrealized_pnl = (current_price - self.entry_price) * self.quantity * point_value
         else:
@@ -78,6 +90,39 @@ class Position:
                 f"pnl={self.unrealized_pnl:.2f})")
 
 
+class BracketOrder:
+    """
+    An entry order with a linked protective stop and profit target.
+
+    The stop and target are held until the entry fills, then work as an
+    OCO pair: the fill of one cancels the other. Both only reduce the
+    position the entry opened.
+    """
+
+    def __init__(self, entry: Order, stop_price: float, target_price: float):
+        """
+        Args:
+            entry: Entry order
+            stop_price: Protective stop level
+            target_price: Profit target (limit) level
+        """
+        exit_side = OrderSide.SELL if entry.side == OrderSide.BUY else OrderSide.BUY
+        self.bracket_id: Optional[str] = None
+        self.entry = entry
+        self.stop = Order(entry.symbol, exit_side, entry.quantity, OrderType.STOP,
+                          stop_price=stop_price, reduce_only=True)
+        self.target = Order(entry.symbol, exit_side, entry.quantity, OrderType.LIMIT,
+                            price=target_price, reduce_only=True)
+
+    @property
+    def exits(self) -> List[Order]:
+        return [self.stop, self.target]
+
+    def __repr__(self):
+        return (f"BracketOrder(id={self.bracket_id}, entry={self.entry}, "
+                f"stop={self.stop.stop_price}, target={self.target.price})")
+
+
 class BrokerInterface(ABC):
     """Abstract base class for broker implementations."""
 
@@ -96,6 +141,22 @@ class BrokerInterface(ABC):
         """Submit an order to the broker."""
         pass
 
+    @abstractmethod
+    def submit_bracket(self, bracket: BracketOrder) -> bool:
+        """Submit an entry with its OCO stop and target."""
+        pass
+
+    @abstractmethod
+    def submit_oco(self, orders: List[Order]) -> bool:
+        """Submit orders where the fill of any one cancels the rest."""
+        pass
+
+    @abstractmethod
+    def modify_order(self, order_id: str, price: Optional[float] = None,
+                     stop_price: Optional[float] = None) -> bool:
+        """Change the limit and/or stop price of a working order."""
+        pass
+
     @abstractmethod
     def cancel_order(self, order_id: str) -> bool:
         """Cancel an order."""
@@ -116,6 +177,10 @@ class BrokerInterface(ABC):
         """Get all open positions."""
         pass
 
+    def has_positions(self) -> bool:
+        """Check for any open position (brokers can answer without listing them)."""
+        return bool(self.get_all_positions())
+
     @abstractmethod
     def get_account_balance(self) -> float:
         """Get account balance."""
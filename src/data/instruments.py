@@ -0,0 +1,73 @@
+"""Contract specifications for supported futures instruments."""
+from datetime import time
+from typing import Dict
+
+
+class InstrumentSpec:
+    """Static contract details for one futures instrument."""
+
+    def __init__(self, symbol: str, name: str, point_value: float, tick_size: float,
+                 exchange: str = "CME", timezone: str = "America/New_York",
+                 session_open: str = "09:30", session_close: str = "16:00"):
+        """
+        Args:
+            symbol: Root symbol (e.g. "ES")
+            name: Descriptive contract name
+            point_value: Dollar value of a one point move per contract
+            tick_size: Minimum price increment in points
+            exchange: Listing exchange
+            timezone: Timezone of the session times
+            session_open: Regular session open (HH:MM)
+            session_close: Regular session close (HH:MM)
+        """
+        self.symbol = symbol
+        self.name = name
+        self.point_value = point_value
+        self.tick_size = tick_size
+        self.exchange = exchange
+        self.timezone = timezone
+        self.session_open = time.fromisoformat(session_open)
+        self.session_close = time.fromisoformat(session_close)
+
+    @property
+    def tick_value(self) -> float:
+        """Dollar value of one tick per contract."""
+        return self.point_value * self.tick_size
+
+    def round_to_tick(self, price: float) -> float:
+        """Round a price to the nearest valid tick."""
+        return round(round(price / self.tick_size) * self.tick_size, 10)
+
+    def __repr__(self):
+        return (f"InstrumentSpec(symbol={self.symbol}, point_value={self.point_value}, "
+                f"tick_size={self.tick_size}, session={self.session_open}-{self.session_close})")
+
+
+# CME equity index futures (regular trading hours, US/Eastern)
+INSTRUMENTS: Dict[str, InstrumentSpec] = {
+    spec.symbol: spec for spec in (
+        InstrumentSpec("ES", "E-mini S&P 500", 50.0, 0.25),
+        InstrumentSpec("NQ", "E-mini Nasdaq-100", 20.0, 0.25),
+        InstrumentSpec("YM", "E-mini Dow", 5.0, 1.0, exchange="CBOT"),
+        InstrumentSpec("RTY", "E-mini Russell 2000", 50.0, 0.1),
+        InstrumentSpec("MES", "Micro E-mini S&P 500", 5.0, 0.25),
+        InstrumentSpec("MNQ", "Micro E-mini Nasdaq-100", 2.0, 0.25),
+        InstrumentSpec("MYM", "Micro E-mini Dow", 0.5, 1.0, exchange="CBOT"),
+        InstrumentSpec("M2K", "Micro E-mini Russell 2000", 5.0, 0.1),
+    )
+}
+
+
+def get_instrument(symbol: str) -> InstrumentSpec:
+    """
+    Look up the contract specification for a symbol.
+
+    Raises:
+        ValueError: If the symbol is not in INSTRUMENTS
+    """
+    try:
+        return INSTRUMENTS[symbol.upper()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown instrument: {symbol} (supported: {', '.join(sorted(INSTRUMENTS))})"
+        ) from None
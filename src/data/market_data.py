@@ -1,25 +1,76 @@
 """Market data handler for ES futures."""
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from datetime import datetime, date
+from typing import List, Dict, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
 import pytz
-from collections import deque
+
+from .bar_buffer import BarBuffer
+from .rolling_stats import RollingStats, RollingStat
+from .bar_store import BarStore
+from ..utils.time_utils import to_epoch_ns, from_epoch_ns, NS_PER_MINUTE
 
 
 class Bar:
-    """Represents a single price bar."""
+    """
+    Represents a single price bar.
+
+    The bar's clock is ``ts``, int64 epoch nanoseconds (UTC). ``timestamp``
+    is the equivalent local datetime, built on first access (for logging and
+    reports) when the bar was created from epoch nanoseconds. A naive
+    datetime without ``tz`` is in the exchange timezone (``default_tz``,
+    set from the configuration by TradingBot).
+    """
+
+    __slots__ = ('ts', '_timestamp', 'tz', 'open', 'high', 'low', 'close', 'volume', 'symbol')
 
-    def __init__(self, timestamp: datetime, open_price: float, high: float,
-                 low: float, close: float, volume: int):
-        self.timestamp = timestamp
+    default_tz = pytz.timezone("America/New_York")
+
+    def __init__(self, timestamp: Union[datetime, int], open_price: float, high: float,
+                 low: float, close: float, volume: int, symbol: Optional[str] = None,
+                 tz=None):
+        """
+        Args:
+            timestamp: Bar time as epoch nanoseconds or a datetime (naive
+                datetimes are in ``tz``)
+            open_price, high, low, close, volume: Bar values
+            symbol: Instrument symbol (None for single-instrument feeds)
+            tz: Timezone of ``timestamp`` as a datetime (default: ``default_tz``
+                for naive datetimes, UTC for epoch nanoseconds)
+        """
+        if isinstance(timestamp, datetime):
+            if timestamp.tzinfo is None:
+                if tz is None:
+                    tz = self.default_tz
+                timestamp = tz.localize(timestamp)
+            self.ts = to_epoch_ns(timestamp)
+            self._timestamp = timestamp
+        else:
+            self.ts = timestamp
+            self._timestamp = None
+        self.tz = tz
         self.open = open_price
         self.high = high
         self.low = low
         self.close = close
         self.volume = volume
+        self.symbol = symbol  # None for single-instrument feeds
+
+    @classmethod
+    def set_default_timezone(cls, timezone: str):
+        """Set the exchange timezone of naive bar datetimes."""
+        cls.default_tz = pytz.timezone(timezone)
+
+    @property
+    def timestamp(self) -> datetime:
+        """Bar time as a timezone-aware datetime."""
+        if self._timestamp is None:
+            self._timestamp = from_epoch_ns(self.ts, self.tz or pytz.utc)
+        return self._timestamp
 
     def __repr__(self):
-        return (f"Bar(timestamp={self.timestamp}, open={self.open}, "
+        symbol = f"symbol={self.symbol}, " if self.symbol else ""
+        return (f"Bar({symbol}timestamp={self.timestamp}, open={self.open}, "
                 f"high={self.high}, low={self.low}, close={self.close}, "
                 f"volume={self.volume})")
 
@@ -27,102 +78,203 @@ class Bar:
 class MarketDataHandler:
     """Handles market data for ES futures."""
 
-    def __init__(self, symbol: str = "ES", timezone: str = "America/New_York"):
+    def __init__(self, symbol: str = "ES", timezone: str = "America/New_York",
+                 max_bars: int = 1000):
         self.symbol = symbol
         self.timezone = pytz.timezone(timezone)
-        self.bars: deque = deque(maxlen=1000)  # Store last 1000 bars
-        self.current_bar: Optional[Bar] = None
+        self.bars = BarBuffer(capacity=max_bars)  # Store last max_bars bars
+        self.stats = RollingStats()  # Incrementally updated indicators
+        self._row = [0, 0.0, 0.0, 0.0, 0.0, 0]  # Reused bar row for the statistics
+
+    @property
+    def current_bar(self) -> Optional[Bar]:
+        """The most recent bar (materialized on access)."""
+        return self.get_latest_bar()
+
+    def add_bar(self, timestamp: Union[datetime, int], open_price: float, high: float,
+                low: float, close: float, volume: int) -> int:
+        """Add a new bar (timestamp as epoch ns or datetime) and return its epoch-ns time."""
+        ts = self._to_ns(timestamp)
+        self.bars.append(ts, open_price, high, low, close, volume)
+
+        if self.stats:
+            row = self._row
+            row[0] = ts
+            row[1] = open_price
+            row[2] = high
+            row[3] = low
+            row[4] = close
+            row[5] = volume
+            self.stats.update(row)
+        return ts
+
+    def register_stat(self, name: str, stat: RollingStat) -> RollingStat:
+        """
+        Register a rolling statistic, updated on every add_bar.
 
-    def add_bar(self, timestamp: datetime, open_price: float, high: float,
-                low: float, close: float, volume: int):
-        """Add a new bar to the data handler."""
+        A newly registered statistic is warmed up from the bars already held
+        in the buffer. Registering the same name and parameters again returns
+        the shared instance.
+        """
+        stat, is_new = self.stats.register(name, stat)
+        if is_new:
+            for i in range(len(self.bars)):
+                stat.update(self.bars.row(i))
+        return stat
+
+    def warm_start(self, store: 'BarStore', start: Optional[date] = None,
+                   end: Optional[date] = None) -> int:
+        """
+        Preload history from a BarStore.
+
+        The most recent bars of the range (up to the buffer capacity) are
+        copied into the buffer in one vectorized step, and registered rolling
+        statistics are replayed over them.
+
+        Returns:
+            Number of bars loaded into the buffer
+        """
+        records = store.load_range(self.symbol, start, end)[-self.bars.capacity:]
+        if not len(records):
+            return 0
+
+        self.bars.extend(records['ts'], records['open'], records['high'],
+                         records['low'], records['close'], records['volume'])
+
+        if self.stats:
+            for row in records.tolist():
+                self.stats.update(row)
+
+        return len(records)
+
+    def get_stat(self, name: str) -> float:
+        """Get the cached value of a registered rolling statistic."""
+        return self.stats.get(name)
+
+    def start_session(self):
+        """Notify session-scoped statistics (e.g. VWAP) that a new session started."""
+        self.stats.reset_session()
+
+    def _to_ns(self, timestamp: Union[datetime, int]) -> int:
+        """Convert a (possibly naive) datetime to epoch nanoseconds; ints pass through."""
+        if not isinstance(timestamp, datetime):
+            return timestamp
         if timestamp.tzinfo is None:
             timestamp = self.timezone.localize(timestamp)
+        return to_epoch_ns(timestamp)
 
-        bar = Bar(timestamp, open_price, high, low, close, volume)
-        self.bars.append(bar)
-        self.current_bar = bar
+    def _make_bar(self, index: int) -> Bar:
+        """Materialize the bar at a logical buffer index."""
+        ts, open_price, high, low, close, volume = self.bars.row(index)
+        return Bar(ts, open_price, high, low, close, volume, tz=self.timezone)
 
-    def get_bars(self, start_time: Optional[datetime] = None,
-                 end_time: Optional[datetime] = None) -> List[Bar]:
-        """Get bars within a time range."""
-        if not self.bars:
-            return []
+    def _window_mask(self, start_time: Optional[Union[datetime, int]],
+                     end_time: Optional[Union[datetime, int]]) -> np.ndarray:
+        """Boolean mask over the buffer for bars within a time range."""
+        ts = self.bars.view('ts')
+        mask = np.ones(len(ts), dtype=bool)
+
+        if start_time is not None:
+            mask &= ts >= self._to_ns(start_time)
+
+        if end_time is not None:
+            mask &= ts <= self._to_ns(end_time)
 
-        filtered_bars = list(self.bars)
+        return mask
 
-        if start_time:
-            if start_time.tzinfo is None:
-                start_time = self.timezone.localize(start_time)
-            filtered_bars = [b for b in filtered_bars if b.timestamp >= start_time]
+    def _index_range(self, start_time: Optional[Union[datetime, int]],
+                     end_time: Optional[Union[datetime, int]]) -> Tuple[int, int]:
+        """Logical buffer indices [start, stop) of bars within a time range (inclusive)."""
+        start, stop = 0, len(self.bars)
+        if start_time is not None:
+            start = self.bars.search(self._to_ns(start_time), 'left')
+        if end_time is not None:
+            stop = self.bars.search(self._to_ns(end_time), 'right')
+        return start, max(start, stop)
+
+    def get_bars(self, start_time: Optional[Union[datetime, int]] = None,
+                 end_time: Optional[Union[datetime, int]] = None) -> List[Bar]:
+        """Get bars within a time range (datetimes or epoch ns)."""
+        if not self.bars:
+            return []
 
-        if end_time:
-            if end_time.tzinfo is None:
-                end_time = self.timezone.localize(end_time)
-            filtered_bars = [b for b in filtered_bars if b.timestamp <= end_time]
+        if not self.bars.is_monotonic:
+            indices = np.flatnonzero(self._window_mask(start_time, end_time)).tolist()
+        else:
+            indices = range(*self._index_range(start_time, end_time))
 
-        return filtered_bars
+        return [self._make_bar(i) for i in indices]
 
     def get_bars_since(self, minutes: int) -> List[Bar]:
         """Get bars from the last N minutes."""
-        if not self.current_bar:
+        if not self.bars:
             return []
 
-        start_time = self.current_bar.timestamp - timedelta(minutes=minutes)
-        return self.get_bars(start_time=start_time)
+        latest_ts = self.bars.row(-1)[0]
+        return self.get_bars(start_time=latest_ts - minutes * NS_PER_MINUTE)
 
     def get_latest_bar(self) -> Optional[Bar]:
         """Get the most recent bar."""
-        return self.current_bar
+        if not self.bars:
+            return None
+        return self._make_bar(-1)
 
     def get_average_volume(self, lookback_bars: int = 20) -> float:
         """Calculate average volume over the last N bars."""
-        if not self.bars:
+        if not self.bars or lookback_bars <= 0:
             return 0.0
 
-        recent_bars = list(self.bars)[-lookback_bars:]
-        if not recent_bars:
-            return 0.0
+        count = min(lookback_bars, len(self.bars))
+        return self.bars.range_volume(len(self.bars) - count, len(self.bars)) / count
 
-        total_volume = sum(bar.volume for bar in recent_bars)
-        return total_volume / len(recent_bars)
-
-    def get_high_low_range(self, start_time: datetime, end_time: datetime) -> Tuple[float, float]:
+    def get_high_low_range(self, start_time: Union[datetime, int],
+                           end_time: Union[datetime, int]) -> Tuple[float, float]:
         """Get the high and low within a time range."""
-        bars = self.get_bars(start_time, end_time)
-
-        if not bars:
+        if not self.bars:
             return (0.0, 0.0)
 
-        high = max(bar.high for bar in bars)
-        low = min(bar.low for bar in bars)
+        if not self.bars.is_monotonic:
+            mask = self._window_mask(start_time, end_time)
+            if not mask.any():
+                return (0.0, 0.0)
+            return (float(self.bars.view('high')[mask].max()),
+                    float(self.bars.view('low')[mask].min()))
+
+        start, stop = self._index_range(start_time, end_time)
+        if start == stop:
+            return (0.0, 0.0)
 
-        return (high, low)
+        return self.bars.range_high_low(start, stop)
 
-    def get_total_volume(self, start_time: datetime, end_time: datetime) -> int:
+    def get_total_volume(self, start_time: Union[datetime, int],
+                         end_time: Union[datetime, int]) -> int:
         """Get total volume within a time range."""
-        bars = self.get_bars(start_time, end_time)
-        return sum(bar.volume for bar in bars)
+        if not self.bars:
+            return 0
+
+        if not self.bars.is_monotonic:
+            mask = self._window_mask(start_time, end_time)
+            return int(self.bars.view('volume')[mask].sum())
+
+        return self.bars.range_volume(*self._index_range(start_time, end_time))
 
     def to_dataframe(self) -> pd.DataFrame:
         """Convert bars to pandas DataFrame."""
         if not self.bars:
             return pd.DataFrame()
 
+        index = pd.DatetimeIndex(
+            self.bars.view('ts'), tz='UTC', name='timestamp'
+        ).tz_convert(self.timezone)
+
         data = {
-            'timestamp': [bar.timestamp for bar in self.bars],
-            'open': [bar.open for bar in self.bars],
-            'high': [bar.high for bar in self.bars],
-            'low': [bar.low for bar in self.bars],
-            'close': [bar.close for bar in self.bars],
-            'volume': [bar.volume for bar in self.bars]
+            column: self.bars.view(column)
+            for column in ('open', 'high', 'low', 'close', 'volume')
         }
 
-        df = pd.DataFrame(data)
-        df.set_index('timestamp', inplace=True)
-        return df
+        return pd.DataFrame(data, index=index)
 
     def clear(self):
         """Clear all stored bars."""
         self.bars.clear()
-        self.current_bar = None
+        self.stats.reset()
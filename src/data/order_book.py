@@ -0,0 +1,234 @@
+"""Price-level book of resting orders for the paper broker."""
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+from .broker_interface import Order, OrderSide, OrderType
+
+# Resting entry: (submission sequence, order, book the order rested in)
+Entry = Tuple[int, Order, str]
+
+
+def first_touch(path: Tuple[float, ...], level: float, rising: bool,
+                start: float = 0.0) -> Optional[float]:
+    """
+    Find when a piecewise linear price path first reaches a level.
+
+    Args:
+        path: Prices visited in order, starting with the open
+        level: Price level
+        rising: True to find the first price >= level, False for <= level
+        start: Position along the path to search from (segment index plus
+            fraction)
+
+    Returns:
+        ``start`` if the price there is already through the level, otherwise
+        the position where the path reaches it, or None if it never does
+    """
+    k = int(start)
+    last = len(path) - 1
+    if k >= last:
+        price = path[last]
+    else:
+        price = path[k] + (path[k + 1] - path[k]) * (start - k)
+    if (price >= level) if rising else (price <= level):
+        return start
+
+    for k in range(k + 1, last + 1):
+        a, b = path[k - 1], path[k]
+        if (b >= level > price) if rising else (b <= level < price):
+            return k - 1 + (level - a) / (b - a)
+        price = b
+    return None
+
+
+class PriceLevels:
+    """
+    One side of a book: FIFO queues of orders grouped by price level.
+
+    A heap holds each level's price once, so insertion is O(log n) per new
+    level and O(1) for a level that already exists. A cancelled or amended
+    order leaves a stale entry behind; levels at the top of the heap that
+    hold only stale entries are dropped as soon as an entry goes stale, so
+    best() always names a level with a live order, and the side is compacted
+    once its stale entries outnumber the live ones.
+    """
+
+    def __init__(self, descending: bool, live: Dict[str, Entry]):
+        """
+        Args:
+            descending: True if the best level is the highest price (buy
+                limits, sell stops), False if it is the lowest
+            live: The book's order id -> current entry map; an entry is
+                stale once it is no longer the one mapped
+        """
+        self.descending = descending
+        self.levels: Dict[float, List[Entry]] = {}
+        self._heap: List[float] = []
+        self._live = live
+        self.entries = 0  # Entries held, live and stale
+        self.stale = 0
+
+    def add(self, price: float, entry: Entry):
+        level = self.levels.get(price)
+        if level is None:
+            self.levels[price] = [entry]
+            heapq.heappush(self._heap, -price if self.descending else price)
+        else:
+            level.append(entry)
+        self.entries += 1
+
+    def best(self) -> Optional[float]:
+        """Price of the best level."""
+        if not self._heap:
+            return None
+        return -self._heap[0] if self.descending else self._heap[0]
+
+    def _is_live(self, entry: Entry) -> bool:
+        return self._live.get(entry[1].order_id) is entry
+
+    def retire(self):
+        """Account for an entry of this side that went stale and clean up after it."""
+        self.stale += 1
+        heap = self._heap
+        levels = self.levels
+        while heap:
+            price = -heap[0] if self.descending else heap[0]
+            level = levels[price]
+            if any(self._is_live(entry) for entry in level):
+                break
+            heapq.heappop(heap)
+            del levels[price]
+            self.entries -= len(level)
+            self.stale -= len(level)
+
+        if self.stale > self.entries - self.stale:
+            self._compact()
+
+    def _compact(self):
+        """Rebuild the side from its live entries only."""
+        levels = {}
+        for price, level in self.levels.items():
+            kept = [entry for entry in level if self._is_live(entry)]
+            if kept:
+                levels[price] = kept
+        self.levels = levels
+        self._heap = [-price if self.descending else price for price in levels]
+        heapq.heapify(self._heap)
+        self.entries = sum(len(level) for level in levels.values())
+        self.stale = 0
+
+    def pop_through(self, price: float, out: List[Entry]):
+        """
+        Remove every level the price has reached and append its live entries.
+
+        A descending side releases levels at or above ``price``, an
+        ascending side levels at or below it.
+        """
+        heap = self._heap
+        levels = self.levels
+        while heap and (heap[0] <= -price if self.descending else heap[0] <= price):
+            key = heapq.heappop(heap)
+            level = levels.pop(-key if self.descending else key)
+            self.entries -= len(level)
+            for entry in level:
+                if self._is_live(entry):
+                    out.append(entry)
+                else:
+                    self.stale -= 1
+
+
+class OrderBook:
+    """
+    Resting stop and limit orders for one symbol.
+
+    Buy limits and sell stops trigger when the price falls to their level;
+    sell limits and buy stops when it rises to it. Matching a price range
+    pops only the levels inside it. A STOP_LIMIT order rests with the stops
+    until triggered and with the limits afterwards. Amending an order rests
+    it again at its new level; the old entry goes stale.
+    """
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.live: Dict[str, Entry] = {}  # order id -> its current entry
+        self.buy_limits = PriceLevels(descending=True, live=self.live)
+        self.sell_limits = PriceLevels(descending=False, live=self.live)
+        self.buy_stops = PriceLevels(descending=False, live=self.live)
+        self.sell_stops = PriceLevels(descending=True, live=self.live)
+
+    def __len__(self) -> int:
+        return len(self.live)
+
+    def __contains__(self, order: Order) -> bool:
+        return order.order_id in self.live
+
+    def add(self, seq: int, order: Order, triggered: bool = False):
+        """
+        Rest an order.
+
+        Args:
+            seq: Submission sequence, for time priority within a level
+            order: STOP, LIMIT or STOP_LIMIT order
+            triggered: The order is a STOP_LIMIT whose stop has triggered
+        """
+        buy = order.side == OrderSide.BUY
+        if order.order_type == OrderType.LIMIT or triggered:
+            entry = (seq, order, 'limit')
+            side = self.buy_limits if buy else self.sell_limits
+            side.add(order.price, entry)
+        else:
+            entry = (seq, order, 'stop')
+            side = self.buy_stops if buy else self.sell_stops
+            side.add(order.stop_price, entry)
+        self.live[order.order_id] = entry
+
+    def _side(self, entry: Entry) -> PriceLevels:
+        """Side of the book an entry rests in."""
+        buy = entry[1].side == OrderSide.BUY
+        if entry[2] == 'limit':
+            return self.buy_limits if buy else self.sell_limits
+        return self.buy_stops if buy else self.sell_stops
+
+    def amend(self, seq: int, order: Order):
+        """Rest an order again after its price changed (loses time priority)."""
+        entry = self.live.get(order.order_id)
+        if entry is not None:
+            self.add(seq, order, triggered=entry[2] == 'limit')
+            self._side(entry).retire()
+
+    def discard(self, order: Order):
+        """Forget an order that was cancelled or filled."""
+        entry = self.live.pop(order.order_id, None)
+        if entry is not None:
+            self._side(entry).retire()
+
+    def reaches(self, low: float, high: float) -> bool:
+        """Check if any level lies within reach of a price range."""
+        price = self.buy_limits.best()
+        if price is not None and price >= low:
+            return True
+        price = self.sell_stops.best()
+        if price is not None and price >= low:
+            return True
+        price = self.sell_limits.best()
+        if price is not None and price <= high:
+            return True
+        price = self.buy_stops.best()
+        return price is not None and price <= high
+
+    def pop_range(self, low: float, high: float) -> List[Entry]:
+        """Remove and return the live orders of every level in [low, high] reach."""
+        entries: List[Entry] = []
+        self.buy_limits.pop_through(low, entries)
+        self.sell_stops.pop_through(low, entries)
+        self.sell_limits.pop_through(high, entries)
+        self.buy_stops.pop_through(high, entries)
+
+        live = self.live
+        for entry in entries:
+            del live[entry[1].order_id]
+        return entries
+
+    def resting_orders(self) -> List[Order]:
+        """Live resting orders in submission order."""
+        return [entry[1] for entry in sorted(self.live.values(), key=lambda e: e[0])]
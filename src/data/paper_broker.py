@@ -1,34 +1,95 @@
 """Paper trading broker implementation for testing."""
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple, Union
+import heapq
+import itertools
 import uuid
 from datetime import datetime
+import pytz
 
 from .broker_interface import (
-    BrokerInterface, Order, Position, OrderSide,
+    BrokerInterface, Order, BracketOrder, Position, OrderSide,
     OrderType, OrderStatus
 )
+from .instruments import get_instrument
+from .order_book import OrderBook, first_touch
 from ..utils.logger import Logger
+from ..utils.time_utils import from_epoch_ns
+
+# Order in which a bar's prices are assumed to trade
+PATH_MODELS = ('ohlc', 'olhc', 'worst_case')
+
+RESTING_TYPES = (OrderType.STOP, OrderType.LIMIT, OrderType.STOP_LIMIT)
 
 
 class PaperBroker(BrokerInterface):
-    """Paper trading broker for simulation and testing."""
+    """
+    Paper trading broker for simulation and testing.
+
+    Market orders fill at the last price. Stop, limit and stop-limit orders
+    rest in a per-symbol OrderBook and are matched on every price update.
+    Only the price levels a move reaches are examined, so idle resting
+    orders cost nothing per update. Orders submitted as an OCO group cancel
+    each other on fill; a bracket's exits become such a group once its
+    entry fills.
+
+    A bar passed to update_bar() is walked along an assumed intrabar path:
+    'ohlc' (open, high, low, close), 'olhc' (open, low, high, close) or
+    'worst_case' (against the open position: low first when long, high
+    first when short). A price passed to update_market_price() is a move
+    straight from the last price. Orders are filled in the order the path
+    reaches them; one the path starts beyond fills at the starting price
+    (a gap), any other at its level. Fills are stamped with the bar's
+    timestamp; epoch-nanosecond bar times are converted to datetimes in
+    ``timezone`` only when an order fills.
+    """
+
+    def __init__(self, initial_balance: float = 100000.0, point_value: Optional[float] = None,
+                 path_model: str = 'worst_case', timezone: str = "UTC"):
+        """
+        Args:
+            initial_balance: Starting account balance
+            point_value: Dollars per point for every symbol; by default each
+                symbol's value comes from its instrument spec
+            path_model: Intrabar path used to match resting orders (see PATH_MODELS)
+            timezone: Timezone of fill times given as epoch nanoseconds
+        """
+        if path_model not in PATH_MODELS:
+            raise ValueError(f"Unknown intrabar path model: {path_model}")
 
-    def __init__(self, initial_balance: float = 100000.0, point_value: float = 50.0):
         self.logger = Logger.get_logger()
         self.initial_balance = initial_balance
         self.balance = initial_balance
-        self.point_value = point_value  # ES futures: $50 per point
+        self.point_value = point_value
+        self.point_values: Dict[str, float] = {}  # symbol -> dollars per point
+        self.path_model = path_model
+        self.timezone = pytz.timezone(timezone)
 
         self.orders: Dict[str, Order] = {}
+        self.books: Dict[str, OrderBook] = {}  # symbol -> resting orders
+        self.brackets: Dict[str, BracketOrder] = {}  # entry order id -> bracket awaiting fill
+        self.oco_groups: Dict[str, List[Order]] = {}  # order id -> its OCO group
         self.positions: Dict[str, Position] = {}
         self.filled_orders: List[Order] = []
         self.trade_history: List[Dict] = []
 
         self.connected = False
         self.current_prices: Dict[str, float] = {}
+        self.current_times: Dict[str, Union[datetime, int]] = {}
 
         self.daily_pnl = 0.0
         self.total_trades = 0
+        self.trades_by_symbol: Dict[str, int] = {}
+
+        self._sequence = itertools.count()
+
+    def get_point_value(self, symbol: str) -> float:
+        """Dollars per point for a symbol."""
+        point_value = self.point_values.get(symbol)
+        if point_value is None:
+            point_value = self.point_value if self.point_value is not None else \
+                get_instrument(symbol).point_value
+            self.point_values[symbol] = point_value
+        return point_value
 
     def connect(self) -> bool:
         """Connect to the paper broker."""
@@ -42,12 +103,100 @@ class PaperBroker(BrokerInterface):
         self.connected = False
 
     def update_market_price(self, symbol: str, price: float):
-        """Update current market price for a symbol."""
+        """Update current market price for a symbol, filling any orders it reaches."""
+        book = self.books.get(symbol)
+        if book is not None and book.live:
+            last = self.current_prices.get(symbol, price)
+            low, high = (price, last) if price < last else (last, price)
+            if book.reaches(low, high):
+                self._match(book, (last, price), low, high, self.current_times.get(symbol))
+
+        self._mark(symbol, price)
+
+    def update_bar(self, symbol: str, timestamp: Union[datetime, int], open_price: float,
+                   high: float, low: float, close: float):
+        """
+        Match resting orders against a bar, then mark the symbol at its close.
+
+        Args:
+            symbol: Instrument symbol
+            timestamp: Bar time as a datetime or epoch nanoseconds (used as
+                the fill time)
+            open_price, high, low, close: Bar prices
+        """
+        self.current_times[symbol] = timestamp
+        book = self.books.get(symbol)
+        if book is not None and book.live and book.reaches(low, high):
+            path = self._intrabar_path(symbol, open_price, high, low, close)
+            self._match(book, path, low, high, timestamp)
+        self._mark(symbol, close)
+
+    def _mark(self, symbol: str, price: float):
         self.current_prices[symbol] = price
 
         # Update P&L for open positions
-        if symbol in self.positions:
-            self.positions[symbol].update_pnl(price, self.point_value)
+        position = self.positions.get(symbol)
+        if position is not None:
+            position.update_pnl(price)
+
+    def _intrabar_path(self, symbol: str, open_price: float, high: float, low: float,
+                       close: float) -> Tuple[float, float, float, float]:
+        if self.path_model == 'worst_case':
+            position = self.positions.get(symbol)
+            low_first = position is not None and position.side == OrderSide.BUY
+        else:
+            low_first = self.path_model == 'olhc'
+        return (open_price, low, high, close) if low_first else (open_price, high, low, close)
+
+    def _match(self, book: OrderBook, path: Tuple[float, ...], low: float, high: float,
+               timestamp: Optional[Union[datetime, int]]):
+        """
+        Fill the orders whose levels a price path reaches, in the order reached.
+
+        Args:
+            book: Book of the symbol
+            path: Prices visited in order, starting at the open / last price
+            low, high: Range of the path
+            timestamp: Fill time
+        """
+        # (position along the path, sequence, order, stage)
+        touched = []
+        for seq, order, stage in book.pop_range(low, high):
+            if stage == 'stop':
+                # Buy stops trigger on a rise, sell stops on a fall
+                at = first_touch(path, order.stop_price, order.side == OrderSide.BUY)
+            else:
+                # Buy limits fill on a fall, sell limits on a rise
+                at = first_touch(path, order.price, order.side == OrderSide.SELL)
+            if at is None:
+                book.add(seq, order, triggered=stage == 'limit')  # Not actually reached
+            else:
+                touched.append((at, seq, order, stage))
+        heapq.heapify(touched)
+
+        while touched:
+            at, seq, order, stage = heapq.heappop(touched)
+            if order.status != OrderStatus.SUBMITTED:
+                continue  # Cancelled by an earlier fill on this path
+
+            if stage == 'stop':
+                price = path[0] if at == 0.0 else order.stop_price
+                if order.order_type == OrderType.STOP_LIMIT:
+                    # Triggered: a marketable limit fills now, others rest as limits
+                    buy = order.side == OrderSide.BUY
+                    if (price <= order.price) if buy else (price >= order.price):
+                        self._fill_order(order, price, timestamp)
+                        continue
+                    limit_at = first_touch(path, order.price, not buy, start=at)
+                    if limit_at is None:
+                        book.add(seq, order, triggered=True)
+                    else:
+                        heapq.heappush(touched, (limit_at, seq, order, 'limit'))
+                    continue
+            else:
+                price = path[0] if at == 0.0 else order.price
+
+            self._fill_order(order, price, timestamp)
 
     def submit_order(self, order: Order) -> bool:
         """Submit an order to the paper broker."""
@@ -55,6 +204,14 @@ class PaperBroker(BrokerInterface):
             self.logger.error("Not connected to broker")
             return False
 
+        if order.order_type in RESTING_TYPES:
+            missing = (order.order_type != OrderType.LIMIT and order.stop_price is None) or \
+                (order.order_type != OrderType.STOP and order.price is None)
+            if missing:
+                order.status = OrderStatus.REJECTED
+                self.logger.error(f"Order is missing its price: {order}")
+                return False
+
         order.order_id = str(uuid.uuid4())
         order.status = OrderStatus.SUBMITTED
         self.orders[order.order_id] = order
@@ -64,18 +221,81 @@ class PaperBroker(BrokerInterface):
         # For market orders, fill immediately at current price
         if order.order_type == OrderType.MARKET:
             self._fill_order(order)
+        else:
+            book = self.books.get(order.symbol)
+            if book is None:
+                book = self.books[order.symbol] = OrderBook(order.symbol)
+            book.add(next(self._sequence), order)
 
         return True
 
-    def _fill_order(self, order: Order):
-        """Fill an order at current market price."""
-        if order.symbol not in self.current_prices:
-            self.logger.warning(f"No price data for {order.symbol}, cannot fill order")
-            return
+    def submit_bracket(self, bracket: BracketOrder) -> bool:
+        """Submit an entry; its stop and target go out as an OCO pair once it fills."""
+        if not self.submit_order(bracket.entry):
+            for order in bracket.exits:
+                order.status = OrderStatus.CANCELLED
+            return False
+
+        bracket.bracket_id = bracket.entry.order_id
+        if bracket.entry.status == OrderStatus.FILLED:
+            return self.submit_oco(bracket.exits)
+
+        self.brackets[bracket.entry.order_id] = bracket
+        return True
 
-        fill_price = self.current_prices[order.symbol]
+    def submit_oco(self, orders: List[Order]) -> bool:
+        """Submit orders where the fill of any one cancels the rest."""
+        submitted = []
+        for order in orders:
+            if not self.submit_order(order):
+                for other in submitted:
+                    self.cancel_order(other.order_id)
+                return False
+            submitted.append(order)
+
+        group = [order for order in submitted if order.status == OrderStatus.SUBMITTED]
+        if len(group) < len(submitted):
+            # A leg filled on submission: the group is already done
+            for order in group:
+                self.cancel_order(order.order_id)
+            return True
+
+        for order in group:
+            self.oco_groups[order.order_id] = group
+        return True
+
+    def _fill_order(self, order: Order, price: Optional[float] = None,
+                    timestamp: Optional[Union[datetime, int]] = None):
+        """Fill an order at ``price`` (default: current market price)."""
+        if price is None:
+            if order.symbol not in self.current_prices:
+                self.logger.warning(f"No price data for {order.symbol}, cannot fill order")
+                return
+            price = self.current_prices[order.symbol]
+
+        book = self.books.get(order.symbol)
+        if book is not None:
+            book.discard(order)
+
+        if order.reduce_only:
+            position = self.positions.get(order.symbol)
+            if position is None or position.side == order.side:
+                order.status = OrderStatus.CANCELLED
+                self.oco_groups.pop(order.order_id, None)
+                self.logger.info(f"Reduce-only order cancelled, no position to reduce: {order}")
+                return
+            order.quantity = min(order.quantity, position.quantity)
+
+        fill_price = price
         order.filled_price = fill_price
         order.filled_quantity = order.quantity
+        if timestamp is None:
+            timestamp = self.current_times.get(order.symbol)
+        if timestamp is None:
+            timestamp = datetime.now(pytz.utc)
+        elif not isinstance(timestamp, datetime):
+            timestamp = from_epoch_ns(timestamp, self.timezone)
+        order.filled_time = timestamp
         order.status = OrderStatus.FILLED
         self.filled_orders.append(order)
 
@@ -84,6 +304,16 @@ class PaperBroker(BrokerInterface):
 
         self.logger.info(f"Order filled: {order.order_id} at price {fill_price}")
         self.total_trades += 1
+        self.trades_by_symbol[order.symbol] = self.trades_by_symbol.get(order.symbol, 0) + 1
+
+        # One cancels the other
+        for sibling in self.oco_groups.pop(order.order_id, ()):
+            if sibling is not order and sibling.status == OrderStatus.SUBMITTED:
+                self.cancel_order(sibling.order_id)
+
+        bracket = self.brackets.pop(order.order_id, None)
+        if bracket is not None:
+            self.submit_oco(bracket.exits)
 
     def _update_position(self, order: Order):
         """Update position based on filled order."""
@@ -111,7 +341,9 @@ class PaperBroker(BrokerInterface):
                         'quantity': position.quantity,
                         'side': position.side.value,
                         'pnl': pnl,
-                        'timestamp': datetime.now()
+                        'entry_time': position.entry_time,
+                        'exit_time': order.filled_time,
+                        'timestamp': order.filled_time
                     })
 
                     del self.positions[symbol]
@@ -133,19 +365,41 @@ class PaperBroker(BrokerInterface):
                 symbol=symbol,
                 quantity=order.quantity,
                 entry_price=order.filled_price,
-                side=order.side
+                side=order.side,
+                point_value=self.get_point_value(symbol)
             )
+            position.entry_time = order.filled_time
             self.positions[symbol] = position
             self.logger.info(f"Position opened: {position}")
 
     def _calculate_pnl(self, position: Position, exit_price: float) -> float:
         """Calculate P&L for a position."""
         if position.side == OrderSide.BUY:
-            pnl = (exit_price - position.entry_price) * position.quantity * self.point_value
+            pnl = (exit_price - position.entry_price) * position.quantity * position.point_value
         else:
-            pnl = (position.entry_price - exit_price) * position.quantity * self.point_value
+            pnl = (position.entry_price - exit_price) * position.quantity * position.point_value
         return pnl
 
+    def modify_order(self, order_id: str, price: Optional[float] = None,
+                     stop_price: Optional[float] = None) -> bool:
+        """Change the limit and/or stop price of a working order."""
+        order = self.orders.get(order_id)
+        if order is None or order.status != OrderStatus.SUBMITTED:
+            self.logger.warning(f"Cannot modify order {order_id}: not working")
+            return False
+
+        if price is not None:
+            order.price = price
+        if stop_price is not None:
+            order.stop_price = stop_price
+
+        book = self.books.get(order.symbol)
+        if book is not None:
+            book.amend(next(self._sequence), order)
+        self.logger.debug(f"Order modified: {order_id} price={order.price} "
+                          f"stop={order.stop_price}")
+        return True
+
     def cancel_order(self, order_id: str) -> bool:
         """Cancel an order."""
         if order_id not in self.orders:
@@ -158,6 +412,15 @@ class PaperBroker(BrokerInterface):
             return False
 
         order.status = OrderStatus.CANCELLED
+        book = self.books.get(order.symbol)
+        if book is not None:
+            book.discard(order)
+        self.oco_groups.pop(order_id, None)
+
+        bracket = self.brackets.pop(order_id, None)
+        if bracket is not None:
+            for exit_order in bracket.exits:
+                exit_order.status = OrderStatus.CANCELLED
         self.logger.info(f"Order cancelled: {order_id}")
         return True
 
@@ -175,6 +438,10 @@ class PaperBroker(BrokerInterface):
         """Get all open positions."""
         return list(self.positions.values())
 
+    def has_positions(self) -> bool:
+        """Check for any open position without copying the position list."""
+        return bool(self.positions)
+
     def get_account_balance(self) -> float:
         """Get account balance."""
         return self.balance
@@ -182,17 +449,22 @@ class PaperBroker(BrokerInterface):
     def get_daily_pnl(self) -> float:
         """Get daily P&L."""
         # Include unrealized P&L from open positions
-        unrealized_pnl = sum(pos.unrealized_pnl for pos in self.positions.values())
-        return self.daily_pnl + unrealized_pnl
+        pnl = self.daily_pnl
+        for position in self.positions.values():
+            pnl += position.unrealized_pnl
+        return pnl
 
-    def get_total_trades(self) -> int:
-        """Get total number of trades today."""
+    def get_total_trades(self, symbol: Optional[str] = None) -> int:
+        """Get total number of trades today (for one symbol if given)."""
+        if symbol is not None:
+            return self.trades_by_symbol.get(symbol, 0)
         return self.total_trades
 
     def reset_daily_stats(self):
         """Reset daily statistics."""
         self.daily_pnl = 0.0
         self.total_trades = 0
+        self.trades_by_symbol.clear()
         self.logger.info("Daily stats reset")
 
     def subscribe_market_data(self, symbol: str):
@@ -209,31 +481,45 @@ class PaperBroker(BrokerInterface):
 
     def get_statistics(self) -> Dict:
         """Get trading statistics."""
-        if not self.trade_history:
-            return {
-                'total_trades': 0,
-                'winning_trades': 0,
-                'losing_trades': 0,
-                'win_rate': 0.0,
-                'total_pnl': 0.0,
-                'average_win': 0.0,
-                'average_loss': 0.0
-            }
-
-        winning_trades = [t for t in self.trade_history if t['pnl'] > 0]
-        losing_trades = [t for t in self.trade_history if t['pnl'] <= 0]
-
-        total_pnl = sum(t['pnl'] for t in self.trade_history)
-        avg_win = sum(t['pnl'] for t in winning_trades) / len(winning_trades) if winning_trades else 0
-        avg_loss = sum(t['pnl'] for t in losing_trades) / len(losing_trades) if losing_trades else 0
+        return trade_statistics(self.trade_history, self.balance)
+
 
+def trade_statistics(trade_history: List[Dict], balance: float) -> Dict:
+    """
+    Summarize a trade history.
+
+    Args:
+        trade_history: Closed trades with a 'pnl' entry
+        balance: Current account balance
+
+    Returns:
+        Trade counts, win rate, total P&L and average win/loss
+    """
+    if not trade_history:
         return {
-            'total_trades': len(self.trade_history),
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades),
-            'win_rate': len(winning_trades) / len(self.trade_history) * 100,
-            'total_pnl': total_pnl,
-            'average_win': avg_win,
-            'average_loss': avg_loss,
-            'current_balance': self.balance
+            'total_trades': 0,
+            'winning_trades': 0,
+            'losing_trades': 0,
+            'win_rate': 0.0,
+            'total_pnl': 0.0,
+            'average_win': 0.0,
+            'average_loss': 0.0
         }
+
+    winning_trades = [t for t in trade_history if t['pnl'] > 0]
+    losing_trades = [t for t in trade_history if t['pnl'] <= 0]
+
+    total_pnl = sum(t['pnl'] for t in trade_history)
+    avg_win = sum(t['pnl'] for t in winning_trades) / len(winning_trades) if winning_trades else 0
+    avg_loss = sum(t['pnl'] for t in losing_trades) / len(losing_trades) if losing_trades else 0
+
+    return {
+        'total_trades': len(trade_history),
+        'winning_trades': len(winning_trades),
+        'losing_trades': len(losing_trades),
+        'win_rate': len(winning_trades) / len(trade_history) * 100,
+        'total_pnl': total_pnl,
+        'average_win': avg_win,
+        'average_loss': avg_loss,
+        'current_balance': balance
+    }
@@ -0,0 +1,308 @@
+"""Incremental rolling-window statistics over a bar stream."""
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+# Positions of the bar fields in the tuples passed to RollingStat.update
+FIELDS = {'ts': 0, 'open': 1, 'high': 2, 'low': 3, 'close': 4, 'volume': 5}
+
+BarTuple = Tuple[int, float, float, float, float, int]
+
+
+class RollingStat(ABC):
+    """Base class for a statistic updated in O(1) per bar."""
+
+    def __init__(self):
+        self.value: float = 0.0
+        self.count = 0
+
+    @abstractmethod
+    def update(self, bar: BarTuple):
+        """Fold one bar (ts, open, high, low, close, volume) into the statistic."""
+        pass
+
+    @abstractmethod
+    def reset(self):
+        """Drop all state."""
+        pass
+
+    def reset_session(self):
+        """Hook called at the start of a new trading session."""
+        pass
+
+    @property
+    def is_ready(self) -> bool:
+        """True once at least one bar has been seen."""
+        return self.count > 0
+
+    def _key(self) -> tuple:
+        """Identity used to detect conflicting registrations."""
+        return (type(self).__name__,) + tuple(sorted(
+            (k, v) for k, v in vars(self).items()
+            if k in ('field', 'window', 'alpha')
+        ))
+
+
+class _FieldStat(RollingStat):
+    """Statistic over a single bar field."""
+
+    def __init__(self, field: str):
+        super().__init__()
+        if field not in FIELDS:
+            raise ValueError(f"Unknown bar field: {field}")
+        self.field = field
+        self._index = FIELDS[field]
+
+
+class RollingSum(_FieldStat):
+    """
+    Sum of a field over the last N bars (fewer while warming up).
+
+    The window is summed as floats: unlike large ints, float temporaries are
+    recycled by the interpreter, so an update does not allocate. Integer
+    fields such as volume stay exact up to 2**53.
+    """
+
+    def __init__(self, field: str, window: int):
+        super().__init__(field)
+        if window <= 0:
+            raise ValueError(f"Window must be positive: {window}")
+        self.window = window
+        self._values = [0.0] * window
+        self._pos = 0
+        self._sum = 0.0
+
+    def update(self, bar: BarTuple):
+        x = float(bar[self._index])
+        pos = self._pos
+        self._sum += x - self._values[pos]
+        self._values[pos] = x
+        pos += 1
+        if pos == self.window:
+            pos = 0
+            # Resync once per lap so float sums cannot drift (amortized O(1))
+            self._sum = sum(self._values)
+        self._pos = pos
+        if self.count < self.window:
+            self.count += 1
+        self.value = self._sum
+
+    def reset(self):
+        self._values = [0.0] * self.window
+        self._pos = 0
+        self._sum = 0.0
+        self.count = 0
+        self.value = 0.0
+
+
+class RollingMean(RollingSum):
+    """Mean of a field over the last N bars (fewer while warming up)."""
+
+    def update(self, bar: BarTuple):
+        RollingSum.update(self, bar)  # Direct call: super() allocates a proxy per bar
+        self.value = self._sum / self.count
+
+
+class EWMA(_FieldStat):
+    """Exponentially weighted moving average, seeded with the first value."""
+
+    def __init__(self, field: str, window: int):
+        super().__init__(field)
+        if window <= 0:
+            raise ValueError(f"Window must be positive: {window}")
+        self.window = window
+        self.alpha = 2.0 / (window + 1)
+
+    def update(self, bar: BarTuple):
+        x = bar[self._index]
+        if self.count == 0:
+            self.value = float(x)
+        else:
+            self.value += self.alpha * (x - self.value)
+        self.count += 1
+
+    def reset(self):
+        self.count = 0
+        self.value = 0.0
+
+
+class RollingMax(_FieldStat):
+    """Maximum of a field over the last N bars, via a monotonic deque."""
+
+    def __init__(self, field: str, window: int):
+        super().__init__(field)
+        if window <= 0:
+            raise ValueError(f"Window must be positive: {window}")
+        self.window = window
+        self._deque: deque = deque()  # (sequence, value), values non-increasing
+        self._seq = 0
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new >= old
+
+    def update(self, bar: BarTuple):
+        x = bar[self._index]
+        dq = self._deque
+        while dq and self._dominates(x, dq[-1][1]):
+            dq.pop()
+        dq.append((self._seq, x))
+        if dq[0][0] <= self._seq - self.window:
+            dq.popleft()
+        self._seq += 1
+        if self.count < self.window:
+            self.count += 1
+        self.value = dq[0][1]
+
+    def reset(self):
+        self._deque.clear()
+        self._seq = 0
+        self.count = 0
+        self.value = 0.0
+
+
+class RollingMin(RollingMax):
+    """Minimum of a field over the last N bars, via a monotonic deque."""
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new <= old
+
+
+class ATR(RollingStat):
+    """Average True Range with Wilder smoothing (simple mean until warmed up)."""
+
+    def __init__(self, window: int = 14):
+        super().__init__()
+        if window <= 0:
+            raise ValueError(f"Window must be positive: {window}")
+        self.window = window
+        self._prev_close: Optional[float] = None
+
+    def update(self, bar: BarTuple):
+        high = bar[2]
+        low = bar[3]
+        true_range = high - low
+        if self._prev_close is not None:
+            true_range = max(true_range, abs(high - self._prev_close),
+                             abs(low - self._prev_close))
+        self._prev_close = bar[4]
+
+        if self.count < self.window:
+            self.count += 1
+            self.value += (true_range - self.value) / self.count
+        else:
+            self.value += (true_range - self.value) / self.window
+
+    def reset(self):
+        self._prev_close = None
+        self.count = 0
+        self.value = 0.0
+
+
+class VWAP(RollingStat):
+    """
+    Volume-weighted average of the typical price (H+L+C)/3.
+
+    With ``window=None`` the VWAP is cumulative and restarts on
+    reset_session(); otherwise it covers the last N bars.
+    """
+
+    def __init__(self, window: Optional[int] = None):
+        super().__init__()
+        if window is not None and window <= 0:
+            raise ValueError(f"Window must be positive: {window}")
+        self.window = window
+        self._pv = RollingSum('close', window) if window else None
+        self._vol = RollingSum('volume', window) if window else None
+        self._cum_pv = 0.0
+        self._cum_vol = 0
+
+    def update(self, bar: BarTuple):
+        volume = bar[5]
+        typical = (bar[2] + bar[3] + bar[4]) / 3.0
+        self.count += 1
+
+        if self.window:
+            # Reuse RollingSum on a synthetic (pv) close field
+            self._pv.update((0, 0.0, 0.0, 0.0, typical * volume, 0))
+            self._vol.update(bar)
+            pv, vol = self._pv.value, self._vol.value
+        else:
+            self._cum_pv += typical * volume
+            self._cum_vol += volume
+            pv, vol = self._cum_pv, self._cum_vol
+
+        self.value = pv / vol if vol else typical
+
+    def reset(self):
+        if self.window:
+            self._pv.reset()
+            self._vol.reset()
+        self._cum_pv = 0.0
+        self._cum_vol = 0
+        self.count = 0
+        self.value = 0.0
+
+    def reset_session(self):
+        if not self.window:
+            self.reset()
+
+
+class RollingStats:
+    """Registry of named rolling statistics updated once per bar."""
+
+    def __init__(self):
+        self._stats: Dict[str, RollingStat] = {}
+        self._update_fns = []
+
+    def register(self, name: str, stat: RollingStat) -> Tuple[RollingStat, bool]:
+        """
+        Register a statistic under a name.
+
+        Registering an identical statistic twice returns the existing one so
+        several consumers can share a lookback.
+
+        Returns:
+            Tuple of (registered statistic, is_new)
+        """
+        existing = self._stats.get(name)
+        if existing is not None:
+            if existing._key() != stat._key():
+                raise ValueError(f"Statistic '{name}' already registered with different parameters")
+            return existing, False
+
+        self._stats[name] = stat
+        self._update_fns.append(stat.update)
+        return stat, True
+
+    def update(self, bar: BarTuple):
+        """Update every registered statistic with a new bar (a tuple or a reused row list)."""
+        for update in self._update_fns:
+            update(bar)
+
+    def get(self, name: str) -> float:
+        """Get the current value of a statistic."""
+        return self._stats[name].value
+
+    def get_stat(self, name: str) -> RollingStat:
+        """Get a registered statistic object."""
+        return self._stats[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._stats
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    def reset_session(self):
+        """Notify every statistic that a new session started."""
+        for stat in self._stats.values():
+            stat.reset_session()
+
+    def reset(self):
+        """Reset every statistic."""
+        for stat in self._stats.values():
+            stat.reset()
+
+    def snapshot(self) -> Dict[str, float]:
+        """Current values of all statistics."""
+        return {name: stat.value for name, stat in self._stats.items()}
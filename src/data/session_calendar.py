@@ -0,0 +1,254 @@
+"""Exchange session calendar with precomputed session boundaries."""
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, Optional, Set, Tuple
+import numpy as np
+import pytz
+
+from ..utils.time_utils import NS_PER_MINUTE, from_epoch_ns, to_epoch_ns
+
+
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * l) // 433
+    month = (h + l - 7 * m + 90) // 25
+    day = (h + l - 7 * m + 33 * month + 19) % 32
+    return date(year, month, day)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """The n-th given weekday of a month (n = -1 for the last one)."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day: date) -> date:
+    """Saturday holidays are observed on Friday, Sunday ones on Monday."""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def us_equity_holidays(year: int) -> Set[date]:
+    """Full-day closures of the NYSE (and CME equity index RTH) in a year."""
+    holidays = {
+        _nth_weekday(year, 1, 0, 3),      # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),      # Washington's Birthday
+        _easter(year) - timedelta(days=2),  # Good Friday
+        _nth_weekday(year, 5, 0, -1),     # Memorial Day
+        _observed(date(year, 7, 4)),      # Independence Day
+        _nth_weekday(year, 9, 0, 1),      # Labor Day
+        _nth_weekday(year, 11, 3, 4),     # Thanksgiving
+        _observed(date(year, 12, 25)),    # Christmas
+    }
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:  # A Saturday New Year is not moved back into December
+        holidays.add(_observed(new_year))
+    if year >= 2022:
+        holidays.add(_observed(date(year, 6, 19)))  # Juneteenth
+    return holidays
+
+
+def us_equity_early_closes(year: int) -> Set[date]:
+    """Half days of the NYSE in a year (13:00 close)."""
+    early = {_nth_weekday(year, 11, 3, 4) + timedelta(days=1)}  # Day after Thanksgiving
+    july_3 = date(year, 7, 3)
+    if july_3.weekday() < 4:  # Independence Day falls Tuesday to Friday
+        early.add(july_3)
+    christmas_eve = date(year, 12, 24)
+    if christmas_eve.weekday() < 4:
+        early.add(christmas_eve)
+    return early
+
+
+class Session:
+    """Boundaries of one trading session as epoch nanoseconds."""
+
+    __slots__ = ('date', 'day_start', 'day_end', 'open', 'or_end', 'window_start',
+                 'window_end', 'close', 'early_close')
+
+    def __init__(self, session_date: date, day_start: int, day_end: int, open_ns: int,
+                 or_end: int, window_start: int, window_end: int, close: int,
+                 early_close: bool = False):
+        self.date = session_date
+        self.day_start = day_start    # Local midnight
+        self.day_end = day_end        # Next local midnight
+        self.open = open_ns
+        self.or_end = or_end
+        self.window_start = window_start
+        self.window_end = window_end
+        self.close = close
+        self.early_close = early_close
+
+    def __repr__(self):
+        early = ", early close" if self.early_close else ""
+        return f"Session({self.date}{early})"
+
+
+class SessionCalendar:
+    """
+    Trading sessions of an exchange, with holidays, half days and DST.
+
+    Each session's open, opening range end, trading window and close are
+    converted to epoch nanoseconds once (a year at a time, localized per
+    date so DST transitions are exact). Per-bar checks are then integer
+    comparisons against the current Session, and a backtest can mask out
+    whole non-session days from their dates alone.
+    """
+
+    def __init__(self, timezone: str = "America/New_York", market_open: str = "09:30",
+                 market_close: str = "16:00", or_minutes: int = 5,
+                 window_start: str = "09:30", window_end: str = "10:30",
+                 early_close: str = "13:00", holidays: bool = True,
+                 extra_holidays: Iterable[date] = ()):
+        """
+        Args:
+            timezone: Exchange timezone
+            market_open: Regular open (HH:MM)
+            market_close: Regular close (HH:MM)
+            or_minutes: Opening range length in minutes
+            window_start: Trading window start (HH:MM)
+            window_end: Trading window end (HH:MM), cut to the close on half days
+            early_close: Close on half days (HH:MM)
+            holidays: Skip weekends and US equity holidays and shorten half
+                days; False makes every date a full session
+            extra_holidays: Additional closed dates (e.g. unscheduled closures)
+        """
+        self.timezone = pytz.timezone(timezone)
+        self.market_open = time.fromisoformat(market_open)
+        self.market_close = time.fromisoformat(market_close)
+        self.or_minutes = or_minutes
+        self.window_start = time.fromisoformat(window_start)
+        self.window_end = time.fromisoformat(window_end)
+        self.early_close = time.fromisoformat(early_close)
+        self.holidays = holidays
+        self.extra_holidays = set(extra_holidays)
+
+        self._sessions: Dict[date, Session] = {}
+        self._years: Set[int] = set()
+        self._day_start = 0  # Bounds of the day session_at() last resolved
+        self._day_end = 0
+        self._day_session: Optional[Session] = None
+
+    @classmethod
+    def from_config(cls, config) -> 'SessionCalendar':
+        """Build the calendar of the bot configuration."""
+        return cls(
+            timezone=config.timezone,
+            market_open=config.market_open,
+            market_close=config.market_close,
+            or_minutes=config.opening_range_minutes,
+            window_start=config.trading_window_start,
+            window_end=config.trading_window_end,
+            early_close=config.early_close,
+            holidays=config.observe_holidays,
+            extra_holidays=config.extra_holidays
+        )
+
+    def day_bounds(self, day: date) -> Tuple[int, int]:
+        """Local midnight of a date and of the next one, as epoch nanoseconds."""
+        return self._epoch(day, time(0, 0)), self._epoch(day + timedelta(days=1), time(0, 0))
+
+    def _epoch(self, day: date, at: time) -> int:
+        return to_epoch_ns(self.timezone.localize(datetime.combine(day, at)))
+
+    def _build_year(self, year: int):
+        """Precompute every session of a year."""
+        closed: Set[date] = set()
+        early: Set[date] = set()
+        if self.holidays:
+            closed = us_equity_holidays(year)
+            early = us_equity_early_closes(year)
+
+        day = date(year, 1, 1)
+        while day.year == year:
+            if not self._is_closed(day, closed):
+                self._sessions[day] = self._make_session(day, day in early)
+            day += timedelta(days=1)
+        self._years.add(year)
+
+    def _is_closed(self, day: date, closed: Set[date]) -> bool:
+        if day in self.extra_holidays:
+            return True
+        return self.holidays and (day.weekday() >= 5 or day in closed)
+
+    def _make_session(self, day: date, early_close: bool) -> Session:
+        open_ns = self._epoch(day, self.market_open)
+        close = self._epoch(day, self.early_close if early_close else self.market_close)
+        day_start, day_end = self.day_bounds(day)
+        return Session(
+            session_date=day,
+            day_start=day_start,
+            day_end=day_end,
+            open_ns=open_ns,
+            or_end=open_ns + self.or_minutes * NS_PER_MINUTE,
+            window_start=self._epoch(day, self.window_start),
+            window_end=min(self._epoch(day, self.window_end), close),
+            close=close,
+            early_close=early_close
+        )
+
+    def session(self, day: date) -> Optional[Session]:
+        """The session on a date, or None if the exchange is closed."""
+        if day.year not in self._years:
+            self._build_year(day.year)
+        return self._sessions.get(day)
+
+    def is_session(self, day: date) -> bool:
+        return self.session(day) is not None
+
+    def session_at(self, epoch_ns: int) -> Optional[Session]:
+        """
+        The session of the local date containing a time.
+
+        Consecutive calls within one day are answered from the cached day
+        bounds, so only the first bar of a day does a date conversion.
+        """
+        if not self._day_start <= epoch_ns < self._day_end:
+            day = from_epoch_ns(epoch_ns, self.timezone).date()
+            self._day_session = self.session(day)
+            self._day_start, self._day_end = self.day_bounds(day)
+        return self._day_session
+
+    def session_mask(self, dates: np.ndarray) -> np.ndarray:
+        """
+        Flag the dates that are sessions.
+
+        Args:
+            dates: Dates as datetime64[D]
+
+        Returns:
+            Boolean array, True for session dates
+        """
+        return np.array([self.is_session(d) for d in
+                         np.asarray(dates, dtype='datetime64[D]').tolist()], dtype=bool)
+
+    def boundaries(self, dates: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Session boundaries of many dates as int64 epoch-ns columns.
+
+        Non-session dates get the regular hours so the arrays stay aligned;
+        combine with session_mask to skip them.
+
+        Returns:
+            Dict of 'open', 'or_end', 'window_start', 'window_end' and 'close'
+        """
+        fields = ('open', 'or_end', 'window_start', 'window_end', 'close')
+        dates = np.asarray(dates, dtype='datetime64[D]').tolist()
+        columns = {name: np.empty(len(dates), dtype=np.int64) for name in fields}
+        for k, day in enumerate(dates):
+            session = self.session(day) or self._make_session(day, False)
+            for name in fields:
+                columns[name][k] = getattr(session, name)
+        return columns
@@ -0,0 +1,291 @@
+"""Streaming aggregation of trade ticks into bars."""
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+import numpy as np
+import pytz
+
+from .market_data import Bar
+from ..utils.time_utils import NS_PER_MINUTE
+
+
+class BarAggregator(ABC):
+    """
+    Base class for tick-to-bar aggregators.
+
+    Ticks are passed as plain scalars (epoch ns, price, size) and folded
+    into the in-progress bar held in instance attributes, so no object is
+    allocated per tick. A Bar is only created when one is emitted to
+    ``on_bar`` or when current_bar is read. Bars are tagged with ``symbol``
+    so one callback (e.g. BotRuntime.submit) can take several instruments.
+    """
+
+    def __init__(self, on_bar: Callable[[Bar], None], timezone: str = "America/New_York",
+                 symbol: Optional[str] = None):
+        self.on_bar = on_bar
+        self.timezone = pytz.timezone(timezone)
+        self.symbol = symbol  # None for single-instrument feeds
+
+        self.ticks_processed = 0
+        self.bars_emitted = 0
+        self.late_ticks = 0
+
+        self._active = False
+        self._start = 0  # Epoch ns of the bar's first tick or interval start
+        self._open = 0.0
+        self._high = 0.0
+        self._low = 0.0
+        self._close = 0.0
+        self._volume = 0
+        self._ticks = 0
+
+    @abstractmethod
+    def on_tick(self, ts: int, price: float, size: int):
+        """Process one trade tick."""
+        pass
+
+    def on_ticks(self, ts: np.ndarray, price: np.ndarray, size: np.ndarray):
+        """Process a batch of ticks (arrays of equal length)."""
+        on_tick = self.on_tick
+        for t, p, s in zip(np.asarray(ts).tolist(), np.asarray(price).tolist(),
+                           np.asarray(size).tolist()):
+            on_tick(t, p, s)
+
+    def _begin(self, start: int, price: float, size: int):
+        """Start a new in-progress bar."""
+        self._active = True
+        self._start = start
+        self._open = self._high = self._low = self._close = price
+        self._volume = size
+        self._ticks = 1
+
+    def _fold(self, price: float, size: int):
+        """Fold a tick into the in-progress bar."""
+        if price > self._high:
+            self._high = price
+        elif price < self._low:
+            self._low = price
+        self._close = price
+        self._volume += size
+        self._ticks += 1
+
+    def _make_bar(self) -> Bar:
+        return Bar(self._start, self._open, self._high, self._low, self._close,
+                   self._volume, self.symbol, self.timezone)
+
+    def _emit(self):
+        """Emit the in-progress bar."""
+        bar = self._make_bar()
+        self._active = False
+        self.bars_emitted += 1
+        self.on_bar(bar)
+
+    @property
+    def current_bar(self) -> Optional[Bar]:
+        """The in-progress (incomplete) bar, for intrabar logic."""
+        if not self._active:
+            return None
+        return self._make_bar()
+
+    @property
+    def current_ticks(self) -> int:
+        """Number of ticks in the in-progress bar."""
+        return self._ticks if self._active else 0
+
+    def flush(self):
+        """Emit the in-progress bar, if any (e.g. at end of session)."""
+        if self._active:
+            self._emit()
+
+
+class TimeBarAggregator(BarAggregator):
+    """
+    Time bars (e.g. 1m, 5m) aligned to the interval, labeled by start time.
+
+    A bar is emitted when the first tick of a later interval arrives or when
+    advance() is called past its end. Ticks older than the in-progress bar
+    are late: with ``late_policy='drop'`` they are counted and ignored, with
+    ``'current'`` they are folded into the in-progress bar. Intervals with
+    no ticks produce no bar unless ``fill_empty`` is set, in which case flat
+    zero-volume bars at the previous close are emitted for gaps of up to
+    ``max_fill_bars`` intervals.
+    """
+
+    def __init__(self, on_bar: Callable[[Bar], None], interval_minutes: int = 1,
+                 timezone: str = "America/New_York", late_policy: str = 'drop',
+                 fill_empty: bool = False, max_fill_bars: int = 60,
+                 symbol: Optional[str] = None):
+        super().__init__(on_bar, timezone, symbol)
+        if interval_minutes <= 0:
+            raise ValueError(f"Interval must be positive: {interval_minutes}")
+        if late_policy not in ('drop', 'current'):
+            raise ValueError(f"Unknown late tick policy: {late_policy}")
+
+        self.interval = interval_minutes * NS_PER_MINUTE
+        self.late_policy = late_policy
+        self.fill_empty = fill_empty
+        self.max_fill_bars = max_fill_bars
+        self._end = 0  # End of the in-progress (or last emitted) interval
+
+    def on_tick(self, ts: int, price: float, size: int):
+        self.ticks_processed += 1
+
+        if ts < self._end:
+            if ts < self._end - self.interval or not self._active:
+                self.late_ticks += 1
+                if self.late_policy == 'drop' or not self._active:
+                    return
+            self._fold(price, size)
+            return
+
+        if self._active:
+            self._emit()
+
+        start = ts - ts % self.interval
+        if self.fill_empty and self._end:
+            self._fill_gap(start)
+        self._begin(start, price, size)
+        self._end = start + self.interval
+
+    def on_ticks(self, ts: np.ndarray, price: np.ndarray, size: np.ndarray):
+        """Process a batch of ticks with vectorized per-interval reductions."""
+        ts = np.asarray(ts, dtype=np.int64)
+        if not len(ts):
+            return
+        price = np.asarray(price, dtype=np.float64)
+        size = np.asarray(size, dtype=np.int64)
+        self.ticks_processed += len(ts)
+
+        # Interval of each tick; ticks behind the running interval are late
+        bucket = ts - ts % self.interval
+        floor = self._end - self.interval if self._end else bucket[0]
+        running = np.maximum(np.maximum.accumulate(bucket), floor)
+        late = bucket < running
+        if self._end and not self._active:
+            # Ticks for the interval already emitted can only be dropped
+            stale = bucket < self._end
+            late |= stale
+        else:
+            stale = None
+
+        n_late = int(late.sum())
+        if n_late:
+            self.late_ticks += n_late
+            if self.late_policy == 'drop':
+                keep = ~late
+            else:
+                bucket = running
+                keep = ~stale if stale is not None else slice(None)
+            bucket, price, size = bucket[keep], price[keep], size[keep]
+        if not len(bucket):
+            return
+
+        new_group = np.empty(len(bucket), dtype=bool)
+        new_group[0] = True
+        np.not_equal(bucket[1:], bucket[:-1], out=new_group[1:])
+        starts = np.flatnonzero(new_group)
+        ends = np.append(starts[1:], len(bucket))
+
+        highs = np.maximum.reduceat(price, starts).tolist()
+        lows = np.minimum.reduceat(price, starts).tolist()
+        volumes = np.add.reduceat(size, starts).tolist()
+        counts = (ends - starts).tolist()
+        opens = price[starts].tolist()
+        closes = price[ends - 1].tolist()
+        group_buckets = bucket[starts].tolist()
+
+        for i, start in enumerate(group_buckets):
+            if self._active and start == self._start:
+                # Continue the in-progress bar
+                if highs[i] > self._high:
+                    self._high = highs[i]
+                if lows[i] < self._low:
+                    self._low = lows[i]
+                self._close = closes[i]
+                self._volume += volumes[i]
+                self._ticks += counts[i]
+                continue
+
+            if self._active:
+                self._emit()
+            if self.fill_empty and self._end:
+                self._fill_gap(start)
+
+            self._active = True
+            self._start = start
+            self._open = opens[i]
+            self._high = highs[i]
+            self._low = lows[i]
+            self._close = closes[i]
+            self._volume = volumes[i]
+            self._ticks = counts[i]
+            self._end = start + self.interval
+
+    def advance(self, now: int):
+        """Emit the in-progress bar if its interval has ended by ``now`` (epoch ns)."""
+        if self._active and now >= self._end:
+            self._emit()
+
+    def _fill_gap(self, next_start: int):
+        """Emit flat bars for empty intervals before ``next_start``."""
+        missing = (next_start - self._end) // self.interval
+        if missing <= 0 or missing > self.max_fill_bars:
+            return
+
+        close = self._close
+        for k in range(missing):
+            start = self._end + k * self.interval
+            self._begin(start, close, 0)
+            self._ticks = 0
+            self._emit()
+
+
+class TickBarAggregator(BarAggregator):
+    """Bars of a fixed number of ticks, labeled by their first tick's time."""
+
+    def __init__(self, on_bar: Callable[[Bar], None], ticks_per_bar: int,
+                 timezone: str = "America/New_York", symbol: Optional[str] = None):
+        super().__init__(on_bar, timezone, symbol)
+        if ticks_per_bar <= 0:
+            raise ValueError(f"Ticks per bar must be positive: {ticks_per_bar}")
+        self.ticks_per_bar = ticks_per_bar
+
+    def on_tick(self, ts: int, price: float, size: int):
+        self.ticks_processed += 1
+        if self._active:
+            self._fold(price, size)
+        else:
+            self._begin(ts, price, size)
+
+        if self._ticks >= self.ticks_per_bar:
+            self._emit()
+
+
+class VolumeBarAggregator(BarAggregator):
+    """
+    Bars of a fixed traded volume, labeled by their first tick's time.
+
+    A tick that crosses the threshold is split: the excess starts the next
+    bar at the same price, so every emitted bar has exactly ``bar_volume``.
+    """
+
+    def __init__(self, on_bar: Callable[[Bar], None], bar_volume: int,
+                 timezone: str = "America/New_York", symbol: Optional[str] = None):
+        super().__init__(on_bar, timezone, symbol)
+        if bar_volume <= 0:
+            raise ValueError(f"Bar volume must be positive: {bar_volume}")
+        self.bar_volume = bar_volume
+
+    def on_tick(self, ts: int, price: float, size: int):
+        self.ticks_processed += 1
+        if self._active:
+            self._fold(price, size)
+        else:
+            self._begin(ts, price, size)
+
+        while self._volume >= self.bar_volume:
+            excess = self._volume - self.bar_volume
+            self._volume = self.bar_volume
+            self._emit()
+            if not excess:
+                break
+            self._begin(ts, price, excess)
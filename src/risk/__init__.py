@@ -1,5 +1,10 @@
 """Risk management modules."""
 from .order_manager import OrderManager
 from .risk_manager import RiskManager
+from .trailing_stop import TrailingStop, TRAILING_METHODS
+from .position_sizing import SessionSizingCache, TradeStats, SIZING_METHODS, size_position
 
-__all__ = ['OrderManager', 'RiskManager']
+__all__ = [
+    'OrderManager', 'RiskManager', 'TrailingStop', 'TRAILING_METHODS',
+    'SessionSizingCache', 'TradeStats', 'SIZING_METHODS', 'size_position'
+]
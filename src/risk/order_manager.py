@@ -3,22 +3,35 @@ from typing import Optional, Dict
 from datetime import datetime
 
 from ..data.broker_interface import (
-    BrokerInterface, Order, OrderSide, OrderType, OrderStatus
+    BracketOrder, BrokerInterface, Order, OrderSide, OrderType, OrderStatus
 )
+from ..data.instruments import get_instrument
 from ..strategy.breakout_detector import BreakoutDirection, BreakoutSignal
 from ..strategy.opening_range import OpeningRange
 from ..utils.logger import Logger
+from .trailing_stop import TrailingStop
 
 
 class OrderManager:
     """Manages order creation and execution."""
 
     def __init__(self, broker: BrokerInterface, opening_range: OpeningRange,
-                 symbol: str = "ES", point_value: float = 50.0):
+                 symbol: str = "ES", point_value: Optional[float] = None,
+                 trailing_stop: Optional[TrailingStop] = None):
+        """
+        Args:
+            broker: Broker to send orders to
+            opening_range: Opening range the stops are placed at
+            symbol: Instrument symbol
+            point_value: Dollars per point (default: from the instrument spec)
+            trailing_stop: Trails the protective stop when given
+        """
         self.broker = broker
         self.opening_range = opening_range
         self.symbol = symbol
-        self.point_value = point_value
+        self.point_value = point_value if point_value is not None else \
+            get_instrument(symbol).point_value
+        self.trailing_stop = trailing_stop
         self.logger = Logger.get_logger()
 
         self.entry_order: Optional[Order] = None
@@ -53,33 +66,29 @@ class OrderManager:
     def _create_long_orders(self, signal: BreakoutSignal, quantity: int,
                            risk_reward_ratio: float) -> bool:
         """Create orders for a long (bullish) breakout."""
-        # Entry: Market order to go long
+        entry_price = signal.price
+
+        # Stop: Set at OR low (opposite extreme)
+        stop_price = self.opening_range.get_low()
+        risk = entry_price - stop_price
+
+        # Target: Based on risk/reward ratio
+        target_price = entry_price + (risk * risk_reward_ratio)
+
+        # Entry: Market order to go long, bracketed by the stop and target
         entry_order = Order(
             symbol=self.symbol,
             side=OrderSide.BUY,
             quantity=quantity,
             order_type=OrderType.MARKET
         )
-
-        if not self.broker.submit_order(entry_order):
-            self.logger.error("Failed to submit entry order")
+        if not self._submit_bracket(entry_order, entry_price, stop_price, target_price):
             return False
 
-        self.entry_order = entry_order
-        self.entry_price = signal.price
-
-        # Stop: Set at OR low (opposite extreme)
-        self.stop_price = self.opening_range.get_low()
-        risk = self.entry_price - self.stop_price
-
         self.logger.info(
             f"Long entry at {self.entry_price:.2f}, stop at {self.stop_price:.2f}, "
             f"risk: {risk:.2f} points (${risk * self.point_value:.2f})"
         )
-
-        # Target: Based on risk/reward ratio
-        self.target_price = self.entry_price + (risk * risk_reward_ratio)
-
         self.logger.info(
             f"Target set at {self.target_price:.2f}, "
             f"reward: {risk * risk_reward_ratio:.2f} points "
@@ -91,33 +100,29 @@ class OrderManager:
     def _create_short_orders(self, signal: BreakoutSignal, quantity: int,
                             risk_reward_ratio: float) -> bool:
         """Create orders for a short (bearish) breakout."""
-        # Entry: Market order to go short
+        entry_price = signal.price
+
+        # Stop: Set at OR high (opposite extreme)
+        stop_price = self.opening_range.get_high()
+        risk = stop_price - entry_price
+
+        # Target: Based on risk/reward ratio
+        target_price = entry_price - (risk * risk_reward_ratio)
+
+        # Entry: Market order to go short, bracketed by the stop and target
         entry_order = Order(
             symbol=self.symbol,
             side=OrderSide.SELL,
             quantity=quantity,
             order_type=OrderType.MARKET
         )
-
-        if not self.broker.submit_order(entry_order):
-            self.logger.error("Failed to submit entry order")
+        if not self._submit_bracket(entry_order, entry_price, stop_price, target_price):
             return False
 
-        self.entry_order = entry_order
-        self.entry_price = signal.price
-
-        # Stop: Set at OR high (opposite extreme)
-        self.stop_price = self.opening_range.get_high()
-        risk = self.stop_price - self.entry_price
-
         self.logger.info(
             f"Short entry at {self.entry_price:.2f}, stop at {self.stop_price:.2f}, "
             f"risk: {risk:.2f} points (${risk * self.point_value:.2f})"
         )
-
-        # Target: Based on risk/reward ratio
-        self.target_price = self.entry_price - (risk * risk_reward_ratio)
-
         self.logger.info(
             f"Target set at {self.target_price:.2f}, "
             f"reward: {risk * risk_reward_ratio:.2f} points "
@@ -126,15 +131,66 @@ class OrderManager:
 
         return True
 
+    def _submit_bracket(self, entry_order: Order, entry_price: float,
+                        stop_price: float, target_price: float) -> bool:
+        """
+        Send the entry with its stop and target as one bracket.
+
+        The broker works the stop and target as an OCO pair once the entry
+        fills, so an exit fires as soon as price reaches either level.
+        """
+        bracket = BracketOrder(entry_order, stop_price, target_price)
+        if not self.broker.submit_bracket(bracket):
+            self.logger.error("Failed to submit entry order")
+            return False
+
+        self.entry_order = bracket.entry
+        self.stop_order = bracket.stop
+        self.target_order = bracket.target
+        self.entry_price = entry_price
+        self.stop_price = stop_price
+        self.target_price = target_price
+
+        if self.trailing_stop:
+            self.trailing_stop.start(entry_order.side == OrderSide.BUY, entry_price,
+                                     stop_price, self.opening_range.get_range())
+        return True
+
+    def update_trailing_stop(self, high: float, low: float) -> bool:
+        """
+        Trail the protective stop with the latest bar (or tick: high == low).
+
+        The broker's stop order is amended only when the level moves by at
+        least one tick.
+
+        Returns:
+            True if the stop order was amended
+        """
+        if not self.trailing_stop or not self.stop_order or \
+                self.stop_order.status != OrderStatus.SUBMITTED:
+            return False
+
+        new_stop = self.trailing_stop.update(high, low)
+        if new_stop is None:
+            return False
+
+        if not self.broker.modify_order(self.stop_order.order_id, stop_price=new_stop):
+            self.logger.warning(f"Failed to move stop to {new_stop:.2f}")
+            return False
+
+        self.logger.info(f"Stop moved from {self.stop_price:.2f} to {new_stop:.2f}")
+        self.stop_price = new_stop
+        return True
+
     def check_exit_conditions(self, current_price: float) -> Optional[str]:
         """
-        Check if stop loss or target has been hit.
+        Check if the broker has filled the stop loss or target.
 
         Args:
             current_price: Current market price
 
         Returns:
-            Exit reason if position should be closed, None otherwise
+            Exit reason if the position was closed, None otherwise
         """
         if not self.entry_order or not self.entry_price:
             return None
@@ -143,19 +199,10 @@ class OrderManager:
         if self.entry_order.status != OrderStatus.FILLED:
             return None
 
-        # For long positions
-        if self.entry_order.side == OrderSide.BUY:
-            if current_price <= self.stop_price:
-                return "stop_loss"
-            elif current_price >= self.target_price:
-                return "target"
-
-        # For short positions
-        elif self.entry_order.side == OrderSide.SELL:
-            if current_price >= self.stop_price:
-                return "stop_loss"
-            elif current_price <= self.target_price:
-                return "target"
+        if self.stop_order.status == OrderStatus.FILLED:
+            return "stop_loss"
+        if self.target_order.status == OrderStatus.FILLED:
+            return "target"
 
         return None
 
@@ -173,21 +220,33 @@ class OrderManager:
             self.logger.warning("No open position to close")
             return False
 
-        # Create exit order (opposite side of entry)
-        exit_side = OrderSide.SELL if self.entry_order.side == OrderSide.BUY else OrderSide.BUY
+        # A stop or target fill at the broker has already closed the position
+        exit_filled = any(order and order.status == OrderStatus.FILLED
+                          for order in (self.stop_order, self.target_order))
 
-        exit_order = Order(
-            symbol=self.symbol,
-            side=exit_side,
-            quantity=self.entry_order.quantity,
-            order_type=OrderType.MARKET
-        )
+        # Cancel whichever protective order is still working
+        for order in (self.stop_order, self.target_order):
+            if order and order.status == OrderStatus.SUBMITTED:
+                self.broker.cancel_order(order.order_id)
 
-        if not self.broker.submit_order(exit_order):
-            self.logger.error("Failed to submit exit order")
-            return False
+        if not exit_filled:
+            # Create exit order (opposite side of entry)
+            exit_side = OrderSide.SELL if self.entry_order.side == OrderSide.BUY else OrderSide.BUY
+
+            exit_order = Order(
+                symbol=self.symbol,
+                side=exit_side,
+                quantity=self.entry_order.quantity,
+                order_type=OrderType.MARKET
+            )
+
+            if not self.broker.submit_order(exit_order):
+                self.logger.error("Failed to submit exit order")
+                return False
 
         self.logger.info(f"Position closed: {reason}")
+        if self.trailing_stop:
+            self.trailing_stop.stop()
 
         # Reset orders
         self.entry_order = None
@@ -224,7 +283,7 @@ class OrderManager:
     def cancel_all_orders(self):
         """Cancel all pending orders."""
         for order in [self.entry_order, self.stop_order, self.target_order]:
-            if order and order.order_id:
+            if order and order.order_id and order.status == OrderStatus.SUBMITTED:
                 self.broker.cancel_order(order.order_id)
 
         self.logger.info("All orders cancelled")
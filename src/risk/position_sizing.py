@@ -0,0 +1,196 @@
+"""Position sizing rules and their per-session inputs."""
+from collections import deque
+from datetime import date
+from typing import Deque, Dict, List, Optional
+
+import numpy as np
+
+SIZING_METHODS = ('fixed', 'kelly', 'volatility_based')
+
+
+class TradeStats:
+    """Win rate and payoff ratio over the last N closed trades, updated in O(1)."""
+
+    def __init__(self, lookback: int = 50):
+        self.lookback = lookback
+        self._pnls: Deque[float] = deque()
+        self.wins = 0
+        self.win_total = 0.0
+        self.loss_total = 0.0  # Sum of losses as a positive number
+
+    @property
+    def count(self) -> int:
+        return len(self._pnls)
+
+    def add(self, pnl: float):
+        """Fold in one closed trade, dropping the oldest beyond the lookback."""
+        self._pnls.append(pnl)
+        self._fold(pnl, 1)
+        if len(self._pnls) > self.lookback:
+            self._fold(self._pnls.popleft(), -1)
+
+    def _fold(self, pnl: float, sign: int):
+        if pnl > 0:
+            self.wins += sign
+            self.win_total += sign * pnl
+        else:
+            self.loss_total -= sign * pnl
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / len(self._pnls) if self._pnls else 0.0
+
+    @property
+    def payoff_ratio(self) -> float:
+        """Average win divided by average loss (0 if either is missing)."""
+        losses = len(self._pnls) - self.wins
+        if not self.wins or not losses or self.loss_total <= 0:
+            return 0.0
+        return (self.win_total / self.wins) / (self.loss_total / losses)
+
+    def kelly_fraction(self) -> float:
+        """Kelly criterion f* = W - (1 - W) / R (negative means no edge)."""
+        payoff = self.payoff_ratio
+        if payoff <= 0:
+            return 0.0
+        win_rate = self.win_rate
+        return win_rate - (1.0 - win_rate) / payoff
+
+
+class SessionSizingCache:
+    """
+    Sizing inputs prepared before each session, so sizing is a lookup.
+
+    Per symbol it keeps the ATR of daily true ranges over the previous
+    ``volatility_lookback`` sessions (keyed by session date, computed from
+    earlier sessions only) and rolling TradeStats of its closed trades.
+    History can be preloaded from a BarStore or bar columns; a running bot
+    folds in each session as it completes.
+    """
+
+    def __init__(self, volatility_lookback: int = 14, trade_lookback: int = 50):
+        """
+        Args:
+            volatility_lookback: Sessions in the daily ATR
+            trade_lookback: Closed trades in the win rate / payoff window
+        """
+        self.volatility_lookback = volatility_lookback
+        self.trade_lookback = trade_lookback
+
+        self.atr: Dict[str, Dict[date, float]] = {}  # symbol -> session date -> ATR points
+        self.latest_atr: Dict[str, float] = {}
+        self.trade_stats: Dict[str, TradeStats] = {}
+
+        self._ranges: Dict[str, Deque[float]] = {}
+        self._last_close: Dict[str, float] = {}
+        self._last_session: Dict[str, date] = {}
+        self._trades_seen = 0
+
+    def add_session(self, symbol: str, session_date: date, high: float, low: float,
+                    close: float):
+        """Fold a completed session into the symbol's daily ATR."""
+        last = self._last_session.get(symbol)
+        if last is not None and session_date <= last:
+            return  # Already folded (e.g. preloaded from the store)
+
+        ranges = self._ranges.get(symbol)
+        if ranges is None:
+            ranges = self._ranges[symbol] = deque(maxlen=self.volatility_lookback)
+
+        prev_close = self._last_close.get(symbol)
+        if prev_close is not None:
+            high = max(high, prev_close)
+            low = min(low, prev_close)
+        ranges.append(high - low)
+
+        self._last_close[symbol] = close
+        self._last_session[symbol] = session_date
+        if len(ranges) == self.volatility_lookback:
+            self.latest_atr[symbol] = sum(ranges) / len(ranges)
+
+    def load_sessions(self, symbol: str, ts: np.ndarray, high: np.ndarray, low: np.ndarray,
+                      close: np.ndarray, timezone: str):
+        """
+        Precompute the ATR for every session of a bar history.
+
+        Args:
+            symbol: Instrument symbol
+            ts: Bar timestamps as int64 epoch nanoseconds (UTC)
+            high, low, close: Bar columns
+            timezone: Timezone that defines the session date
+        """
+        from ..backtest.vectorized import SessionLayout
+
+        layout = SessionLayout(ts, timezone)
+        if not layout.n_days:
+            return
+        starts = layout.starts
+        session_high = np.maximum.reduceat(np.asarray(high, dtype=np.float64), starts)
+        session_low = np.minimum.reduceat(np.asarray(low, dtype=np.float64), starts)
+        session_close = np.asarray(close, dtype=np.float64)[np.append(starts[1:], layout.n) - 1]
+        session_dates = layout.day[starts].astype('datetime64[D]').tolist()
+
+        by_date = self.atr.setdefault(symbol, {})
+        for k, session_date in enumerate(session_dates):
+            atr = self.latest_atr.get(symbol)
+            if atr is not None:
+                by_date.setdefault(session_date, atr)
+            self.add_session(symbol, session_date, float(session_high[k]),
+                             float(session_low[k]), float(session_close[k]))
+
+    def load_store(self, store, symbol: str, timezone: str, start: Optional[date] = None,
+                   end: Optional[date] = None):
+        """Precompute the ATR for the stored sessions of a symbol."""
+        records = store.load_range(symbol, start, end)
+        self.load_sessions(symbol, records['ts'], records['high'], records['low'],
+                           records['close'], timezone)
+
+    def get_atr(self, symbol: str, session_date: Optional[date] = None) -> Optional[float]:
+        """ATR for a session (the latest one if the date was not precomputed)."""
+        if session_date is not None:
+            atr = self.atr.get(symbol, {}).get(session_date)
+            if atr is not None:
+                return atr
+        return self.latest_atr.get(symbol)
+
+    def get_trade_stats(self, symbol: str) -> TradeStats:
+        stats = self.trade_stats.get(symbol)
+        if stats is None:
+            stats = self.trade_stats[symbol] = TradeStats(self.trade_lookback)
+        return stats
+
+    def add_trade(self, symbol: str, pnl: float):
+        self.get_trade_stats(symbol).add(pnl)
+
+    def sync_trades(self, trade_history: List[Dict]):
+        """Fold in trades appended to a broker's history since the last call."""
+        for trade in trade_history[self._trades_seen:]:
+            self.add_trade(trade['symbol'], trade['pnl'])
+        self._trades_seen = len(trade_history)
+
+
+def size_position(method: str, account_balance: float, risk_points: float,
+                  point_value: float, risk_percent: float, max_position_size: int,
+                  atr: Optional[float] = None, trade_stats: Optional[TradeStats] = None,
+                  kelly_fraction: float = 0.5, kelly_min_trades: int = 20,
+                  atr_multiple: float = 1.0) -> int:
+    """
+    Contracts to trade under a sizing method.
+
+    'fixed' risks ``risk_percent`` of the balance over the stop distance.
+    'kelly' risks ``kelly_fraction`` times the Kelly fraction of the balance
+    over the stop distance, once ``kelly_min_trades`` trades are known.
+    'volatility_based' risks ``risk_percent`` of the balance over
+    ``atr_multiple`` daily ATRs. Without enough inputs the fixed rule
+    applies. The result is clamped to [1, max_position_size].
+    """
+    risk_dollars = account_balance * risk_percent
+    risk_per_contract = risk_points * point_value
+
+    if method == 'kelly' and trade_stats is not None and trade_stats.count >= kelly_min_trades:
+        risk_dollars = account_balance * max(trade_stats.kelly_fraction(), 0.0) * kelly_fraction
+    elif method == 'volatility_based' and atr:
+        risk_per_contract = atr * atr_multiple * point_value
+
+    position_size = int(risk_dollars / risk_per_contract) if risk_per_contract > 0 else 1
+    return max(min(position_size, max_position_size), 1)
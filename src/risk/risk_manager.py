@@ -1,9 +1,10 @@
 """Risk management system."""
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
 
 from ..data.broker_interface import BrokerInterface
 from ..utils.logger import Logger
+from .position_sizing import SIZING_METHODS, SessionSizingCache, size_position
 
 
 class RiskManager:
@@ -11,25 +12,61 @@ class RiskManager:
 
     def __init__(self, broker: BrokerInterface, max_position_size: int = 1,
                  max_daily_loss: float = 500.0, max_daily_trades: int = 3,
-                 point_value: float = 50.0):
+                 point_value: Optional[float] = None, sizing_method: str = 'fixed',
+                 sizing_cache: Optional[SessionSizingCache] = None,
+                 kelly_fraction: float = 0.5, kelly_min_trades: int = 20,
+                 atr_multiple: float = 1.0):
+        """
+        Args:
+            broker: Broker whose account and positions are checked
+            max_position_size: Maximum contracts per trade
+            max_daily_loss: Account daily loss limit in dollars
+            max_daily_trades: Trade limit per symbol and day
+            point_value: Default dollars per point for position sizing
+            sizing_method: 'fixed', 'kelly' or 'volatility_based'
+            sizing_cache: Per-session ATR and trade statistics (required
+                for the kelly and volatility_based methods)
+            kelly_fraction: Fraction of the full Kelly bet to risk
+            kelly_min_trades: Trades needed before Kelly sizing applies
+            atr_multiple: Daily ATRs of risk per contract (volatility_based)
+        """
+        if sizing_method not in SIZING_METHODS:
+            raise ValueError(f"Unknown position sizing method: {sizing_method}")
+
         self.broker = broker
         self.max_position_size = max_position_size
         self.max_daily_loss = max_daily_loss
         self.max_daily_trades = max_daily_trades
-        self.point_value = point_value
+        self.point_value = point_value  # Default for calculate_position_size
+        self.sizing_method = sizing_method
+        self.sizing_cache = sizing_cache if sizing_cache is not None else SessionSizingCache()
+        self.kelly_fraction = kelly_fraction
+        self.kelly_min_trades = kelly_min_trades
+        self.atr_multiple = atr_multiple
         self.logger = Logger.get_logger()
 
         self.daily_pnl = 0.0
         self.trades_today = 0
         self.last_reset_date: Optional[datetime] = None
+        self.halt_reason: Optional[str] = None  # Set by an external (e.g. account-wide) limit
 
-    def check_can_trade(self) -> tuple[bool, str]:
+    def check_can_trade(self, symbol: Optional[str] = None) -> tuple[bool, str]:
         """
         Check if trading is allowed based on risk parameters.
 
+        The daily loss limit applies to the whole account. With a symbol,
+        the trade limit and the open position check apply to that symbol
+        only, so instruments trade independently.
+
+        Args:
+            symbol: Instrument about to trade (None checks the whole account)
+
         Returns:
             Tuple of (can_trade, reason)
         """
+        if self.halt_reason:
+            return False, f"Trading halted: {self.halt_reason}"
+
         # Check daily loss limit
         if hasattr(self.broker, 'get_daily_pnl'):
             current_pnl = self.broker.get_daily_pnl()
@@ -38,58 +75,93 @@ class RiskManager:
 
         # Check daily trade limit
         if hasattr(self.broker, 'get_total_trades'):
-            trades = self.broker.get_total_trades()
+            trades = self.broker.get_total_trades(symbol)
             if trades >= self.max_daily_trades:
                 return False, f"Daily trade limit reached: {trades} trades"
 
         # Check if we already have a position
-        positions = self.broker.get_all_positions()
-        if positions:
+        if symbol is not None:
+            has_position = self.broker.get_position(symbol) is not None
+        else:
+            has_position = self.broker.has_positions()
+        if has_position:
             return False, "Position already open"
 
         return True, "OK"
 
     def calculate_position_size(self, account_balance: float, risk_points: float,
-                                risk_percent: float = 0.02) -> int:
+                                risk_percent: float = 0.02,
+                                point_value: Optional[float] = None,
+                                symbol: Optional[str] = None,
+                                session_date: Optional[date] = None) -> int:
         """
         Calculate position size based on risk parameters.
 
+        The kelly and volatility_based methods read their inputs from the
+        sizing cache (an O(1) lookup) and fall back to the fixed rule until
+        enough history has been seen.
+
         Args:
             account_balance: Current account balance
             risk_points: Risk per contract in points
             risk_percent: Percentage of account to risk (default 2%)
+            point_value: Dollars per point of the traded instrument
+                (defaults to the manager's point_value)
+            symbol: Traded symbol (selects the cached inputs)
+            session_date: Current session (selects the cached ATR)
 
         Returns:
             Number of contracts to trade
         """
+        if point_value is None:
+            point_value = self.point_value
+        if point_value is None:
+            raise ValueError("No point value given for position sizing")
+
         if risk_points <= 0:
             self.logger.warning("Invalid risk points for position sizing")
             return 1
 
-        # Calculate max risk in dollars
-        max_risk_dollars = account_balance * risk_percent
-
-        # Calculate position size
-        risk_per_contract = risk_points * self.point_value
-        position_size = int(max_risk_dollars / risk_per_contract)
-
-        # Apply max position size limit
-        position_size = min(position_size, self.max_position_size)
-        position_size = max(position_size, 1)  # Minimum 1 contract
+        atr = None
+        trade_stats = None
+        if self.sizing_method == 'volatility_based' and symbol is not None:
+            atr = self.sizing_cache.get_atr(symbol, session_date)
+        elif self.sizing_method == 'kelly' and symbol is not None:
+            trade_stats = self.sizing_cache.get_trade_stats(symbol)
+
+        # Limited to max_position_size, minimum 1 contract
+        position_size = size_position(
+            self.sizing_method, account_balance, risk_points, point_value, risk_percent,
+            self.max_position_size, atr=atr, trade_stats=trade_stats,
+            kelly_fraction=self.kelly_fraction, kelly_min_trades=self.kelly_min_trades,
+            atr_multiple=self.atr_multiple
+        )
 
         self.logger.info(
-            f"Position sizing: Account=${account_balance:.2f}, "
-            f"Risk={risk_points:.2f} points (${risk_per_contract:.2f}), "
-            f"Max risk=${max_risk_dollars:.2f}, Position size={position_size} contracts"
+            f"Position sizing ({self.sizing_method}): Account=${account_balance:.2f}, "
+            f"Risk={risk_points:.2f} points (${risk_points * point_value:.2f}), "
+            f"Position size={position_size} contracts"
         )
 
         return position_size
 
+    def halt(self, reason: str):
+        """Block new trades until resume() or the next daily reset."""
+        self.halt_reason = reason
+        self.logger.warning(f"Trading halted: {reason}")
+
+    def resume(self):
+        """Lift a halt."""
+        if self.halt_reason:
+            self.logger.info(f"Trading resumed (was halted: {self.halt_reason})")
+        self.halt_reason = None
+
     def reset_daily_stats(self):
         """Reset daily statistics."""
         self.daily_pnl = 0.0
         self.trades_today = 0
         self.last_reset_date = datetime.now()
+        self.halt_reason = None
 
         if hasattr(self.broker, 'reset_daily_stats'):
             self.broker.reset_daily_stats()
@@ -103,8 +175,8 @@ class RiskManager:
 
         return current_time.date() != self.last_reset_date.date()
 
-    def get_risk_status(self) -> dict:
-        """Get current risk status."""
+    def get_risk_status(self, symbol: Optional[str] = None) -> dict:
+        """Get current risk status (trade counts for one symbol if given)."""
         status = {
             'max_position_size': self.max_position_size,
             'max_daily_loss': self.max_daily_loss,
@@ -116,10 +188,10 @@ class RiskManager:
             status['remaining_loss_limit'] = self.max_daily_loss + self.broker.get_daily_pnl()
 
         if hasattr(self.broker, 'get_total_trades'):
-            status['trades_today'] = self.broker.get_total_trades()
-            status['remaining_trades'] = self.max_daily_trades - self.broker.get_total_trades()
+            status['trades_today'] = self.broker.get_total_trades(symbol)
+            status['remaining_trades'] = self.max_daily_trades - self.broker.get_total_trades(symbol)
 
-        can_trade, reason = self.check_can_trade()
+        can_trade, reason = self.check_can_trade(symbol)
         status['can_trade'] = can_trade
         status['reason'] = reason
 
@@ -0,0 +1,116 @@
+"""Trailing stop levels for an open position."""
+import math
+from typing import Optional
+
+from ..data.rolling_stats import RollingStat
+
+TRAILING_METHODS = ('fixed', 'atr', 'or_range')
+
+
+class TrailingStop:
+    """
+    Ratchet a protective stop behind the best price reached.
+
+    The trail distance is ``distance`` points ('fixed'), ``distance`` times
+    the current ATR ('atr') or ``distance`` times the opening range height
+    ('or_range'). Once the position has gained ``breakeven_r`` times its
+    initial risk, the stop is also lifted to the entry price. The stop only
+    moves in the position's favour, and a new level is reported only when it
+    moves by at least one tick, so each update is O(1) and the broker sees
+    as few amendments as possible.
+    """
+
+    def __init__(self, method: str = 'fixed', distance: float = 4.0, tick_size: float = 0.25,
+                 breakeven_r: float = 0.0, atr: Optional[RollingStat] = None):
+        """
+        Args:
+            method: 'fixed', 'atr' or 'or_range'
+            distance: Points, ATR multiple or opening range fraction (per method)
+            tick_size: Minimum price increment; stops are rounded to it
+            breakeven_r: Profit in multiples of initial risk that moves the
+                stop to entry (0 disables)
+            atr: Rolling ATR of the instrument (required for 'atr')
+        """
+        if method not in TRAILING_METHODS:
+            raise ValueError(f"Unknown trailing stop method: {method}")
+        if method == 'atr' and atr is None:
+            raise ValueError("ATR trailing stop needs an ATR statistic")
+
+        self.method = method
+        self.distance = distance
+        self.tick_size = tick_size
+        self.breakeven_r = breakeven_r
+        self.atr = atr
+
+        self.is_long = True
+        self.entry_price = 0.0
+        self.stop_price: Optional[float] = None
+        self.best_price = 0.0
+        self._offset = 0.0  # Trail distance in points (fixed/or_range)
+        self._breakeven_price: Optional[float] = None
+
+    @property
+    def active(self) -> bool:
+        return self.stop_price is not None
+
+    def start(self, is_long: bool, entry_price: float, stop_price: float,
+              or_range: float = 0.0):
+        """
+        Begin trailing a new position.
+
+        Args:
+            is_long: Position direction
+            entry_price: Entry price
+            stop_price: Initial protective stop
+            or_range: Opening range height in points (for 'or_range')
+        """
+        self.is_long = is_long
+        self.entry_price = entry_price
+        self.stop_price = stop_price
+        self.best_price = entry_price
+        self._offset = self.distance * or_range if self.method == 'or_range' else self.distance
+
+        risk = abs(entry_price - stop_price)
+        self._breakeven_price = None
+        if self.breakeven_r > 0 and risk > 0:
+            gain = self.breakeven_r * risk
+            self._breakeven_price = entry_price + gain if is_long else entry_price - gain
+
+    def stop(self):
+        """Stop trailing (position closed)."""
+        self.stop_price = None
+
+    def update(self, high: float, low: float) -> Optional[float]:
+        """
+        Advance the trail with a bar's range (or a tick, with high == low).
+
+        Returns:
+            The new stop level if it moved by at least one tick, else None
+        """
+        if self.stop_price is None:
+            return None
+
+        if self.is_long:
+            if high > self.best_price:
+                self.best_price = high
+        elif low < self.best_price:
+            self.best_price = low
+
+        offset = self.distance * self.atr.value if self.method == 'atr' else self._offset
+        tick = self.tick_size
+        if self.is_long:
+            level = math.floor((self.best_price - offset) / tick + 1e-9) * tick
+            if self._breakeven_price is not None and self.best_price >= self._breakeven_price:
+                level = max(level, self.entry_price)
+            moved = level - self.stop_price
+        else:
+            level = math.ceil((self.best_price + offset) / tick - 1e-9) * tick
+            if self._breakeven_price is not None and self.best_price <= self._breakeven_price:
+                level = min(level, self.entry_price)
+            moved = self.stop_price - level
+
+        if moved < tick - 1e-9:
+            return None
+
+        self.stop_price = round(level, 10)
+        return self.stop_price
@@ -1,9 +1,11 @@
 """Breakout detection logic."""
+import logging
 from datetime import datetime
 from typing import Optional
 from enum import Enum
 
 from ..data.market_data import MarketDataHandler, Bar
+from ..data.rolling_stats import RollingMean
 from .opening_range import OpeningRange
 from ..utils.logger import Logger
 
@@ -18,6 +20,8 @@ class BreakoutDirection(Enum):
 class BreakoutSignal:
     """Represents a breakout signal."""
 
+    __slots__ = ('direction', 'price', 'timestamp', 'volume')
+
     def __init__(self, direction: BreakoutDirection, price: float,
                  timestamp: datetime, volume: int):
         self.direction = direction
@@ -43,6 +47,12 @@ class BreakoutDetector:
         self.volume_lookback = volume_lookback
         self.logger = Logger.get_logger()
 
+        # Average volume is maintained incrementally by the market data handler
+        self.avg_volume_stat = f"volume_sma_{volume_lookback}"
+        self.market_data.register_stat(
+            self.avg_volume_stat, RollingMean('volume', volume_lookback)
+        )
+
         self.last_breakout: Optional[BreakoutSignal] = None
         self.breakout_occurred = False
 
@@ -72,10 +82,12 @@ class BreakoutDetector:
         if self.opening_range.is_above_high(current_price, self.min_breakout_points):
             if require_volume_confirmation:
                 if not self._confirm_volume(current_volume):
-                    self.logger.debug(
-                        f"Bullish breakout detected but volume insufficient: "
-                        f"{current_volume} vs avg {self.market_data.get_average_volume(self.volume_lookback):.0f}"
-                    )
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug(
+                            f"Bullish breakout detected but volume insufficient: "
+                            f"{current_volume} vs avg "
+                            f"{self.market_data.get_stat(self.avg_volume_stat):.0f}"
+                        )
                     return None
 
             signal = BreakoutSignal(
@@ -98,10 +110,12 @@ class BreakoutDetector:
         elif self.opening_range.is_below_low(current_price, self.min_breakout_points):
             if require_volume_confirmation:
                 if not self._confirm_volume(current_volume):
-                    self.logger.debug(
-                        f"Bearish breakout detected but volume insufficient: "
-                        f"{current_volume} vs avg {self.market_data.get_average_volume(self.volume_lookback):.0f}"
-                    )
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug(
+                            f"Bearish breakout detected but volume insufficient: "
+                            f"{current_volume} vs avg "
+                            f"{self.market_data.get_stat(self.avg_volume_stat):.0f}"
+                        )
                     return None
 
             signal = BreakoutSignal(
@@ -132,7 +146,7 @@ class BreakoutDetector:
         Returns:
             True if volume exceeds threshold
         """
-        avg_volume = self.market_data.get_average_volume(self.volume_lookback)
+        avg_volume = self.market_data.get_stat(self.avg_volume_stat)
 
         if avg_volume == 0:
             self.logger.warning("No historical volume data available")
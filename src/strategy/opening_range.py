@@ -1,34 +1,106 @@
 """Opening Range calculation and management."""
-from datetime import datetime, time, timedelta
-from typing import Optional, Tuple
+from datetime import datetime
+from typing import Optional, Tuple, Union
 import pytz
 
-from ..data.market_data import MarketDataHandler
+from ..data.market_data import MarketDataHandler, Bar
+from ..data.session_calendar import SessionCalendar
 from ..utils.logger import Logger
+from ..utils.time_utils import from_epoch_ns, to_epoch_ns
 
 
 class OpeningRange:
     """Manages opening range calculation and tracking."""
 
     def __init__(self, market_data: MarketDataHandler, or_minutes: int = 5,
-                 timezone: str = "America/New_York"):
+                 timezone: str = "America/New_York",
+                 calendar: Optional[SessionCalendar] = None):
+        """
+        Args:
+            market_data: Market data of the instrument
+            or_minutes: Opening range length in minutes
+            timezone: Timezone of naive bar timestamps
+            calendar: Session calendar giving each day's open and OR end
+                (default: every date opens at 09:30)
+        """
         self.market_data = market_data
         self.or_minutes = or_minutes
         self.timezone = pytz.timezone(timezone)
+        self.calendar = calendar or SessionCalendar(timezone, or_minutes=or_minutes,
+                                                    holidays=False)
         self.logger = Logger.get_logger()
 
         self.or_high: Optional[float] = None
         self.or_low: Optional[float] = None
         self.or_start_time: Optional[datetime] = None
         self.or_end_time: Optional[datetime] = None
+        self.or_volume: int = 0
         self.is_calculated = False
 
-    def calculate(self, current_time: datetime) -> bool:
+        # Streaming accumulator for the current session's OR window
+        self._acc_date = None
+        self._acc_high = float('-inf')
+        self._acc_low = float('inf')
+        self._acc_volume = 0
+        self._acc_bars = 0
+
+    def _to_ns(self, timestamp: Union[datetime, int]) -> int:
+        if not isinstance(timestamp, datetime):
+            return timestamp
+        if timestamp.tzinfo is None:
+            timestamp = self.timezone.localize(timestamp)
+        return to_epoch_ns(timestamp)
+
+    def update(self, bar: Bar):
+        """
+        Fold a new bar into the opening range accumulator.
+
+        Bars stamped within [market open, OR end] update the running
+        high/low/volume in place, so the range is final as soon as the
+        window closes and does not depend on the market data buffer.
+
+        Args:
+            bar: New price bar
+        """
+        if self.is_calculated:
+            return
+
+        ts = bar.ts
+        session = self.calendar.session_at(ts)
+        if session is None:
+            return
+
+        if self._acc_date != session.date:
+            self._reset_accumulator()
+            self._acc_date = session.date
+
+        if session.open <= ts <= session.or_end:
+            if bar.high > self._acc_high:
+                self._acc_high = bar.high
+            if bar.low < self._acc_low:
+                self._acc_low = bar.low
+            self._acc_volume += bar.volume
+            self._acc_bars += 1
+
+    def get_partial_range(self) -> Optional[Tuple[float, float, int]]:
+        """
+        Get the opening range accumulated so far.
+
+        Returns:
+            Tuple of (high, low, volume), or None if no OR bars were seen yet
+        """
+        if self.is_calculated:
+            return (self.or_high, self.or_low, self.or_volume)
+        if not self._acc_bars:
+            return None
+        return (self._acc_high, self._acc_low, self._acc_volume)
+
+    def calculate(self, current_time: Union[datetime, int]) -> bool:
         """
         Calculate the opening range.
 
         Args:
-            current_time: Current time
+            current_time: Current time (datetime or epoch nanoseconds)
 
         Returns:
             True if opening range was calculated successfully
@@ -36,27 +108,33 @@ class OpeningRange:
         if self.is_calculated:
             return True
 
-        # Get market open time (9:30 AM ET)
-        market_open = self._get_market_open_time(current_time)
+        ts = self._to_ns(current_time)
 
-        if current_time < market_open:
-            self.logger.debug("Market not yet open")
+        # Market open and OR end of today's session
+        session = self.calendar.session_at(ts)
+        if session is None:
+            self.logger.debug("No session today")
             return False
 
-        # Calculate OR end time
-        or_end = market_open + timedelta(minutes=self.or_minutes)
+        if ts < session.open:
+            self.logger.debug("Market not yet open")
+            return False
 
-        if current_time < or_end:
-            self.logger.debug(
-                f"Still within opening range period (ends at {or_end.strftime('%H:%M:%S')})"
-            )
+        if ts < session.or_end:
+            self.logger.debug("Still within opening range period")
             return False
 
         # Calculate high and low during opening range period
-        self.or_start_time = market_open
-        self.or_end_time = or_end
+        self.or_start_time = from_epoch_ns(session.open, self.timezone)
+        self.or_end_time = from_epoch_ns(session.or_end, self.timezone)
 
-        high, low = self.market_data.get_high_low_range(market_open, or_end)
+        if self._acc_bars and self._acc_date == session.date:
+            # Streaming accumulator already holds the final range
+            high, low, volume = self._acc_high, self._acc_low, self._acc_volume
+        else:
+            # Bars were not streamed in: rescan the stored market data
+            high, low = self.market_data.get_high_low_range(session.open, session.or_end)
+            volume = self.market_data.get_total_volume(session.open, session.or_end)
 
         if high == 0.0 or low == 0.0:
             self.logger.warning("No data available for opening range period")
@@ -64,6 +142,7 @@ class OpeningRange:
 
         self.or_high = high
         self.or_low = low
+        self.or_volume = volume
         self.is_calculated = True
 
         self.logger.info(
@@ -73,16 +152,13 @@ class OpeningRange:
 
         return True
 
-    def _get_market_open_time(self, current_time: datetime) -> datetime:
-        """Get the market open time for the current day."""
-        if current_time.tzinfo is None:
-            current_time = self.timezone.localize(current_time)
-
-        market_open = current_time.replace(
-            hour=9, minute=30, second=0, microsecond=0
-        )
-
-        return market_open
+    def _reset_accumulator(self):
+        """Clear the streaming OR accumulator."""
+        self._acc_date = None
+        self._acc_high = float('-inf')
+        self._acc_low = float('inf')
+        self._acc_volume = 0
+        self._acc_bars = 0
 
     def get_range(self) -> float:
         """Get the opening range size in points."""
@@ -140,7 +216,9 @@ class OpeningRange:
         self.or_low = None
         self.or_start_time = None
         self.or_end_time = None
+        self.or_volume = 0
         self.is_calculated = False
+        self._reset_accumulator()
         self.logger.info("Opening range reset")
 
     def __repr__(self):
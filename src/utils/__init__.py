@@ -1,5 +1,8 @@
 """Utility modules."""
-from .config import Config
+from .config import Config, ConfigSnapshot, ConfigWatcher
+from .latency import LatencyHistogram, LatencyRecorder
 from .logger import Logger
+from .volatility_filter import VolatilityFilter
 
-__all__ = ['Config', 'Logger']
+__all__ = ['Config', 'ConfigSnapshot', 'ConfigWatcher', 'LatencyHistogram', 'LatencyRecorder',
+           'Logger', 'VolatilityFilter']
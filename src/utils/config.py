@@ -1,10 +1,13 @@
 """Configuration management for the trading bot."""
 import os
 import yaml
+from datetime import date, time
 from pathlib import Path
-from typing import Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, Union, get_args, get_origin
 from dotenv import load_dotenv
 
+from .logger import Logger
+
 
 class Config:
     """Centralized configuration management."""
@@ -37,6 +40,11 @@ class Config:
     def symbol(self) -> str:
         return self.config['trading']['symbol']
 
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols to trade; the first is the primary symbol."""
+        return self.config['trading'].get('symbols') or [self.symbol]
+
     @property
     def contract_month(self) -> str:
         return self.config['trading']['contract_month']
@@ -58,6 +66,27 @@ class Config:
     def trading_window_end(self) -> str:
         return self.config['strategy']['trading_window']['end']
 
+    @property
+    def market_open(self) -> str:
+        return self.config.get('sessions', {}).get('market_open', '09:30')
+
+    @property
+    def market_close(self) -> str:
+        return self.config.get('sessions', {}).get('market_close', '16:00')
+
+    @property
+    def early_close(self) -> str:
+        return self.config.get('sessions', {}).get('early_close', '13:00')
+
+    @property
+    def observe_holidays(self) -> bool:
+        return self.config.get('sessions', {}).get('holidays', True)
+
+    @property
+    def extra_holidays(self) -> List[date]:
+        return [date.fromisoformat(str(d))
+                for d in self.config.get('sessions', {}).get('extra_holidays', [])]
+
     @property
     def timezone(self) -> str:
         return self.config['strategy']['trading_window']['timezone']
@@ -78,7 +107,31 @@ class Config:
     def risk_reward_ratio(self) -> float:
         return self.config['strategy']['exit_rules']['risk_reward_ratio']
 
+    @property
+    def trailing_stop(self) -> bool:
+        return self.config['strategy']['exit_rules'].get('trailing_stop', False)
+
+    @property
+    def trailing_method(self) -> str:
+        return self.config['strategy']['exit_rules'].get('trailing_method', 'fixed')
+
+    @property
+    def trailing_distance(self) -> float:
+        return self.config['strategy']['exit_rules'].get('trailing_distance', 4.0)
+
+    @property
+    def trailing_atr_period(self) -> int:
+        return self.config['strategy']['exit_rules'].get('trailing_atr_period', 14)
+
+    @property
+    def breakeven_r(self) -> float:
+        return self.config['strategy']['exit_rules'].get('breakeven_r', 0.0)
+
     # Risk Management
+    @property
+    def initial_balance(self) -> float:
+        return self.config['risk_management'].get('initial_balance', 100000.0)
+
     @property
     def max_position_size(self) -> int:
         return self.config['risk_management']['max_position_size']
@@ -91,11 +144,97 @@ class Config:
     def max_daily_trades(self) -> int:
         return self.config['risk_management']['max_daily_trades']
 
+    @property
+    def position_sizing_method(self) -> str:
+        return self.config['risk_management'].get('position_sizing_method', 'fixed')
+
+    @property
+    def kelly_fraction(self) -> float:
+        return self.config['risk_management'].get('kelly_fraction', 0.5)
+
+    @property
+    def kelly_min_trades(self) -> int:
+        return self.config['risk_management'].get('kelly_min_trades', 20)
+
+    @property
+    def trade_lookback(self) -> int:
+        return self.config['risk_management'].get('trade_lookback', 50)
+
+    @property
+    def volatility_lookback(self) -> int:
+        return self.config['risk_management'].get('volatility_lookback', 14)
+
+    @property
+    def volatility_atr_multiple(self) -> float:
+        return self.config['risk_management'].get('volatility_atr_multiple', 1.0)
+
     # Filters
     @property
     def avoid_news_days(self) -> bool:
         return self.config['filters']['avoid_news_days']
 
+    @property
+    def news_calendar(self) -> str:
+        return self.config.get('filters', {}).get('news_calendar', 'data/calendar')
+
+    @property
+    def news_mode(self) -> str:
+        return self.config.get('filters', {}).get('news_mode', 'day')
+
+    @property
+    def news_minutes_before(self) -> int:
+        return self.config.get('filters', {}).get('news_minutes_before', 5)
+
+    @property
+    def news_minutes_after(self) -> int:
+        return self.config.get('filters', {}).get('news_minutes_after', 15)
+
+    @property
+    def min_volatility(self) -> float:
+        return self.config.get('filters', {}).get('min_volatility', 0)
+
+    @property
+    def max_volatility(self) -> float:
+        return self.config.get('filters', {}).get('max_volatility', 100)
+
+    @property
+    def volatility_file(self) -> Optional[str]:
+        return self.config.get('filters', {}).get('volatility_file')
+
+    # Runtime
+    @property
+    def queue_size(self) -> int:
+        return self.config.get('runtime', {}).get('queue_size', 1024)
+
+    @property
+    def overflow_policy(self) -> str:
+        return self.config.get('runtime', {}).get('overflow_policy', 'block')
+
+    @property
+    def heartbeat_seconds(self) -> float:
+        return self.config.get('runtime', {}).get('heartbeat_seconds', 60)
+
+    @property
+    def config_reload_seconds(self) -> float:
+        return self.config.get('runtime', {}).get('config_reload_seconds', 0)
+
+    @property
+    def latency_tracking(self) -> bool:
+        return self.config.get('runtime', {}).get('latency_tracking', True)
+
+    @property
+    def latency_sample_every(self) -> int:
+        return self.config.get('runtime', {}).get('latency_sample_every', 128)
+
+    @property
+    def latency_file(self) -> Optional[str]:
+        return self.config.get('runtime', {}).get('latency_file')
+
+    # Simulation Configuration
+    @property
+    def intrabar_path(self) -> str:
+        return self.config.get('simulation', {}).get('intrabar_path', 'worst_case')
+
     # Broker Configuration from Environment
     @property
     def broker(self) -> str:
@@ -122,6 +261,278 @@ class Config:
     def log_file(self) -> str:
         return self.config.get('logging', {}).get('file', 'logs/trading_bot.log')
 
+    @property
+    def log_console(self) -> bool:
+        return self.config.get('logging', {}).get('console', True)
+
+    @property
+    def log_json(self) -> bool:
+        return self.config.get('logging', {}).get('json', False)
+
+    @property
+    def log_max_bytes(self) -> int:
+        return self.config.get('logging', {}).get('max_bytes', 10_000_000)
+
+    @property
+    def log_backup_count(self) -> int:
+        return self.config.get('logging', {}).get('backup_count', 5)
+
+    @property
+    def log_rate_limit_seconds(self) -> float:
+        return self.config.get('logging', {}).get('rate_limit_seconds', 1)
+
+    @property
+    def log_rate_limit_burst(self) -> int:
+        return self.config.get('logging', {}).get('rate_limit_burst', 20)
+
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value by key."""
         return self.config.get(key, default)
+
+    def snapshot(self) -> 'ConfigSnapshot':
+        """Compile every setting into a validated, immutable ConfigSnapshot."""
+        return ConfigSnapshot.from_config(self)
+
+
+# Settings a running bot applies between bars; the others need a restart
+LIVE_SETTINGS = frozenset({
+    'volume_confirmation', 'volume_multiplier', 'min_breakout_points', 'risk_reward_ratio',
+    'trailing_distance', 'breakeven_r', 'max_position_size', 'max_daily_loss',
+    'max_daily_trades', 'position_sizing_method', 'kelly_fraction', 'kelly_min_trades',
+    'volatility_atr_multiple'
+})
+
+
+class ConfigSnapshot:
+    """
+    Immutable, validated copy of every Config setting.
+
+    Config properties walk the nested YAML dicts on each access; a snapshot
+    resolves them once, checks their types and ranges, and stores them in
+    slots, so the bar loop reads plain attributes. The attribute names are
+    those of Config, so a snapshot can stand in for it. Snapshots are never
+    modified: a reload compiles a new one and swaps the reference.
+    """
+
+    symbol: str
+    symbols: Tuple[str, ...]
+    contract_month: str
+    exchange: str
+    opening_range_minutes: int
+    trading_window_start: str
+    trading_window_end: str
+    market_open: str
+    market_close: str
+    early_close: str
+    observe_holidays: bool
+    extra_holidays: Tuple[date, ...]
+    timezone: str
+    volume_confirmation: bool
+    volume_multiplier: float
+    min_breakout_points: float
+    risk_reward_ratio: float
+    trailing_stop: bool
+    trailing_method: str
+    trailing_distance: float
+    trailing_atr_period: int
+    breakeven_r: float
+    initial_balance: float
+    max_position_size: int
+    max_daily_loss: float
+    max_daily_trades: int
+    position_sizing_method: str
+    kelly_fraction: float
+    kelly_min_trades: int
+    trade_lookback: int
+    volatility_lookback: int
+    volatility_atr_multiple: float
+    avoid_news_days: bool
+    news_calendar: str
+    news_mode: str
+    news_minutes_before: int
+    news_minutes_after: int
+    min_volatility: float
+    max_volatility: float
+    volatility_file: Optional[str]
+    queue_size: int
+    overflow_policy: str
+    heartbeat_seconds: float
+    config_reload_seconds: float
+    latency_tracking: bool
+    latency_sample_every: int
+    latency_file: Optional[str]
+    intrabar_path: str
+    broker: str
+    alpaca_api_key: str
+    alpaca_secret_key: str
+    alpaca_base_url: str
+    log_level: str
+    log_file: str
+    log_console: bool
+    log_json: bool
+    log_max_bytes: int
+    log_backup_count: int
+    log_rate_limit_seconds: float
+    log_rate_limit_burst: int
+
+    __slots__ = tuple(__annotations__)
+
+    def __init__(self, **values):
+        """
+        Args:
+            **values: One value per setting
+
+        Raises:
+            ValueError: If a setting is missing, has the wrong type or is out of range
+        """
+        missing = [name for name in self.__slots__ if name not in values]
+        unknown = [name for name in values if name not in self.__annotations__]
+        if missing or unknown:
+            raise ValueError(f"Invalid settings: missing {missing}, unknown {unknown}")
+
+        for name, kind in self.__annotations__.items():
+            object.__setattr__(self, name, self._coerce(name, kind, values[name]))
+        self._validate()
+
+    @classmethod
+    def from_config(cls, config: Config) -> 'ConfigSnapshot':
+        """Resolve every setting of a Config."""
+        return cls(**{name: getattr(config, name) for name in cls.__slots__})
+
+    @staticmethod
+    def _coerce(name: str, kind, value: Any) -> Any:
+        """Check a value against its annotation (ints widen to float, lists become tuples)."""
+        if kind is float and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        elif get_origin(kind) is tuple and isinstance(value, (list, tuple)):
+            value = tuple(value)
+
+        if get_origin(kind) is Union:
+            allowed = get_args(kind)
+        else:
+            allowed = (get_origin(kind) or kind,)
+        if isinstance(value, bool) and bool not in allowed:
+            allowed = ()  # bool is an int subclass, but not a valid count
+        if not isinstance(value, allowed):
+            raise ValueError(f"Config setting {name} has invalid value {value!r}")
+        return value
+
+    def _validate(self):
+        """Range and consistency checks."""
+        from ..risk.position_sizing import SIZING_METHODS
+
+        positive = ('opening_range_minutes', 'volume_multiplier', 'risk_reward_ratio',
+                    'trailing_distance', 'trailing_atr_period', 'initial_balance',
+                    'max_position_size', 'max_daily_loss', 'trade_lookback',
+                    'volatility_lookback',
+                    'volatility_atr_multiple', 'queue_size', 'latency_sample_every')
+        non_negative = ('min_breakout_points', 'breakeven_r', 'max_daily_trades',
+                        'kelly_fraction', 'kelly_min_trades', 'news_minutes_before',
+                        'news_minutes_after', 'heartbeat_seconds', 'config_reload_seconds',
+                        'log_max_bytes', 'log_backup_count', 'log_rate_limit_seconds',
+                        'log_rate_limit_burst')
+        for name in positive:
+            if getattr(self, name) <= 0:
+                raise ValueError(f"Config setting {name} must be positive: {getattr(self, name)}")
+        for name in non_negative:
+            if getattr(self, name) < 0:
+                raise ValueError(f"Config setting {name} must not be negative: {getattr(self, name)}")
+
+        if not self.symbols:
+            raise ValueError("Config setting symbols must not be empty")
+        if self.position_sizing_method not in SIZING_METHODS:
+            raise ValueError(f"Unknown position sizing method: {self.position_sizing_method}")
+        if self.min_volatility > self.max_volatility:
+            raise ValueError(f"Volatility band is empty: {self.min_volatility} > {self.max_volatility}")
+
+        for start, end in (('market_open', 'market_close'),
+                           ('trading_window_start', 'trading_window_end')):
+            try:
+                first = time.fromisoformat(getattr(self, start))
+                last = time.fromisoformat(getattr(self, end))
+                time.fromisoformat(self.early_close)
+            except ValueError:
+                raise ValueError(f"Config times must be HH:MM: {start}, {end}, early_close")
+            if first >= last:
+                raise ValueError(f"Config setting {start} must be before {end}")
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"ConfigSnapshot is read-only (tried to set {name})")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"ConfigSnapshot is read-only (tried to delete {name})")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ConfigSnapshot):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    def __reduce__(self):
+        return (_rebuild_snapshot, (self.as_dict(),))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def replace(self, **changes) -> 'ConfigSnapshot':
+        """A new snapshot with some settings changed (validated again)."""
+        return ConfigSnapshot(**{**self.as_dict(), **changes})
+
+    def diff(self, other: 'ConfigSnapshot') -> Dict[str, Tuple[Any, Any]]:
+        """Settings that differ, as name -> (this value, other value)."""
+        return {name: (getattr(self, name), getattr(other, name))
+                for name in self.__slots__ if getattr(self, name) != getattr(other, name)}
+
+
+def _rebuild_snapshot(values: Dict[str, Any]) -> ConfigSnapshot:
+    return ConfigSnapshot(**values)
+
+
+class ConfigWatcher:
+    """
+    Detects edits of a config file and compiles the new settings.
+
+    poll() is cheap when nothing changed (one stat call), so it can run
+    on a timer. A file that fails to load or validate is reported once
+    and ignored; the previous settings stay in force.
+    """
+
+    def __init__(self, config_path: str, current: ConfigSnapshot):
+        """
+        Args:
+            config_path: YAML file to watch
+            current: Settings the bot is running with
+        """
+        self.config_path = Path(config_path)
+        self.current = current
+        self.logger = Logger.get_logger()
+        self._stamp = self._file_stamp()
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.config_path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self) -> Optional[ConfigSnapshot]:
+        """
+        Check the file for changes.
+
+        Returns:
+            New snapshot if the file changed and its settings differ, else None
+        """
+        stamp = self._file_stamp()
+        if stamp == self._stamp or stamp is None:
+            return None
+        self._stamp = stamp
+
+        try:
+            snapshot = Config(str(self.config_path)).snapshot()
+        except (OSError, KeyError, TypeError, ValueError, yaml.YAMLError) as e:
+            self.logger.error(f"Config reload failed, keeping current settings: {e}")
+            return None
+
+        if snapshot == self.current:
+            return None
+        self.current = snapshot
+        return snapshot
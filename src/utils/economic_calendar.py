@@ -0,0 +1,229 @@
+"""Economic release calendar with per-event blackout windows."""
+import bisect
+import csv
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, Union
+import numpy as np
+import pytz
+
+from .logger import Logger
+from .time_utils import NS_PER_MINUTE, to_epoch_ns
+
+
+class EconomicEvent:
+    """A scheduled release, either at a time of day or for the whole day."""
+
+    def __init__(self, event_date: date, name: str, release_time: Optional[time] = None,
+                 minutes_before: int = 5, minutes_after: int = 15):
+        """
+        Args:
+            event_date: Date of the release
+            name: Description (e.g. 'NFP')
+            release_time: Release time in the calendar timezone (None = all day)
+            minutes_before: Blackout minutes before the release
+            minutes_after: Blackout minutes after the release
+        """
+        self.date = event_date
+        self.name = name
+        self.time = release_time
+        self.minutes_before = minutes_before
+        self.minutes_after = minutes_after
+
+    @property
+    def all_day(self) -> bool:
+        return self.time is None
+
+    def window(self, tz) -> Tuple[int, int]:
+        """Blackout window as [start, end) epoch nanoseconds."""
+        if self.time is None:
+            start = tz.localize(datetime.combine(self.date, time(0, 0)))
+            end = tz.localize(datetime.combine(self.date + timedelta(days=1), time(0, 0)))
+            return to_epoch_ns(start), to_epoch_ns(end)
+
+        release = to_epoch_ns(tz.localize(datetime.combine(self.date, self.time)))
+        return (release - self.minutes_before * NS_PER_MINUTE,
+                release + self.minutes_after * NS_PER_MINUTE)
+
+    def __repr__(self):
+        when = self.time.strftime('%H:%M') if self.time else 'all day'
+        return f"EconomicEvent({self.date} {when}, {self.name})"
+
+
+class EconomicCalendar:
+    """
+    Scheduled releases across any number of years.
+
+    Events are kept in a date -> events dict for O(1) day lookups, and a
+    sorted list of event dates answers "next event" queries by bisection.
+    Blackout windows are indexed lazily into arrays of window starts
+    (sorted) and running maximum ends, so checking one timestamp is a binary
+    search and masking a whole bar history is one ``searchsorted`` call.
+
+    Event files are CSVs with the columns ``date`` (YYYY-MM-DD), ``event``
+    and optionally ``time`` (HH:MM, blank for all day), ``before`` and
+    ``after`` (blackout minutes). The years the loaded files cover are
+    recorded (a file named ``YYYY.csv`` covers that year, others the years
+    of their events), so a date without events can be told apart from a
+    date no file describes.
+    """
+
+    def __init__(self, timezone: str = "America/New_York", minutes_before: int = 5,
+                 minutes_after: int = 15):
+        """
+        Args:
+            timezone: Timezone of release times
+            minutes_before: Default blackout minutes before a timed release
+            minutes_after: Default blackout minutes after a timed release
+        """
+        self.timezone = pytz.timezone(timezone)
+        self.minutes_before = minutes_before
+        self.minutes_after = minutes_after
+        self.logger = Logger.get_logger()
+
+        self.events: Dict[date, List[EconomicEvent]] = {}
+        self.years: Set[int] = set()  # Years described by a loaded file
+        self._dates: List[date] = []  # Sorted keys of self.events
+        self._window_starts: Optional[np.ndarray] = None
+        self._window_ends: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return sum(len(events) for events in self.events.values())
+
+    def load(self, path: Union[str, Path]) -> int:
+        """
+        Load an event file, or every ``*.csv`` file of a directory.
+
+        Returns:
+            Number of events loaded
+        """
+        path = Path(path)
+        if path.is_dir():
+            return sum(self.load(file) for file in sorted(path.glob('*.csv')))
+        if not path.exists():
+            self.logger.warning(f"Economic calendar not found: {path}")
+            return 0
+
+        count = 0
+        years = set()
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                row = {k.strip().lower(): (v or '').strip() for k, v in row.items() if k}
+                if not row.get('date'):
+                    continue
+                release_time = time.fromisoformat(row['time']) if row.get('time') else None
+                event_date = date.fromisoformat(row['date'])
+                years.add(event_date.year)
+                self.add_event(
+                    event_date,
+                    row.get('event') or "High-impact news",
+                    release_time,
+                    int(row['before']) if row.get('before') else None,
+                    int(row['after']) if row.get('after') else None
+                )
+                count += 1
+
+        if path.stem.isdigit() and len(path.stem) == 4:
+            years = {int(path.stem)}  # A yearly file covers its year even without events
+        self.years.update(years)
+
+        self.logger.info(f"Loaded {count} economic events from {path}")
+        return count
+
+    def covers(self, day: date) -> bool:
+        """Check if a loaded file describes the year of a date."""
+        return day.year in self.years
+
+    def uncovered_years(self, dates: np.ndarray) -> List[int]:
+        """Years of many dates (datetime64[D]) that no loaded file describes."""
+        years = np.unique(np.asarray(dates, dtype='datetime64[Y]').astype(np.int64) + 1970)
+        return [int(year) for year in years if int(year) not in self.years]
+
+    def add_event(self, event_date: date, name: str, release_time: Optional[time] = None,
+                  minutes_before: Optional[int] = None,
+                  minutes_after: Optional[int] = None) -> EconomicEvent:
+        """Add one release (blackout minutes default to the calendar's)."""
+        event = EconomicEvent(
+            event_date, name, release_time,
+            self.minutes_before if minutes_before is None else minutes_before,
+            self.minutes_after if minutes_after is None else minutes_after
+        )
+        events = self.events.get(event_date)
+        if events is None:
+            self.events[event_date] = [event]
+            bisect.insort(self._dates, event_date)
+        else:
+            events.append(event)
+        self._window_starts = None
+        return event
+
+    def remove_date(self, event_date: date):
+        """Drop every event on a date."""
+        if self.events.pop(event_date, None) is not None:
+            del self._dates[bisect.bisect_left(self._dates, event_date)]
+            self._window_starts = None
+
+    def events_on(self, event_date: date) -> List[EconomicEvent]:
+        return self.events.get(event_date, [])
+
+    def dates(self, all_day_only: bool = False) -> List[date]:
+        """Sorted dates with events (only those with an all-day event if asked)."""
+        if not all_day_only:
+            return list(self._dates)
+        return [d for d in self._dates if any(e.all_day for e in self.events[d])]
+
+    def next_event_date(self, after: date) -> Optional[date]:
+        """First date with events strictly after a date."""
+        i = bisect.bisect_right(self._dates, after)
+        return self._dates[i] if i < len(self._dates) else None
+
+    def _index_windows(self):
+        """Sort the timed blackout windows for binary search."""
+        windows = sorted(
+            event.window(self.timezone)
+            for events in self.events.values() for event in events if not event.all_day
+        )
+        starts = np.array([w[0] for w in windows], dtype=np.int64)
+        ends = np.array([w[1] for w in windows], dtype=np.int64)
+        # A window may end after a later-starting one, so carry the furthest end forward
+        self._window_starts = starts
+        self._window_ends = np.maximum.accumulate(ends) if len(ends) else ends
+
+    def in_blackout(self, epoch_ns: int) -> bool:
+        """Check if a time falls inside a timed release's blackout window."""
+        if self._window_starts is None:
+            self._index_windows()
+        i = int(np.searchsorted(self._window_starts, epoch_ns, side='right')) - 1
+        return i >= 0 and bool(epoch_ns < self._window_ends[i])
+
+    def blackout_mask(self, ts: np.ndarray) -> np.ndarray:
+        """
+        Vectorized in_blackout over many times (e.g. every bar of a backtest).
+
+        Args:
+            ts: Epoch nanosecond timestamps
+
+        Returns:
+            Boolean array, True inside a blackout window
+        """
+        if self._window_starts is None:
+            self._index_windows()
+        ts = np.asarray(ts, dtype=np.int64)
+        if not len(self._window_ends):
+            return np.zeros(len(ts), dtype=bool)
+        i = np.searchsorted(self._window_starts, ts, side='right') - 1
+        return (i >= 0) & (ts < self._window_ends[np.maximum(i, 0)])
+
+    def session_mask(self, session_dates: np.ndarray, all_day_only: bool = False) -> np.ndarray:
+        """
+        Flag the sessions whose date has events.
+
+        Args:
+            session_dates: Session dates as datetime64[D]
+            all_day_only: Only count all-day events
+
+        Returns:
+            Boolean array, True for sessions with events
+        """
+        flagged = np.array(self.dates(all_day_only), dtype='datetime64[D]')
+        return np.isin(np.asarray(session_dates, dtype='datetime64[D]'), flagged)
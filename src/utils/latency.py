@@ -0,0 +1,188 @@
+"""Low-overhead latency histograms for the bar processing path."""
+import json
+import time
+from pathlib import Path
+from typing import Callable, Dict, Union
+
+# Sub-bucket resolution: 2**(SUB_BITS - 1) buckets per power of two (< 1.6% error)
+SUB_BITS = 7
+_HALF = 1 << (SUB_BITS - 1)
+
+
+class LatencyHistogram:
+    """
+    Fixed-size log-linear histogram of nanosecond durations (HDR style).
+
+    Values below ``2**SUB_BITS`` ns get a bucket each; above that every
+    power of two is split into ``2**(SUB_BITS - 1)`` buckets, so the
+    relative error is bounded at any magnitude. Recording is an index
+    computation and a list increment; nothing is allocated after
+    construction. Values above ``max_ns`` go to the last bucket (the exact
+    maximum is kept separately).
+    """
+
+    def __init__(self, max_ns: int = 60_000_000_000):
+        shift = max(max_ns.bit_length() - SUB_BITS, 0)
+        self.size = _HALF * shift + (max_ns >> shift) + 1
+        self.counts = [0] * self.size  # Zeroed in place by reset(): timers bind it
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def index(value: int, last: int) -> int:
+        """Bucket of a duration (at most ``last``)."""
+        shift = value.bit_length() - SUB_BITS
+        if shift < 0:
+            return value if value > 0 else 0
+        index = _HALF * shift + (value >> shift)
+        return index if index < last else last
+
+    def record(self, value: int):
+        """Add one duration in nanoseconds."""
+        self.counts[self.index(value, self.size - 1)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @staticmethod
+    def _upper_bound(index: int) -> int:
+        """Largest value that falls into a bucket."""
+        if index < 2 * _HALF:
+            return index
+        shift = index // _HALF - 1
+        mantissa = index - _HALF * shift
+        return ((mantissa + 1) << shift) - 1
+
+    def percentile(self, q: float) -> int:
+        """Value at or below which a fraction q of the durations fall (ns)."""
+        count = self.count
+        if not count:
+            return 0
+        target = max(int(q * count + 0.5), 1)
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= target:
+                return min(self._upper_bound(index), self.max)
+        return self.max
+
+    def reset(self):
+        self.counts[:] = [0] * self.size
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, p50, p99 and max in microseconds."""
+        count = self.count
+        return {
+            'count': count,
+            'mean_us': self.total / count / 1000.0 if count else 0.0,
+            'p50_us': self.percentile(0.50) / 1000.0,
+            'p99_us': self.percentile(0.99) / 1000.0,
+            'max_us': self.max / 1000.0
+        }
+
+
+class LatencyRecorder:
+    """
+    Latency histograms per processing stage and per bot state.
+
+    Stages are timed by wrapping the callables that implement them
+    (see wrap()), so code that runs without a recorder keeps calling the
+    original methods and pays nothing. Stages nest: a fill recorded inside
+    a broker update counts towards both. The owner times one call in
+    ``sample_every`` (see TradingBot._instrument); the histograms then hold
+    that sample of the calls.
+    """
+
+    def __init__(self, sample_every: int = 1):
+        if sample_every <= 0:
+            raise ValueError(f"Sample interval must be positive: {sample_every}")
+        self.sample_every = sample_every
+        self.stages: Dict[str, LatencyHistogram] = {}
+        self.states: Dict[str, LatencyHistogram] = {}
+
+    def stage(self, name: str) -> LatencyHistogram:
+        histogram = self.stages.get(name)
+        if histogram is None:
+            histogram = self.stages[name] = LatencyHistogram()
+        return histogram
+
+    def state(self, name: str) -> LatencyHistogram:
+        histogram = self.states.get(name)
+        if histogram is None:
+            histogram = self.states[name] = LatencyHistogram()
+        return histogram
+
+    def wrap(self, stage: str, fn: Callable) -> Callable:
+        """
+        Return fn timed into the stage's histogram.
+
+        The bucket update is inlined (see LatencyHistogram.record) because
+        the timer runs several times per bar. Positional and keyword
+        arguments are passed through unchanged.
+        """
+        histogram = self.stage(stage)
+        counts = histogram.counts
+        last = histogram.size - 1
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                value = clock() - start
+                shift = value.bit_length() - SUB_BITS
+                index = value if shift < 0 else _HALF * shift + (value >> shift)
+                counts[index if index < last else last] += 1
+                histogram.count += 1
+                histogram.total += value
+                if value > histogram.max:
+                    histogram.max = value
+
+        timed.__wrapped__ = fn
+        return timed
+
+    def reset(self):
+        for histogram in self.stages.values():
+            histogram.reset()
+        for histogram in self.states.values():
+            histogram.reset()
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Per-stage and per-state count, mean, p50, p99 and max (microseconds)."""
+        return {
+            'stages': {name: h.summary() for name, h in self.stages.items() if h.count},
+            'states': {name: h.summary() for name, h in self.states.items() if h.count}
+        }
+
+    def format_table(self) -> str:
+        """Summary as a fixed-width text table."""
+        lines = [f"{'':<28}{'count':>10}{'p50 us':>10}{'p99 us':>10}{'max us':>10}"]
+        summary = self.summary()
+        for group in ('stages', 'states'):
+            for name, row in summary[group].items():
+                lines.append(f"{group[:-1] + ' ' + name:<28}{row['count']:>10}"
+                             f"{row['p50_us']:>10.1f}{row['p99_us']:>10.1f}{row['max_us']:>10.1f}")
+        return '\n'.join(lines)
+
+    def dump(self, path: Union[str, Path]):
+        """Write the summary and the non-empty histogram buckets as JSON."""
+        def buckets(histogram: LatencyHistogram) -> Dict[int, int]:
+            return {LatencyHistogram._upper_bound(i): c
+                    for i, c in enumerate(histogram.counts) if c}
+
+        data = self.summary()
+        data['sample_every'] = self.sample_every
+        data['buckets_ns'] = {
+            'stages': {name: buckets(h) for name, h in self.stages.items() if h.count},
+            'states': {name: buckets(h) for name, h in self.states.items() if h.count}
+        }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
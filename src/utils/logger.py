@@ -1,53 +1,341 @@
 """Logging configuration for the trading bot."""
+import atexit
+import json
 import logging
+import os
+import queue
 import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, RotatingFileHandler
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log ingestion."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'line': record.lineno,
+            'thread': record.threadName
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets at most ``burst`` records per call site through every ``interval`` seconds.
+
+    A call site is the source line that logged the record, so a message
+    built with an f-string (different text on every bar) still counts as
+    one. The first record let through after a quiet period reports how
+    many were suppressed. Records above ``max_level`` (by default everything
+    but DEBUG chatter, so fills and risk warnings always get through) are
+    never limited.
+    """
+
+    def __init__(self, interval: float = 1.0, burst: int = 20,
+                 max_level: int = logging.DEBUG):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self.max_level = max_level
+        self._windows: Dict[tuple, List] = {}  # call site -> [start, passed, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.interval <= 0 or record.levelno > self.max_level:
+            return True
+
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or record.created - window[0] >= self.interval:
+                suppressed = window[2] if window is not None else 0
+                self._windows[key] = [record.created, 1, 0]
+                if suppressed:
+                    record.msg = f"{record.getMessage()} ({suppressed} similar messages suppressed)"
+                    record.args = None
+                return True
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+
+class _EnqueueHandler(QueueHandler):
+    """
+    Queues records for the writer thread with minimal work on the caller.
+
+    The writer is a thread of the same process, so records need no
+    pickling: only the message is resolved now (its arguments may change
+    later), and formatting is left to the writer's handlers.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class _BatchedFileHandler(RotatingFileHandler):
+    """Size-rotated file handler that flushes once per batch, not per record."""
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        super().flush()
+
+
+class _BatchedStreamHandler(logging.StreamHandler):
+    """Stream handler that flushes once per batch, not per record."""
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        try:
+            super().flush()
+        except (OSError, ValueError):
+            pass  # The stream was closed under the writer (e.g. a captured stdout)
+
+
+class LogWriter:
+    """
+    Background thread that writes queued log records.
+
+    The trading thread only appends records to a queue (QueueHandler). This
+    thread takes every record waiting at once, up to ``batch_size``, passes
+    them to the handlers and flushes each handler once per batch, so disk
+    and terminal I/O never run on the caller's thread.
+    """
+
+    _STOP = None
+
+    def __init__(self, log_queue: queue.SimpleQueue, handlers: List[logging.Handler],
+                 batch_size: int = 256):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Write every queued record, then end the thread."""
+        if self._thread is None:
+            return
+        self.queue.put(self._STOP)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        get = self.queue.get
+        get_nowait = self.queue.get_nowait
+        while True:
+            batch = [get()]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(get_nowait())
+            except queue.Empty:
+                pass
+
+            stopping = False
+            for record in batch:
+                if record is self._STOP:
+                    stopping = True
+                    continue
+                for handler in self.handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+            for handler in self.handlers:
+                handler.flush_batch()
+
+            if stopping:
+                return
 
 
 class Logger:
     """Centralized logging system."""
 
     _instance: Optional[logging.Logger] = None
+    _writer: Optional[LogWriter] = None
+    _queue_handler: Optional[QueueHandler] = None
+    _log_file: Optional[str] = None
+    _process_name: Optional[str] = None  # Set in worker processes, which log to their own file
+    _inherited: List[logging.Handler] = []  # Handlers a forked child must never flush or close
 
     @classmethod
     def get_logger(cls, name: str = "TradingBot", log_file: str = "logs/trading_bot.log",
-                   level: str = "INFO") -> logging.Logger:
-        """Get or create logger instance."""
+                   level: str = "INFO", console: bool = True, json_format: bool = False,
+                   max_bytes: int = 10_000_000, backup_count: int = 5,
+                   rate_limit_seconds: float = 1.0, rate_limit_burst: int = 20) -> logging.Logger:
+        """
+        Get or create logger instance (the first call's settings apply).
+
+        Args:
+            name: Logger name
+            log_file: Log file path
+            level: Minimum level (DEBUG, INFO, ...)
+            console: Also write to stdout
+            json_format: Write the file as JSON lines
+            max_bytes: Rotate the file at this size (0 never rotates)
+            backup_count: Rotated files to keep
+            rate_limit_seconds: Rate limit window per call site (0 disables)
+            rate_limit_burst: Records per call site and window
+        """
         if cls._instance is None:
-            cls._instance = cls._setup_logger(name, log_file, level)
+            cls._instance = cls._setup_logger(name, log_file, level, console, json_format,
+                                              max_bytes, backup_count, rate_limit_seconds,
+                                              rate_limit_burst)
         return cls._instance
 
     @classmethod
-    def _setup_logger(cls, name: str, log_file: str, level: str) -> logging.Logger:
-        """Set up logger with file and console handlers."""
+    def from_config(cls, config) -> logging.Logger:
+        """Get or create the logger with the logging settings of a config."""
+        return cls.get_logger(
+            log_file=config.log_file,
+            level=config.log_level,
+            console=config.log_console,
+            json_format=config.log_json,
+            max_bytes=config.log_max_bytes,
+            backup_count=config.log_backup_count,
+            rate_limit_seconds=config.log_rate_limit_seconds,
+            rate_limit_burst=config.log_rate_limit_burst
+        )
+
+    @classmethod
+    def _setup_logger(cls, name: str, log_file: str, level: str, console: bool,
+                      json_format: bool, max_bytes: int, backup_count: int,
+                      rate_limit_seconds: float, rate_limit_burst: int) -> logging.Logger:
+        """Set up the logger: a queue on the caller's side, file and console handlers on the writer."""
         logger = logging.getLogger(name)
         logger.setLevel(getattr(logging, level.upper()))
 
         # Create logs directory if it doesn't exist
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
+        cls._log_file = log_file
+        if cls._process_name is not None:
+            log_file = cls._process_file(cls._process_name)
 
         # File handler
-        file_handler = logging.FileHandler(log_file)
+        file_handler = _BatchedFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
         file_handler.setLevel(logging.DEBUG)
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+        if json_format:
+            file_formatter = JsonFormatter()
+        else:
+            file_formatter = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                datefmt='%Y-%m-%d %H:%M:%S'
+            )
         file_handler.setFormatter(file_formatter)
+        handlers: List[logging.Handler] = [file_handler]
 
         # Console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(getattr(logging, level.upper()))
-        console_formatter = logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%H:%M:%S'
-        )
-        console_handler.setFormatter(console_formatter)
+        if console:
+            console_handler = _BatchedStreamHandler(sys.stdout)
+            console_handler.setLevel(getattr(logging, level.upper()))
+            console_formatter = logging.Formatter(
+                '%(asctime)s - %(levelname)s - %(message)s',
+                datefmt='%H:%M:%S'
+            )
+            console_handler.setFormatter(console_formatter)
+            handlers.append(console_handler)
+
+        # Records are only queued here; the writer thread does the I/O
+        log_queue = queue.SimpleQueue()
+        queue_handler = _EnqueueHandler(log_queue)
+        queue_handler.addFilter(RateLimitFilter(rate_limit_seconds, rate_limit_burst))
+        logger.addHandler(queue_handler)
 
-        # Add handlers
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        cls._queue_handler = queue_handler
+        cls._writer = LogWriter(log_queue, handlers)
+        cls._writer.start()
+        atexit.register(cls.shutdown)
+        os.register_at_fork(after_in_child=cls._after_fork)
 
         return logger
+
+    @classmethod
+    def _process_file(cls, name: str) -> str:
+        """Log file of a worker process, e.g. logs/trading_bot.shard-0.log."""
+        path = Path(cls._log_file)
+        return str(path.with_name(f"{path.stem}.{name}{path.suffix}"))
+
+    @classmethod
+    def _switch_file(cls, handlers: List[logging.Handler], name: str) -> List[logging.Handler]:
+        """Replace the file handler with one writing to the process's own file."""
+        switched = []
+        for handler in handlers:
+            if isinstance(handler, _BatchedFileHandler):
+                replacement = _BatchedFileHandler(cls._process_file(name),
+                                                  maxBytes=handler.maxBytes,
+                                                  backupCount=handler.backupCount,
+                                                  delay=True)
+                replacement.setLevel(handler.level)
+                replacement.setFormatter(handler.formatter)
+                handler = replacement
+            switched.append(handler)
+        return switched
+
+    @classmethod
+    def set_process_name(cls, name: str):
+        """
+        Make this process log to its own file, suffixed with ``name``.
+
+        Worker processes call this before logging anything: several
+        processes writing and rotating one file would lose lines at a
+        rollover. Works whether or not the logger exists yet.
+        """
+        cls._process_name = name
+        if cls._writer is None:
+            return
+        writer = cls._writer
+        writer.stop()  # Write out what was queued under the previous file
+        for handler in writer.handlers:
+            if isinstance(handler, _BatchedFileHandler) and handler not in cls._inherited:
+                handler.close()
+        cls._writer = LogWriter(writer.queue, cls._switch_file(writer.handlers, name))
+        cls._writer.start()
+
+    @classmethod
+    def _after_fork(cls):
+        """
+        Give a forked child (e.g. a shard worker) its own queue, writer thread and file.
+
+        The inherited file handler shares the parent's file and buffer, so the
+        child never touches it; until set_process_name() names the process,
+        it logs to a file suffixed with its pid.
+        """
+        if cls._writer is None:
+            return
+        handlers = cls._writer.handlers
+        cls._inherited.extend(h for h in handlers if isinstance(h, _BatchedFileHandler))
+        log_queue = queue.SimpleQueue()
+        cls._queue_handler.queue = log_queue
+        cls._writer = LogWriter(log_queue, cls._switch_file(handlers, f"pid-{os.getpid()}"))
+        cls._writer.start()
+
+    @classmethod
+    def shutdown(cls):
+        """Write out every queued record (called at exit)."""
+        if cls._writer is not None:
+            cls._writer.stop()
+            cls._writer = None
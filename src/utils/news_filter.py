@@ -1,13 +1,28 @@
 """News filter to avoid trading on high-impact news days."""
-from datetime import datetime, date
-from typing import List, Set
-import pytz
+from datetime import date
+from pathlib import Path
+from typing import List, Optional, Set, Union
+import numpy as np
 
+from .economic_calendar import EconomicCalendar
 from .logger import Logger
 
+NEWS_MODES = ('day', 'window')
+
 
 class NewsFilter:
-    """Filter to avoid trading on news days."""
+    """
+    Filter to avoid trading around scheduled news.
+
+    Events come from an EconomicCalendar, usually loaded from a directory of
+    yearly CSV files. In 'day' mode any event suspends the whole session.
+    In 'window' mode only all-day events do; a timed release (e.g. NFP at
+    08:30) blocks new entries inside its blackout window.
+
+    A date in a year the loaded calendar files do not cover cannot be
+    checked: the live bot logs a warning (once per year) and trades, and a
+    backtest refuses to run rather than silently skip the filter.
+    """
 
     # Major economic news releases that typically affect ES futures
     HIGH_IMPACT_NEWS = [
@@ -21,59 +36,63 @@ class NewsFilter:
         "Retail Sales"
     ]
 
-    def __init__(self, enabled: bool = True, timezone: str = "America/New_York"):
+    def __init__(self, enabled: bool = True, timezone: str = "America/New_York",
+                 calendar_path: Optional[Union[str, Path]] = None, mode: str = 'day',
+                 minutes_before: int = 5, minutes_after: int = 15,
+                 calendar: Optional[EconomicCalendar] = None):
+        """
+        Args:
+            enabled: False allows trading regardless of the calendar
+            timezone: Timezone of release times
+            calendar_path: Event CSV file or directory of them
+            mode: 'day' or 'window'
+            minutes_before: Default blackout minutes before a timed release
+            minutes_after: Default blackout minutes after a timed release
+            calendar: Calendar to use instead of building one
+        """
+        if mode not in NEWS_MODES:
+            raise ValueError(f"Unknown news filter mode: {mode}")
+
         self.enabled = enabled
-        self.timezone = pytz.timezone(timezone)
+        self.mode = mode
         self.logger = Logger.get_logger()
-
-        # Predefined news days for 2026 (should be updated regularly)
-        # Format: (month, day, description)
-        self.known_news_days_2026 = [
-            # FOMC Meetings 2026
-            (1, 28, "FOMC Meeting"),
-            (1, 29, "FOMC Meeting"),
-            (3, 17, "FOMC Meeting"),
-            (3, 18, "FOMC Meeting"),
-            (4, 28, "FOMC Meeting"),
-            (4, 29, "FOMC Meeting"),
-            (6, 16, "FOMC Meeting"),
-            (6, 17, "FOMC Meeting"),
-            (7, 28, "FOMC Meeting"),
-            (7, 29, "FOMC Meeting"),
-            (9, 22, "FOMC Meeting"),
-            (9, 23, "FOMC Meeting"),
-            (11, 3, "FOMC Meeting"),
-            (11, 4, "FOMC Meeting"),
-            (12, 15, "FOMC Meeting"),
-            (12, 16, "FOMC Meeting"),
-
-            # NFP Days (First Friday of each month, typically)
-            (1, 9, "NFP"),
-            (2, 6, "NFP"),
-            (3, 6, "NFP"),
-            (4, 3, "NFP"),
-            (5, 8, "NFP"),
-            (6, 5, "NFP"),
-            (7, 3, "NFP"),
-            (8, 7, "NFP"),
-            (9, 4, "NFP"),
-            (10, 2, "NFP"),
-            (11, 6, "NFP"),
-            (12, 4, "NFP"),
-        ]
-
-        self.excluded_dates: Set[date] = self._build_excluded_dates()
-
-    def _build_excluded_dates(self) -> Set[date]:
-        """Build set of excluded dates from known news days."""
-        excluded = set()
-        current_year = datetime.now().year
-
-        if current_year == 2026:
-            for month, day, _ in self.known_news_days_2026:
-                excluded.add(date(2026, month, day))
-
-        return excluded
+        self.calendar = calendar or EconomicCalendar(timezone, minutes_before, minutes_after)
+        self.calendar_path = calendar_path
+        if calendar_path is not None:
+            self.calendar.load(calendar_path)
+        self._warned_years: Set[int] = set()
+
+    @classmethod
+    def from_config(cls, config) -> 'NewsFilter':
+        """Build the news filter of the bot configuration."""
+        return cls(
+            enabled=config.avoid_news_days,
+            timezone=config.timezone,
+            calendar_path=config.news_calendar,
+            mode=config.news_mode,
+            minutes_before=config.news_minutes_before,
+            minutes_after=config.news_minutes_after
+        )
+
+    def _check_coverage(self, current_date: date):
+        """Warn (once per year) when the calendar does not describe a date."""
+        if self.calendar.covers(current_date) or current_date.year in self._warned_years:
+            return
+        self._warned_years.add(current_date.year)
+        self.logger.warning(
+            f"No economic calendar for {current_date.year} in {self.calendar_path}: "
+            f"news days of that year are not filtered"
+        )
+
+    @property
+    def excluded_dates(self) -> Set[date]:
+        """Dates on which the whole session is suspended."""
+        return set(self.get_excluded_dates())
+
+    def _day_events(self, current_date: date) -> List[str]:
+        """Names of the events that suspend a whole session."""
+        return [event.name for event in self.calendar.events_on(current_date)
+                if self.mode == 'day' or event.all_day]
 
     def is_trading_allowed(self, current_date: date) -> tuple[bool, str]:
         """
@@ -88,16 +107,51 @@ class NewsFilter:
         if not self.enabled:
             return True, "News filter disabled"
 
-        if current_date in self.excluded_dates:
-            # Find the news event
-            for month, day, description in self.known_news_days_2026:
-                if current_date == date(current_date.year, month, day):
-                    reason = f"High-impact news day: {description}"
-                    self.logger.warning(f"Trading not allowed: {reason}")
-                    return False, reason
+        self._check_coverage(current_date)
+        names = self._day_events(current_date)
+        if names:
+            reason = f"High-impact news day: {', '.join(dict.fromkeys(names))}"
+            self.logger.warning(f"Trading not allowed: {reason}")
+            return False, reason
 
         return True, "No major news events"
 
+    def in_blackout(self, epoch_ns: int) -> bool:
+        """Check if new entries are blocked at a time by a release window."""
+        if not self.enabled or self.mode != 'window':
+            return False
+        return self.calendar.in_blackout(epoch_ns)
+
+    def blackout_mask(self, ts: np.ndarray) -> np.ndarray:
+        """Vectorized in_blackout over epoch nanosecond timestamps."""
+        if not self.enabled or self.mode != 'window':
+            return np.zeros(len(ts), dtype=bool)
+        return self.calendar.blackout_mask(ts)
+
+    def session_mask(self, session_dates: np.ndarray) -> np.ndarray:
+        """
+        Vectorized is_trading_allowed over many sessions.
+
+        Args:
+            session_dates: Session dates as datetime64[D]
+
+        Returns:
+            Boolean array, True where the session is suspended
+
+        Raises:
+            ValueError: If the calendar does not cover every session's year
+        """
+        if not self.enabled:
+            return np.zeros(len(session_dates), dtype=bool)
+        uncovered = self.calendar.uncovered_years(session_dates)
+        if uncovered:
+            raise ValueError(
+                f"No economic calendar for {', '.join(map(str, uncovered))} in "
+                f"{self.calendar_path}: add the yearly event files or set "
+                f"filters.avoid_news_days to false"
+            )
+        return self.calendar.session_mask(session_dates, all_day_only=self.mode == 'window')
+
     def add_news_date(self, news_date: date, description: str = "High-impact news"):
         """
         Add a custom news date to avoid.
@@ -106,7 +160,7 @@ class NewsFilter:
             news_date: Date to exclude
             description: Description of the news event
         """
-        self.excluded_dates.add(news_date)
+        self.calendar.add_event(news_date, description)
         self.logger.info(f"Added news date: {news_date} - {description}")
 
     def remove_news_date(self, news_date: date):
@@ -116,8 +170,8 @@ class NewsFilter:
         Args:
             news_date: Date to remove from exclusions
         """
-        if news_date in self.excluded_dates:
-            self.excluded_dates.remove(news_date)
+        if self.calendar.events_on(news_date):
+            self.calendar.remove_date(news_date)
             self.logger.info(f"Removed news date: {news_date}")
 
     def get_next_news_date(self, current_date: date) -> tuple[date, str]:
@@ -130,29 +184,29 @@ class NewsFilter:
         Returns:
             Tuple of (next_news_date, description)
         """
-        future_dates = [d for d in self.excluded_dates if d > current_date]
-
-        if not future_dates:
+        next_date = self.calendar.next_event_date(current_date)
+        if next_date is None:
             return None, ""
 
-        next_date = min(future_dates)
-
-        # Find description
-        for month, day, description in self.known_news_days_2026:
-            if next_date == date(next_date.year, month, day):
-                return next_date, description
-
-        return next_date, "High-impact news"
+        names = [event.name for event in self.calendar.events_on(next_date)]
+        return next_date, ', '.join(dict.fromkeys(names))
 
     def get_excluded_dates(self) -> List[date]:
-        """Get list of all excluded dates."""
-        return sorted(list(self.excluded_dates))
+        """Get list of all dates on which the whole session is suspended."""
+        return self.calendar.dates(all_day_only=self.mode == 'window')
 
     def log_status(self, current_date: date):
         """Log news filter status."""
         allowed, reason = self.is_trading_allowed(current_date)
 
         if allowed:
+            windows = [event for event in self.calendar.events_on(current_date)
+                       if not event.all_day]
+            if self.enabled and windows:
+                self.logger.info(
+                    "News Filter: Entry blackouts today: " +
+                    ', '.join(f"{e.name} {e.time.strftime('%H:%M')}" for e in windows)
+                )
             next_date, description = self.get_next_news_date(current_date)
             if next_date:
                 self.logger.info(
@@ -0,0 +1,22 @@
+"""Conversions between datetimes and int64 epoch nanoseconds."""
+from datetime import datetime, timedelta
+import pytz
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_MINUTE = 60 * NS_PER_SECOND
+NS_PER_DAY = 86_400 * NS_PER_SECOND
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=pytz.utc)
+
+
+def to_epoch_ns(timestamp: datetime) -> int:
+    """Convert a timezone-aware datetime to epoch nanoseconds (exact to the microsecond)."""
+    delta = timestamp - _EPOCH
+    return ((delta.days * 86_400 + delta.seconds) * NS_PER_SECOND
+            + delta.microseconds * 1000)
+
+
+def from_epoch_ns(epoch_ns: int, tz) -> datetime:
+    """Convert epoch nanoseconds to a timezone-aware datetime in ``tz``."""
+    utc = _EPOCH + timedelta(microseconds=int(epoch_ns) // 1000)
+    return utc.astimezone(tz)
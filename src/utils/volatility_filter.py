@@ -0,0 +1,137 @@
+"""Volatility filter to trade only while an index (e.g. VIX) is within a band."""
+from datetime import datetime, time
+from pathlib import Path
+from typing import Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+import pytz
+
+from .logger import Logger
+from .time_utils import to_epoch_ns
+
+
+class VolatilityFilter:
+    """
+    Filter to avoid trading when a volatility index is outside [min, max].
+
+    The index history is loaded from a local CSV into sorted arrays of
+    epoch-ns timestamps and values. The level at time t is the last value
+    published at or before t (found by binary search), so a daily close is
+    only used from its publication time onwards. Times before the first
+    value are not filtered.
+    """
+
+    def __init__(self, min_level: float = 0.0, max_level: float = 100.0,
+                 path: Optional[Union[str, Path]] = None, enabled: bool = True,
+                 timezone: str = "America/New_York", close_time: str = "16:15",
+                 column: str = "close"):
+        """
+        Args:
+            min_level: Lowest index level at which trading is allowed
+            max_level: Highest index level at which trading is allowed
+            path: CSV with a 'date' or 'timestamp' column and a value column
+            enabled: False allows trading regardless of the index
+            timezone: Timezone of naive timestamps and of ``close_time``
+            close_time: Publication time (HH:MM) assumed for date-only rows
+            column: Name of the value column
+        """
+        self.min_level = min_level
+        self.max_level = max_level
+        self.enabled = enabled
+        self.timezone = pytz.timezone(timezone)
+        self.close_time = time.fromisoformat(close_time)
+        self.logger = Logger.get_logger()
+
+        self.ts = np.zeros(0, dtype=np.int64)
+        self.values = np.zeros(0, dtype=np.float64)
+        if path is not None:
+            self.load_csv(path, column)
+
+    @classmethod
+    def from_config(cls, config) -> 'VolatilityFilter':
+        """Build the volatility filter of the bot configuration."""
+        return cls(
+            min_level=config.min_volatility,
+            max_level=config.max_volatility,
+            path=config.volatility_file,
+            timezone=config.timezone
+        )
+
+    @property
+    def active(self) -> bool:
+        """True if the filter can block anything."""
+        return self.enabled and len(self.ts) > 0 and \
+            (self.min_level > 0 or self.max_level < float('inf'))
+
+    def load_csv(self, path: Union[str, Path], column: str = "close"):
+        """Load an index history (replaces any loaded series)."""
+        frame = pd.read_csv(path)
+        frame.columns = [c.strip().lower() for c in frame.columns]
+        column = column.lower()
+
+        if 'timestamp' in frame.columns:
+            stamps = pd.to_datetime(frame['timestamp'])
+        elif 'date' in frame.columns:
+            stamps = pd.to_datetime(frame['date']) + pd.Timedelta(
+                hours=self.close_time.hour, minutes=self.close_time.minute
+            )
+        else:
+            raise ValueError(f"{path}: expected a 'date' or 'timestamp' column")
+        if column not in frame.columns:
+            raise ValueError(f"{path}: no '{column}' column")
+
+        index = pd.DatetimeIndex(stamps)
+        if index.tz is None:
+            index = index.tz_localize(self.timezone.zone)
+        ts = index.tz_convert('UTC').as_unit('ns').asi8
+        values = frame[column].to_numpy(dtype=np.float64)
+
+        order = np.argsort(ts, kind='stable')
+        self.ts = ts[order]
+        self.values = values[order]
+        self.logger.info(f"Loaded {len(self.ts)} volatility index values from {path}")
+
+    def level_at(self, when: Union[datetime, int]) -> Optional[float]:
+        """Latest index value published at or before a time (datetime or epoch ns)."""
+        ns = when if isinstance(when, (int, np.integer)) else to_epoch_ns(when)
+        i = int(np.searchsorted(self.ts, ns, side='right')) - 1
+        if i < 0:
+            return None
+        return float(self.values[i])
+
+    def is_trading_allowed(self, when: Union[datetime, int]) -> Tuple[bool, str]:
+        """
+        Check if the index is within the band at a time.
+
+        Returns:
+            Tuple of (is_allowed, reason)
+        """
+        if not self.active:
+            return True, "Volatility filter inactive"
+
+        level = self.level_at(when)
+        if level is None:
+            return True, "No volatility data yet"
+        if level < self.min_level:
+            return False, f"Volatility {level:.2f} below minimum {self.min_level:.2f}"
+        if level > self.max_level:
+            return False, f"Volatility {level:.2f} above maximum {self.max_level:.2f}"
+        return True, f"Volatility {level:.2f} within band"
+
+    def allowed_mask(self, ts: np.ndarray) -> np.ndarray:
+        """
+        Vectorized is_trading_allowed over many times (e.g. session starts).
+
+        Args:
+            ts: Epoch nanosecond timestamps
+
+        Returns:
+            Boolean array, True where trading is allowed
+        """
+        ts = np.asarray(ts, dtype=np.int64)
+        if not self.active:
+            return np.ones(len(ts), dtype=bool)
+
+        i = np.searchsorted(self.ts, ts, side='right') - 1
+        level = self.values[np.maximum(i, 0)]
+        return (i < 0) | ((level >= self.min_level) & (level <= self.max_level))
@@ -0,0 +1,27 @@
+"""Per-bar allocation budget of the event-driven bot's hot path."""
+from pathlib import Path
+
+from src.backtest.allocations import profile_allocations
+from src.backtest.replay import iter_columns
+from src.backtest.synthetic import generate_sessions
+from src.bot.trading_bot import TradingBot
+from src.utils.config import Config
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / 'config.yaml'
+
+P99_BUDGET = 256      # Bytes allocated by a steady-state bar (backtest.py alloc --budget)
+RETAINED_BUDGET = 4096  # Bytes kept across all steady-state bars (a leak grows per bar)
+
+
+def test_steady_state_bars_stay_within_the_allocation_budget():
+    """The bot as config.yaml ships it must not allocate per bar."""
+    bot = TradingBot(Config(str(CONFIG_PATH)))
+    bot.start()
+    try:
+        profile = profile_allocations(bot, iter_columns(generate_sessions(20), bot.timezone))
+    finally:
+        bot.stop()
+
+    assert profile['steady_bars'] > 1000
+    assert profile['p99_bytes'] <= P99_BUDGET
+    assert profile['retained_bytes'] <= RETAINED_BUDGET
@@ -0,0 +1,45 @@
+"""Time-order tracking of the bar ring buffer."""
+import random
+
+import numpy as np
+
+from src.data.bar_buffer import BarBuffer
+
+
+def append(buffer, ts):
+    buffer.append(ts, 1.0, 1.0, 1.0, 1.0, 1)
+
+
+def test_monotonic_flag_recovers_once_the_late_bar_is_evicted():
+    buffer = BarBuffer(capacity=3)
+    for ts in (10, 20, 15):  # 15 arrives late
+        append(buffer, ts)
+    assert not buffer.is_monotonic
+
+    append(buffer, 30)  # Evicts 10; 20 -> 15 is still retained
+    assert not buffer.is_monotonic
+    append(buffer, 40)  # Evicts 20: 15, 30, 40
+    assert buffer.is_monotonic
+    assert buffer.search(30) == 1
+
+
+def test_monotonic_flag_matches_the_retained_window():
+    rng = random.Random(3)
+    for capacity in (1, 2, 5):
+        buffer = BarBuffer(capacity)
+        history = []
+        for _ in range(400):
+            if rng.random() < 0.2:
+                ts = np.array([rng.randint(0, 40) for _ in range(rng.randint(1, 2 * capacity))])
+                buffer.extend(ts, ts * 1.0, ts * 1.0, ts * 1.0, ts * 1.0, ts)
+                history.extend(ts.tolist())
+            else:
+                ts = rng.randint(0, 40)
+                append(buffer, ts)
+                history.append(ts)
+
+            window = history[-capacity:]
+            assert buffer.is_monotonic == all(b >= a for a, b in zip(window, window[1:]))
+
+        buffer.clear()
+        assert buffer.is_monotonic
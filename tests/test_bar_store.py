@@ -0,0 +1,65 @@
+"""CSV import across DST changes and recovery from interrupted writes."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.bar_store import BAR_DTYPE, BarStore
+
+
+def write_csv(path, stamps):
+    frame = pd.DataFrame({
+        'timestamp': stamps,
+        'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': 1.0, 'volume': 1
+    })
+    frame.to_csv(path, index=False)
+
+
+def test_import_fall_back_repeated_hour(tmp_path):
+    # 2024-11-03: New York clocks go from 01:59 EDT back to 01:00 EST
+    first = pd.date_range('2024-11-03 00:30', '2024-11-03 01:59', freq='min')
+    second = pd.date_range('2024-11-03 01:00', '2024-11-03 02:30', freq='min')
+    stamps = [t.strftime('%Y-%m-%d %H:%M') for t in first.append(second)]
+    csv = tmp_path / 'es.csv'
+    write_csv(csv, stamps)
+
+    store = BarStore(tmp_path / 'store')
+    # Small chunks so the repeated hour is split across reads
+    assert store.import_csv('ES', csv, chunksize=37) == len(stamps)
+
+    ts = store.load_range('ES')['ts']
+    assert np.all(np.diff(ts) == 60 * 10**9)
+    assert ts[0] == pd.Timestamp('2024-11-03 04:30', tz='UTC').value
+    assert ts[-1] == pd.Timestamp('2024-11-03 07:30', tz='UTC').value
+
+
+def test_import_spring_forward_gap_raises(tmp_path):
+    csv = tmp_path / 'es.csv'
+    write_csv(csv, ['2024-03-10 01:59', '2024-03-10 02:30', '2024-03-10 03:00'])
+    with pytest.raises(Exception, match='2024-03-10 02:30'):
+        BarStore(tmp_path / 'store').import_csv('ES', csv)
+
+
+def bars(start, count):
+    ts = pd.Timestamp(start, tz='America/New_York').value + np.arange(count) * 60 * 10**9
+    return {'ts': ts, 'open': np.ones(count), 'high': np.ones(count),
+            'low': np.ones(count), 'close': np.ones(count),
+            'volume': np.ones(count, dtype=np.int64)}
+
+
+def test_unindexed_tail_is_ignored_and_dropped(tmp_path):
+    store = BarStore(tmp_path)
+    store.write('ES', bars('2024-01-02 09:30', 10))
+
+    # Interrupted write: records appended, index never replaced
+    with open(tmp_path / 'ES.bars', 'ab') as f:
+        np.zeros(3, dtype=BAR_DTYPE).tofile(f)
+        f.write(b'\0' * 5)
+
+    reader = BarStore(tmp_path)
+    assert len(reader.load_range('ES')) == 10
+
+    store.write('ES', bars('2024-01-03 09:30', 10))
+    records = BarStore(tmp_path).load_range('ES')
+    assert len(records) == 20
+    assert np.all(np.diff(records['ts']) > 0)
+    assert list(BarStore(tmp_path).sessions('ES').astype(str)) == ['2024-01-02', '2024-01-03']
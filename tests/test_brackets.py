@@ -0,0 +1,93 @@
+"""Bracket and OCO orders in the paper broker."""
+import pytest
+
+from src.data.broker_interface import BracketOrder, Order, OrderSide, OrderStatus, OrderType
+from src.data.paper_broker import PaperBroker
+
+T0 = 1_704_205_800 * 10**9  # Epoch ns of the first bar
+MINUTE = 60 * 10**9
+
+
+@pytest.fixture
+def broker():
+    broker = PaperBroker(point_value=50.0)
+    broker.connect()
+    broker.update_market_price('ES', 4000.0)
+    return broker
+
+
+def bar(broker, i, open_price, high, low, close):
+    broker.update_bar('ES', T0 + i * MINUTE, open_price, high, low, close)
+
+
+def long_bracket(broker, entry=None, stop=3990.0, target=4020.0):
+    entry = entry or Order('ES', OrderSide.BUY, 1, OrderType.MARKET)
+    bracket = BracketOrder(entry, stop, target)
+    assert broker.submit_bracket(bracket)
+    return bracket
+
+
+def test_stop_fill_cancels_target(broker):
+    bracket = long_bracket(broker)
+    assert bracket.stop.status == bracket.target.status == OrderStatus.SUBMITTED
+
+    bar(broker, 1, 3999.0, 4001.0, 3985.0, 3986.0)
+    assert bracket.stop.status == OrderStatus.FILLED
+    assert bracket.stop.filled_price == 3990.0
+    assert bracket.target.status == OrderStatus.CANCELLED
+    assert not broker.has_positions()
+
+    # The cancelled target stays dead when price later reaches it
+    bar(broker, 2, 4000.0, 4030.0, 3999.0, 4025.0)
+    assert bracket.target.status == OrderStatus.CANCELLED
+    assert len(broker.get_trade_history()) == 1
+
+
+def test_target_fill_cancels_stop(broker):
+    bracket = long_bracket(broker)
+    bar(broker, 1, 4001.0, 4021.0, 4000.0, 4018.0)
+    assert bracket.target.status == OrderStatus.FILLED
+    assert bracket.target.filled_price == 4020.0
+    assert bracket.stop.status == OrderStatus.CANCELLED
+    assert broker.get_trade_history()[0]['pnl'] == 20.0 * 50.0
+
+
+def test_cancelling_pending_entry_cancels_exits(broker):
+    entry = Order('ES', OrderSide.BUY, 1, OrderType.STOP, stop_price=4010.0)
+    bracket = long_bracket(broker, entry)
+    assert bracket.exits[0].status == OrderStatus.PENDING  # Held until the entry fills
+
+    assert broker.cancel_order(entry.order_id)
+    assert [o.status for o in bracket.exits] == [OrderStatus.CANCELLED] * 2
+
+    bar(broker, 1, 4000.0, 4025.0, 3985.0, 4000.0)
+    assert entry.status == OrderStatus.CANCELLED
+    assert not broker.has_positions()
+    assert not broker.filled_orders
+
+
+def test_pending_entry_releases_exits_on_fill(broker):
+    entry = Order('ES', OrderSide.BUY, 1, OrderType.STOP, stop_price=4005.0)
+    bracket = long_bracket(broker, entry)
+    bar(broker, 1, 4000.0, 4006.0, 3999.0, 4004.0)
+    assert entry.status == OrderStatus.FILLED
+    assert bracket.stop.status == bracket.target.status == OrderStatus.SUBMITTED
+
+
+def test_reduce_only_never_opens_a_position(broker):
+    stop = Order('ES', OrderSide.SELL, 1, OrderType.STOP, stop_price=3990.0, reduce_only=True)
+    assert broker.submit_order(stop)
+    bar(broker, 1, 4000.0, 4000.0, 3980.0, 3985.0)
+    assert stop.status == OrderStatus.CANCELLED
+    assert not broker.has_positions()
+
+
+def test_reduce_only_is_capped_at_the_position(broker):
+    assert broker.submit_order(Order('ES', OrderSide.BUY, 2, OrderType.MARKET))
+    target = Order('ES', OrderSide.SELL, 5, OrderType.LIMIT, price=4010.0, reduce_only=True)
+    assert broker.submit_order(target)
+
+    bar(broker, 1, 4000.0, 4012.0, 3999.0, 4011.0)
+    assert target.status == OrderStatus.FILLED
+    assert target.filled_quantity == 2
+    assert not broker.has_positions()  # Closed, not reversed into a short
@@ -0,0 +1,101 @@
+"""Hot reload of the config file: validation, live and restart-only settings."""
+import logging
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.backtest.replay import iter_columns
+from src.backtest.synthetic import generate_sessions
+from src.bot.trading_bot import TradingBot
+from src.utils.config import Config, ConfigWatcher
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / 'config.yaml'
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / 'config.yaml'
+    shutil.copy(CONFIG_PATH, path)
+    return path
+
+
+def rewrite(path: Path, old: str, new: str, step: int):
+    text = path.read_text()
+    assert old in text
+    path.write_text(text.replace(old, new, 1))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + step * 10**9))
+
+
+def test_invalid_file_keeps_the_current_snapshot(config_file):
+    current = Config(str(config_file)).snapshot()
+    watcher = ConfigWatcher(str(config_file), current)
+    assert watcher.poll() is None  # Unchanged
+
+    rewrite(config_file, 'risk_reward_ratio: 2.0', 'risk_reward_ratio: -2.0', 1)
+    assert watcher.poll() is None
+    assert watcher.current is current
+
+    rewrite(config_file, 'risk_reward_ratio: -2.0', 'risk_reward_ratio: [2.0', 2)
+    assert watcher.poll() is None
+    assert watcher.current is current
+
+    rewrite(config_file, 'risk_reward_ratio: [2.0', 'risk_reward_ratio: 3.0', 3)
+    snapshot = watcher.poll()
+    assert snapshot is not None and snapshot.risk_reward_ratio == 3.0
+    assert current.risk_reward_ratio == 2.0  # Snapshots are never modified
+
+
+@pytest.fixture
+def bot(config_file):
+    bot = TradingBot(Config(str(config_file)))
+    bot.start()
+    yield bot
+    bot.stop()
+
+
+def test_live_setting_applies_at_the_next_bar(bot):
+    bars = iter_columns(generate_sessions(1), bot.timezone)
+    bot.on_bar(next(bars))
+    detector = bot.breakout_detector
+    multiplier = bot.settings.volume_multiplier
+
+    bot.reload_config(bot.settings.replace(volume_multiplier=multiplier + 1.0,
+                                           max_daily_trades=7))
+    assert detector.volume_multiplier == multiplier  # Not between bars
+
+    bot.on_bar(next(bars))
+    assert detector.volume_multiplier == multiplier + 1.0
+    assert bot.risk_manager.max_daily_trades == 7
+    assert bot.settings.volume_multiplier == multiplier + 1.0
+
+
+def test_restart_only_setting_is_logged_and_not_applied(bot):
+    handler = RecordingHandler()
+    bot.logger.addHandler(handler)
+    try:
+        bars = iter_columns(generate_sessions(1), bot.timezone)
+        bot.on_bar(next(bars))
+        minutes = bot.settings.opening_range_minutes
+
+        bot.reload_config(bot.settings.replace(opening_range_minutes=minutes + 10,
+                                               volume_multiplier=5.0))
+        bot.on_bar(next(bars))
+    finally:
+        bot.logger.removeHandler(handler)
+
+    assert bot.settings.opening_range_minutes == minutes
+    assert bot.settings.volume_multiplier == 5.0  # The live part still applies
+    assert any('ignored until restart' in m and 'opening_range_minutes' in m
+               for m in handler.messages)
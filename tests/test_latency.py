@@ -0,0 +1,31 @@
+"""Sampled per-stage latency tracking of the bot."""
+from pathlib import Path
+
+from src.backtest.replay import iter_columns
+from src.backtest.synthetic import generate_sessions
+from src.bot.trading_bot import TradingBot
+from src.utils.config import Config
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / 'config.yaml'
+
+
+def test_one_bar_in_n_is_timed_and_the_plain_methods_stay_installed():
+    config = Config(str(CONFIG_PATH))
+    config.config['runtime']['latency_tracking'] = True
+    config.config['runtime']['latency_sample_every'] = 10
+    bot = TradingBot(config)
+    plain_update = bot.broker.update_bar
+    bot.start()
+    try:
+        bars = 0
+        for bar in iter_columns(generate_sessions(2), bot.timezone):
+            bot.on_bar(bar)
+            bars += 1
+            assert bot.broker.update_bar is plain_update
+    finally:
+        bot.stop()
+
+    stages = bot.latency.stages
+    assert stages['bar'].count == (bars + 9) // 10
+    assert stages['broker_update'].count == stages['bar'].count
+    assert stages['market_data'].count == stages['bar'].count
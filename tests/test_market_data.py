@@ -0,0 +1,32 @@
+"""Bar timestamps given as naive, aware and epoch-nanosecond times."""
+from datetime import datetime
+
+import pytz
+
+from src.data.market_data import Bar, MarketDataHandler
+
+
+def test_naive_datetime_defaults_to_the_exchange_timezone():
+    bar = Bar(datetime(2024, 7, 1, 9, 30), 1.0, 1.0, 1.0, 1.0, 1)
+    assert bar.ts == 1_719_840_600 * 10**9  # 13:30 UTC (EDT)
+    assert bar.timestamp.utcoffset().total_seconds() == -4 * 3600
+
+    handler = MarketDataHandler()
+    assert handler.add_bar(datetime(2024, 7, 1, 9, 30), 1.0, 1.0, 1.0, 1.0, 1) == bar.ts
+
+
+def test_explicit_and_aware_timezones_win():
+    chicago = pytz.timezone("America/Chicago")
+    assert Bar(datetime(2024, 7, 1, 8, 30), 1.0, 1.0, 1.0, 1.0, 1, tz=chicago).ts == \
+        1_719_840_600 * 10**9
+    aware = datetime(2024, 7, 1, 13, 30, tzinfo=pytz.utc)
+    assert Bar(aware, 1.0, 1.0, 1.0, 1.0, 1).ts == 1_719_840_600 * 10**9
+
+
+def test_default_timezone_follows_the_configuration():
+    try:
+        Bar.set_default_timezone("America/Chicago")
+        assert Bar(datetime(2024, 7, 1, 8, 30), 1.0, 1.0, 1.0, 1.0, 1).ts == \
+            1_719_840_600 * 10**9
+    finally:
+        Bar.set_default_timezone("America/New_York")
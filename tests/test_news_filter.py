@@ -0,0 +1,34 @@
+"""Calendar coverage of the news filter."""
+from datetime import date
+
+import numpy as np
+import pytest
+
+from src.utils.news_filter import NewsFilter
+
+CALENDAR = "data/calendar"
+
+
+def test_shipped_calendars_cover_backtest_years():
+    news_filter = NewsFilter(enabled=True, calendar_path=CALENDAR)
+    for year in range(2015, 2027):
+        assert news_filter.calendar.covers(date(year, 6, 1))
+    # 2020-03-03: unscheduled FOMC cut
+    assert not news_filter.is_trading_allowed(date(2020, 3, 3))[0]
+
+
+def test_uncovered_year_raises_in_backtests(tmp_path):
+    (tmp_path / "2026.csv").write_text("date,time,event,before,after\n")
+    news_filter = NewsFilter(enabled=True, calendar_path=tmp_path)
+    sessions = np.array(["2025-12-31", "2026-01-02"], dtype='datetime64[D]')
+    with pytest.raises(ValueError, match="2025"):
+        news_filter.session_mask(sessions)
+    assert not news_filter.session_mask(sessions[1:]).any()
+
+
+def test_uncovered_year_warns_once_live(tmp_path):
+    (tmp_path / "2026.csv").write_text("date,time,event,before,after\n")
+    news_filter = NewsFilter(enabled=True, calendar_path=tmp_path)
+    assert news_filter.is_trading_allowed(date(2027, 1, 4))[0]
+    assert news_filter.is_trading_allowed(date(2027, 1, 5))[0]
+    assert news_filter._warned_years == {2027}
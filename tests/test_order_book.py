@@ -0,0 +1,38 @@
+"""Stale entries of cancelled and amended orders in the price-level book."""
+from src.data.broker_interface import Order, OrderSide, OrderType
+from src.data.order_book import OrderBook
+
+
+def make_stop(order_id: str, stop_price: float) -> Order:
+    order = Order("ES", OrderSide.SELL, 1, OrderType.STOP, stop_price=stop_price)
+    order.order_id = order_id
+    return order
+
+
+def test_trailing_amendments_do_not_accumulate_levels():
+    book = OrderBook("ES")
+    stop = make_stop("stop", 4000.0)
+    book.add(0, stop)
+    for seq in range(1, 10_000):
+        stop.stop_price = 4000.0 + seq * 0.25
+        book.amend(seq, stop)
+
+    side = book.sell_stops
+    assert len(side.levels) <= 2
+    assert side.entries <= 2
+    assert side.best() == stop.stop_price
+
+
+def test_cancelled_best_level_no_longer_reaches():
+    book = OrderBook("ES")
+    near = make_stop("near", 3999.0)
+    far = make_stop("far", 3990.0)
+    book.add(0, near)
+    book.add(1, far)
+
+    book.discard(near)
+
+    assert book.sell_stops.best() == 3990.0
+    assert not book.reaches(3995.0, 4005.0)
+    assert [entry[1] for entry in book.pop_range(3985.0, 4005.0)] == [far]
+    assert len(book) == 0 and book.sell_stops.entries == 0
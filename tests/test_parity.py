@@ -0,0 +1,25 @@
+"""Parity between the vectorized backtester and the event-driven bot."""
+from pathlib import Path
+
+from src.backtest.parity import check_parity
+from src.backtest.synthetic import generate_sessions
+from src.utils.config import Config
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / 'config.yaml'
+
+
+def test_volatility_sizing_parity_on_sessions_longer_than_the_bar_buffer():
+    """23h sessions (1380 bars) outlast the bot's 1000-bar buffer; sizing must still match."""
+    config = Config(str(CONFIG_PATH))
+    risk = config.config['risk_management']
+    risk['position_sizing_method'] = 'volatility_based'
+    risk['max_position_size'] = 100  # Leave room for the ATR to change the size
+    risk['volatility_atr_multiple'] = 0.1
+    risk['max_daily_loss'] = 1_000_000
+
+    bars = generate_sessions(60, session_start='00:00', session_end='23:00')
+    result, mismatches = check_parity(config, bars)
+
+    assert len(result) > 0
+    assert len(set(result.quantity.tolist())) > 1
+    assert mismatches == []
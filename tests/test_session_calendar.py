@@ -0,0 +1,73 @@
+"""NYSE session calendar: observed holidays, half days and DST."""
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+import pytz
+
+from src.data.session_calendar import SessionCalendar, us_equity_holidays
+from src.utils.time_utils import to_epoch_ns
+
+
+def utc_ns(*args) -> int:
+    return to_epoch_ns(datetime(*args, tzinfo=pytz.utc))
+
+
+@pytest.fixture
+def calendar():
+    return SessionCalendar()
+
+
+def test_saturday_new_year_is_not_observed_in_december(calendar):
+    # 2022-01-01 is a Saturday: NYSE stays open on Friday 2021-12-31
+    assert date(2021, 12, 31) not in us_equity_holidays(2021)
+    assert date(2021, 12, 31) not in us_equity_holidays(2022)
+    assert calendar.is_session(date(2021, 12, 31))
+    assert not calendar.session(date(2021, 12, 31)).early_close
+
+
+def test_juneteenth_observed_from_2022(calendar):
+    # 2022-06-19 is a Sunday: observed on Monday
+    assert not calendar.is_session(date(2022, 6, 20))
+    assert calendar.is_session(date(2021, 6, 18))  # Before the holiday existed
+    assert not calendar.is_session(date(2023, 6, 19))
+
+
+def test_saturday_christmas_closes_christmas_eve(calendar):
+    # 2027-12-25 is a Saturday: closed on Friday 12-24 (not a half day)
+    assert not calendar.is_session(date(2027, 12, 24))
+    assert calendar.is_session(date(2027, 12, 23))
+    assert not calendar.session(date(2027, 12, 23)).early_close
+
+
+def test_half_days_close_at_13_00(calendar):
+    session = calendar.session(date(2024, 7, 3))
+    assert session.early_close
+    assert session.close == utc_ns(2024, 7, 3, 17, 0)
+    assert session.window_end <= session.close
+
+
+@pytest.mark.parametrize('day, open_utc', [
+    (date(2024, 3, 8), (14, 30)),   # EST, last session before spring forward
+    (date(2024, 3, 11), (13, 30)),  # EDT, first session after
+    (date(2024, 11, 1), (13, 30)),  # EDT, last session before fall back
+    (date(2024, 11, 4), (14, 30)),  # EST, first session after
+])
+def test_open_across_dst_switches(calendar, day, open_utc):
+    session = calendar.session(day)
+    assert session.open == utc_ns(day.year, day.month, day.day, *open_utc)
+    assert session.or_end - session.open == 5 * 60 * 10**9
+    assert session.day_end - session.day_start == 24 * 3600 * 10**9
+    assert calendar.session_at(session.open) is session
+
+
+def test_dst_switch_days_are_23_and_25_hours(calendar):
+    spring_start, spring_end = calendar.day_bounds(date(2024, 3, 10))
+    fall_start, fall_end = calendar.day_bounds(date(2024, 11, 3))
+    assert spring_end - spring_start == 23 * 3600 * 10**9
+    assert fall_end - fall_start == 25 * 3600 * 10**9
+
+
+def test_session_mask(calendar):
+    dates = np.array(['2022-06-17', '2022-06-20', '2022-06-21'], dtype='datetime64[D]')
+    assert calendar.session_mask(dates).tolist() == [True, False, True]
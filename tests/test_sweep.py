@@ -0,0 +1,36 @@
+"""Resuming parameter sweeps only from results of the same run."""
+import json
+
+from src.backtest.sweep import ParameterSweep, run_fingerprint
+from src.backtest.synthetic import generate_sessions
+from src.backtest.vectorized import BacktestParams
+
+
+def bars_date(bars):
+    return bars['ts'][0].astype('datetime64[ns]').astype('datetime64[D]').item()
+
+
+def test_fingerprint_tracks_params_and_data():
+    bars = generate_sessions(5, seed=1)
+    params = BacktestParams()
+    fingerprint = run_fingerprint(params, bars)
+
+    assert run_fingerprint(BacktestParams(), bars) == fingerprint
+    assert run_fingerprint(params.replace(risk_reward_ratio=3.0), bars) != fingerprint
+    assert run_fingerprint(params, generate_sessions(6, seed=1)) != fingerprint
+    assert run_fingerprint(params, bars, excluded_dates=[bars_date(bars)]) != fingerprint
+
+
+def test_results_of_other_runs_are_not_reused(tmp_path):
+    bars = generate_sessions(5, seed=1)
+    results = tmp_path / 'sweep.jsonl'
+    stale = {'key': '{"volume_multiplier": 1.0}', 'params': {'volume_multiplier': 1.0},
+             'run': 'other', 'total_pnl': 1e9}
+    current = dict(stale, key='{"volume_multiplier": 2.0}', params={'volume_multiplier': 2.0},
+                   run=run_fingerprint(BacktestParams(), bars))
+    results.write_text(json.dumps(stale) + '\n' + json.dumps(current) + '\n')
+
+    sweep = ParameterSweep(BacktestParams(), {'volume_multiplier': [1.0, 2.0]},
+                           results_path=results, processes=1)
+    completed = sweep._load_completed(run_fingerprint(BacktestParams(), bars))
+    assert list(completed) == [current['key']]
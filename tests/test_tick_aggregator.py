@@ -0,0 +1,103 @@
+"""Tick-to-bar aggregation: interval boundaries, late ticks, gaps and batches."""
+import numpy as np
+import pytest
+
+from src.data.tick_aggregator import TickBarAggregator, TimeBarAggregator, VolumeBarAggregator
+from src.utils.time_utils import NS_PER_MINUTE
+
+SECOND = 10**9
+T0 = 1_704_205_800 * SECOND  # 2024-01-02 14:30 UTC, on a minute boundary
+
+
+def rows(bars):
+    return [(b.ts, b.open, b.high, b.low, b.close, b.volume, b.symbol) for b in bars]
+
+
+def collect(cls, *args, **kwargs):
+    bars = []
+    return cls(bars.append, *args, **kwargs), bars
+
+
+def test_time_bars_split_on_interval_boundaries():
+    aggregator, bars = collect(TimeBarAggregator, symbol='NQ')
+    aggregator.on_tick(T0, 100.0, 1)
+    aggregator.on_tick(T0 + 59 * SECOND, 101.0, 2)
+    aggregator.on_tick(T0 + NS_PER_MINUTE, 99.0, 3)  # First tick of the next minute
+    assert rows(bars) == [(T0, 100.0, 101.0, 100.0, 101.0, 3, 'NQ')]
+
+    aggregator.advance(T0 + 2 * NS_PER_MINUTE - 1)
+    assert len(bars) == 1
+    aggregator.advance(T0 + 2 * NS_PER_MINUTE)
+    assert rows(bars)[1] == (T0 + NS_PER_MINUTE, 99.0, 99.0, 99.0, 99.0, 3, 'NQ')
+
+
+@pytest.mark.parametrize('policy', ['drop', 'current'])
+def test_late_ticks(policy):
+    aggregator, bars = collect(TimeBarAggregator, late_policy=policy)
+    aggregator.on_tick(T0, 100.0, 1)
+    aggregator.on_tick(T0 + NS_PER_MINUTE, 101.0, 1)
+    aggregator.on_tick(T0 + 30 * SECOND, 90.0, 5)  # Belongs to the emitted minute
+    aggregator.flush()
+
+    assert aggregator.late_ticks == 1
+    assert rows(bars)[0] == (T0, 100.0, 100.0, 100.0, 100.0, 1, None)
+    if policy == 'drop':
+        assert rows(bars)[1] == (T0 + NS_PER_MINUTE, 101.0, 101.0, 101.0, 101.0, 1, None)
+    else:
+        assert rows(bars)[1] == (T0 + NS_PER_MINUTE, 101.0, 101.0, 90.0, 90.0, 6, None)
+
+
+def test_empty_intervals_are_filled_flat():
+    aggregator, bars = collect(TimeBarAggregator, fill_empty=True, max_fill_bars=5)
+    aggregator.on_tick(T0, 100.0, 1)
+    aggregator.on_tick(T0 + 3 * NS_PER_MINUTE, 102.0, 1)
+    assert rows(bars) == [
+        (T0, 100.0, 100.0, 100.0, 100.0, 1, None),
+        (T0 + NS_PER_MINUTE, 100.0, 100.0, 100.0, 100.0, 0, None),
+        (T0 + 2 * NS_PER_MINUTE, 100.0, 100.0, 100.0, 100.0, 0, None),
+    ]
+
+    # Gaps longer than max_fill_bars (e.g. overnight) are not filled
+    aggregator.on_tick(T0 + 60 * NS_PER_MINUTE, 103.0, 1)
+    assert len(bars) == 4
+
+
+def test_volume_bars_split_crossing_ticks():
+    aggregator, bars = collect(VolumeBarAggregator, bar_volume=10)
+    aggregator.on_tick(T0, 100.0, 4)
+    aggregator.on_tick(T0 + SECOND, 101.0, 25)  # Completes one bar, fills another, 9 left
+    assert [b.volume for b in bars] == [10, 10]
+    assert rows(bars)[1] == (T0 + SECOND, 101.0, 101.0, 101.0, 101.0, 10, None)
+    assert aggregator.current_bar.volume == 9
+
+
+def test_tick_bars():
+    aggregator, bars = collect(TickBarAggregator, ticks_per_bar=3)
+    for i, price in enumerate([100.0, 102.0, 99.0, 101.0]):
+        aggregator.on_tick(T0 + i * SECOND, price, 1)
+    assert rows(bars) == [(T0, 100.0, 102.0, 99.0, 99.0, 3, None)]
+    assert aggregator.current_ticks == 1
+
+
+@pytest.mark.parametrize('policy', ['drop', 'current'])
+@pytest.mark.parametrize('fill_empty', [False, True])
+def test_on_ticks_matches_on_tick(policy, fill_empty):
+    rng = np.random.default_rng(7)
+    n = 5000
+    ts = T0 + np.cumsum(rng.integers(0, 20 * SECOND, n))
+    ts[rng.random(n) < 0.05] -= 2 * NS_PER_MINUTE  # Late ticks
+    price = 4000.0 + np.round(rng.normal(0, 1, n).cumsum() * 4) / 4
+    size = rng.integers(1, 10, n)
+
+    kwargs = dict(interval_minutes=1, late_policy=policy, fill_empty=fill_empty)
+    single, single_bars = collect(TimeBarAggregator, **kwargs)
+    for t, p, s in zip(ts.tolist(), price.tolist(), size.tolist()):
+        single.on_tick(t, p, s)
+
+    batched, batched_bars = collect(TimeBarAggregator, **kwargs)
+    for chunk in np.array_split(np.arange(n), 7):
+        batched.on_ticks(ts[chunk], price[chunk], size[chunk])
+
+    assert rows(batched_bars) == rows(single_bars)
+    assert batched.late_ticks == single.late_ticks > 0
+    assert rows([batched.current_bar]) == rows([single.current_bar])
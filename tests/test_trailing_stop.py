@@ -0,0 +1,110 @@
+"""Trailing stop levels: tick steps, no loosening, breakeven ratchet, amendments."""
+import pytest
+
+from src.data.broker_interface import BracketOrder, Order, OrderSide, OrderStatus, OrderType
+from src.data.paper_broker import PaperBroker
+from src.data.rolling_stats import ATR
+from src.risk.trailing_stop import TrailingStop
+
+T0 = 1_704_205_800 * 10**9  # Epoch ns of the first bar
+
+
+def warmed_atr(true_range: float) -> ATR:
+    atr = ATR(3)
+    for i in range(3):
+        atr.update((i, 100.0, 100.0 + true_range, 100.0, 100.0, 1))
+    return atr
+
+
+def trailing(method, distance, **kwargs):
+    if method == 'atr':
+        kwargs['atr'] = warmed_atr(2.0)  # 2 points
+    return TrailingStop(method, distance, tick_size=0.25, **kwargs)
+
+
+# Each configuration trails 4 points behind the best price
+MODES = [('fixed', 4.0), ('atr', 2.0), ('or_range', 0.5)]
+
+
+@pytest.mark.parametrize('method, distance', MODES)
+def test_long_trail_moves_in_ticks_and_never_loosens(method, distance):
+    stop = trailing(method, distance)
+    stop.start(True, 4000.0, 3990.0, or_range=8.0)
+
+    assert stop.update(4010.0, 4005.0) == 4006.0
+    assert stop.update(4008.0, 4001.0) is None      # Pullback: stop holds
+    assert stop.stop_price == 4006.0
+    assert stop.update(4010.2, 4009.0) is None      # Less than a tick of progress
+    assert stop.update(4010.25, 4009.0) == 4006.25  # One tick
+    assert stop.stop_price == 4006.25
+
+
+@pytest.mark.parametrize('method, distance', MODES)
+def test_short_trail_moves_in_ticks_and_never_loosens(method, distance):
+    stop = trailing(method, distance)
+    stop.start(False, 4000.0, 4010.0, or_range=8.0)
+
+    assert stop.update(3995.0, 3990.0) == 3994.0
+    assert stop.update(3999.0, 3992.0) is None
+    assert stop.update(3991.0, 3989.8) is None
+    assert stop.update(3991.0, 3989.75) == 3993.75
+    assert stop.stop_price == 3993.75
+
+
+def test_atr_trail_follows_the_current_atr_without_loosening():
+    atr = warmed_atr(2.0)
+    stop = TrailingStop('atr', 2.0, tick_size=0.25, atr=atr)
+    stop.start(True, 4000.0, 3990.0)
+    assert stop.update(4010.0, 4005.0) == 4006.0
+
+    atr.value = 4.0  # Volatility doubles: the trail widens but the stop stays
+    assert stop.update(4011.0, 4008.0) is None
+    assert stop.stop_price == 4006.0
+    atr.value = 1.0  # Volatility drops: the stop tightens
+    assert stop.update(4011.0, 4008.0) == 4009.0
+
+
+def test_breakeven_ratchet():
+    # A 20-point trail alone would not pass the initial stop before +10
+    stop = TrailingStop('fixed', 20.0, tick_size=0.25, breakeven_r=1.0)
+    stop.start(True, 4000.0, 3990.0)
+
+    assert stop.update(4009.75, 4005.0) is None  # Short of 1R
+    assert stop.update(4010.0, 4005.0) == 4000.0  # 1R reached: stop to entry
+    assert stop.update(4015.0, 4010.0) is None   # Trail (3995) is below entry
+    assert stop.update(4020.25, 4015.0) == 4000.25
+
+
+def test_breakeven_ratchet_short():
+    stop = TrailingStop('fixed', 20.0, tick_size=0.25, breakeven_r=0.5)
+    stop.start(False, 4000.0, 4010.0)
+    assert stop.update(3996.0, 3995.25) is None
+    assert stop.update(3996.0, 3995.0) == 4000.0
+
+
+def test_inactive_after_stop():
+    stop = TrailingStop('fixed', 4.0)
+    stop.start(True, 4000.0, 3990.0)
+    stop.stop()
+    assert not stop.active
+    assert stop.update(4100.0, 4050.0) is None
+
+
+@pytest.mark.parametrize('open_price, low, expected', [
+    (4001.0, 3997.0, 3998.0),  # Traded through: fills at the new level
+    (3996.0, 3994.0, 3996.0),  # Gapped through: fills at the open
+])
+def test_amended_stop_fills_at_its_new_level(open_price, low, expected):
+    broker = PaperBroker(point_value=50.0)
+    broker.connect()
+    broker.update_market_price('ES', 4000.0)
+    bracket = BracketOrder(Order('ES', OrderSide.BUY, 1, OrderType.MARKET), 3990.0, 4020.0)
+    assert broker.submit_bracket(bracket)
+    assert broker.modify_order(bracket.stop.order_id, stop_price=3998.0)
+
+    # Above the original 3990 stop, so only the amended level is reached
+    broker.update_bar('ES', T0, open_price, open_price + 1.0, low, low + 1.0)
+    assert bracket.stop.status == OrderStatus.FILLED
+    assert bracket.stop.filled_price == expected
+    assert bracket.target.status == OrderStatus.CANCELLED
+    assert len(broker.filled_orders) == 2  # Entry and stop, once each